@@ -0,0 +1,202 @@
+"""
+Module: benchmarks/bench_algorithms.py
+Description: Mide la latencia por decisión (select_arm + update) y el rendimiento de simulación de todos los algoritmos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+
+Uso:
+    python benchmarks/bench_algorithms.py --output results.json
+    python benchmarks/bench_algorithms.py --k 10 100 --baseline results.json --tolerance 0.25
+    python benchmarks/bench_algorithms.py --k 1000000 --dtype-policy compact
+
+Con --baseline, el programa termina con código 1 si alguna configuración es más lenta que la de referencia
+por encima de la tolerancia indicada.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+# Añadir el directorio fuente al path de Python, igual que en los notebooks
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import algorithms
+from arms import ArmNormal, ArmBernoulli, ArmBinomial, Bandit
+
+
+ARM_FAMILIES = {
+    'Normal': lambda k, rng: [ArmNormal(mu, 1.0) for mu in rng.uniform(1, 10, k)],
+    'Bernoulli': lambda k, rng: [ArmBernoulli(p) for p in rng.uniform(0, 1, k)],
+    'Binomial': lambda k, rng: [ArmBinomial(10, p) for p in rng.uniform(0, 1, k)],
+}
+
+
+def algorithm_classes() -> List[type]:
+    """
+    Clases concretas de algoritmos sin contexto publicadas en algorithms.__all__.
+    """
+    classes = [getattr(algorithms, name) for name in algorithms.__all__]
+    return [cls for cls in classes if isinstance(cls, type) and issubclass(cls, algorithms.Algorithm)
+            and not cls.__abstractmethods__ and not cls.contextual]
+
+
+def bench_decisions(cls: type, bandit: Bandit, decisions: int, warmup: int, seed: int) -> dict:
+    """
+    Latencia de cada decisión select_arm + update de una única instancia. La recompensa se obtiene fuera de la medida.
+    """
+    algo = cls(bandit.k, rng=np.random.default_rng(seed))
+    bandit.rng = np.random.default_rng(seed + 1)
+    for arm in bandit.arms:
+        arm.rng = bandit.rng
+
+    latencies = np.empty(decisions, dtype=np.int64)
+    start = time.perf_counter()
+    for i in range(warmup + decisions):
+        t0 = time.perf_counter_ns()
+        chosen_arm = algo.select_arm()
+        t1 = time.perf_counter_ns()
+        reward = bandit.pull_arm(chosen_arm)
+        t2 = time.perf_counter_ns()
+        algo.update(chosen_arm, reward)
+        t3 = time.perf_counter_ns()
+
+        if i == warmup - 1:
+            start = time.perf_counter()
+        if i >= warmup:
+            latencies[i - warmup] = (t1 - t0) + (t3 - t2)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'p50_us': float(np.percentile(latencies, 50)) / 1e3,
+        'p99_us': float(np.percentile(latencies, 99)) / 1e3,
+        'steps_per_second': decisions / elapsed,
+    }
+
+
+def bench_batched(cls: type, bandit: Bandit, n_envs: int, batch_steps: int, seed: int) -> dict:
+    """
+    Rendimiento en modo por lotes: pasos de bandido por segundo con n_envs bandidos independientes.
+    """
+    algo = cls(bandit.k, rng=np.random.default_rng(seed))
+    bandit.rng = np.random.default_rng(seed + 1)
+    algo.reset_batch(n_envs)
+
+    start = time.perf_counter()
+    for _ in range(batch_steps):
+        chosen_arms = algo.select_arms()
+        algo.update_batch(chosen_arms, bandit.pull_arms(chosen_arms))
+    elapsed = time.perf_counter() - start
+
+    return {'batched_env_steps_per_second': n_envs * batch_steps / elapsed,
+            'state_bytes_per_env': algo.state_nbytes() // n_envs}
+
+
+def run(args) -> dict:
+    results = []
+    for k in args.k:
+        for family, make_arms in ARM_FAMILIES.items():
+            bandit = Bandit(make_arms(k, np.random.default_rng(args.seed)))
+            for cls in algorithm_classes():
+                entry = {'algorithm': cls.__name__, 'k': k, 'arms': family}
+                entry.update(bench_decisions(cls, bandit, args.decisions, args.warmup, args.seed))
+                n_envs = max(1, min(args.n_envs, args.max_batch_cells // k))
+                entry.update(bench_batched(cls, bandit, n_envs, args.batch_steps, args.seed))
+                results.append(entry)
+                print(f"{cls.__name__:>15} k={k:<7} {family:<9} p50={entry['p50_us']:9.1f}us "
+                      f"p99={entry['p99_us']:9.1f}us {entry['steps_per_second']:10.0f} steps/s "
+                      f"{entry['batched_env_steps_per_second']:12.0f} env-steps/s (batched) "
+                      f"{entry['state_bytes_per_env'] / 2 ** 20:9.2f} MiB/env")
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'decisions': args.decisions,
+            'warmup': args.warmup,
+            'batch_steps': args.batch_steps,
+            'dtype_policy': args.dtype_policy,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Compara con una ejecución de referencia y devuelve la lista de regresiones encontradas.
+
+    Una configuración regresa si su latencia p50 crece, o su rendimiento cae, más de un factor (1 + tolerance).
+    """
+    def key(entry):
+        return entry['algorithm'], entry['k'], entry['arms']
+
+    reference = {key(entry): entry for entry in baseline['results']}
+    regressions = []
+    for entry in current['results']:
+        old = reference.get(key(entry))
+        if old is None:
+            continue
+
+        name = '{} k={} {}'.format(*key(entry))
+        if entry['p50_us'] > old['p50_us'] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {old['p50_us']:.1f}us -> {entry['p50_us']:.1f}us")
+        for metric in ('steps_per_second', 'batched_env_steps_per_second'):
+            if entry[metric] * (1 + tolerance) < old[metric]:
+                regressions.append(f"{name}: {metric} {old[metric]:.0f} -> {entry[metric]:.0f}")
+
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--k', type=int, nargs='+', default=[10, 100, 10_000, 100_000], help='Números de brazos.')
+    parser.add_argument('--decisions', type=int, default=500, help='Decisiones medidas por configuración.')
+    parser.add_argument('--warmup', type=int, default=50, help='Decisiones previas sin medir.')
+    parser.add_argument('--n-envs', type=int, default=1000, help='Bandidos independientes en modo por lotes.')
+    parser.add_argument('--max-batch-cells', type=int, default=10_000_000,
+                        help='Límite de n_envs * k en modo por lotes, para acotar la memoria con k grande.')
+    parser.add_argument('--batch-steps', type=int, default=50, help='Pasos medidos en modo por lotes.')
+    parser.add_argument('--dtype-policy', choices=tuple(algorithms.DTYPE_POLICIES), default='default',
+                        help='Política de tipos del estado de los algoritmos.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Fichero JSON donde guardar los resultados.')
+    parser.add_argument('--baseline', help='Fichero JSON de referencia con el que comparar.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Degradación relativa permitida frente a la referencia.')
+    args = parser.parse_args(argv)
+    algorithms.Algorithm.dtype_policy = args.dtype_policy
+
+    with np.errstate(divide='ignore', invalid='ignore'):  # UCB2 produce NaN de forma esperada en algunos índices
+        current = run(args)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regresiones respecto a {args.baseline}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print(f"\nSin regresiones respecto a {args.baseline}.")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Module: benchmarks/bench_serving.py
+Description: Generador de carga para PolicyServer: decisiones por segundo y latencia de cola con recompensas diferidas.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+
+Uso:
+    python benchmarks/bench_serving.py --algorithm UCB1 --clients 8 --decisions 20000
+    python benchmarks/bench_serving.py --http --clients 16 --delay-ms 20 --output serving.json
+
+Cada cliente pide decisiones en bucle y comunica la recompensa de cada una tras un retardo exponencial de media
+--delay-ms, así que las recompensas llegan tarde y desordenadas. Sin --http los clientes son hilos que llaman
+directamente a PolicyServer; con --http son corrutinas con una conexión persistente cada una contra
+HttpPolicyServer en el mismo proceso. La latencia medida es la de cada decisión (o la ida y vuelta de /decide).
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+# Añadir el directorio fuente al path de Python, igual que en los notebooks
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import algorithms
+from serving import PolicyServer, HttpPolicyServer
+
+
+class Client:
+    """
+    Estado de un cliente simulado: brazos con recompensa normal N(mu, 1) y una cola de recompensas
+    pendientes ordenada por el instante en que deben comunicarse.
+    """
+
+    def __init__(self, means: np.ndarray, delay: float, seed):
+        self.means = means
+        self.delay = delay
+        self.rng = np.random.default_rng(seed)
+        self.due = []  # Montículo de (instante, decision_id, recompensa)
+        self.latencies = []
+        self.optimal = 0
+
+    def record(self, decision_id: int, arm: int, latency_ns: int):
+        self.latencies.append(latency_ns)
+        self.optimal += arm == np.argmax(self.means)
+        reward = self.rng.normal(self.means[arm], 1.0)
+        heapq.heappush(self.due, (time.perf_counter() + self.rng.exponential(self.delay), decision_id, reward))
+
+    def pop_due(self, everything: bool = False) -> list:
+        now = time.perf_counter()
+        ready = []
+        while self.due and (everything or self.due[0][0] <= now):
+            _, decision_id, reward = heapq.heappop(self.due)
+            ready.append((decision_id, reward))
+        return ready
+
+
+def run_threads(server: PolicyServer, clients: List[Client], decisions: int):
+    def work(client: Client):
+        for _ in range(decisions):
+            for decision_id, reward in client.pop_due():
+                server.report_reward(decision_id, reward)
+            t0 = time.perf_counter_ns()
+            decision_id, arm = server.decide()
+            client.record(decision_id, arm, time.perf_counter_ns() - t0)
+        for decision_id, reward in client.pop_due(everything=True):
+            server.report_reward(decision_id, reward)
+
+    threads = [threading.Thread(target=work, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+async def run_http(server: PolicyServer, clients: List[Client], decisions: int):
+    http_server = HttpPolicyServer(server, port=0)
+    port = await http_server.start()
+
+    async def request(reader, writer, path: str, payload: dict) -> dict:
+        body = json.dumps(payload).encode()
+        writer.write(f'POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n'.encode() + body)
+        head = await reader.readuntil(b'\r\n\r\n')
+        length = next(int(line.split(b':')[1]) for line in head.split(b'\r\n') if line.lower().startswith(b'content-length'))
+        return json.loads(await reader.readexactly(length))
+
+    async def work(client: Client):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for _ in range(decisions):
+            for decision_id, reward in client.pop_due():
+                await request(reader, writer, '/reward', {'decision_id': decision_id, 'reward': reward})
+            t0 = time.perf_counter_ns()
+            response = await request(reader, writer, '/decide', {})
+            client.record(response['decision_id'], response['arm'], time.perf_counter_ns() - t0)
+        for decision_id, reward in client.pop_due(everything=True):
+            await request(reader, writer, '/reward', {'decision_id': decision_id, 'reward': reward})
+        writer.close()
+        await writer.wait_closed()
+
+    await asyncio.gather(*(work(client) for client in clients))
+    await http_server.close()
+
+
+def run(args) -> dict:
+    seeds = np.random.SeedSequence(args.seed).spawn(args.clients + 2)
+    means = np.random.default_rng(seeds[0]).uniform(1, 10, args.k)
+    algo = getattr(algorithms, args.algorithm)(args.k, rng=np.random.default_rng(seeds[1]))
+    server = PolicyServer(algo, batch_size=args.batch_size, flush_interval=args.flush_interval)
+    clients = [Client(means, args.delay_ms / 1e3, seed) for seed in seeds[2:]]
+    per_client = args.decisions // args.clients
+
+    start = time.perf_counter()
+    if args.http:
+        asyncio.run(run_http(server, clients, per_client))
+    else:
+        run_threads(server, clients, per_client)
+    elapsed = time.perf_counter() - start
+    server.close()
+
+    latencies = np.concatenate([client.latencies for client in clients])
+    total = len(latencies)
+    result = {
+        'algorithm': args.algorithm,
+        'mode': 'http' if args.http else 'threads',
+        'clients': args.clients,
+        'decisions': total,
+        'decisions_per_second': total / elapsed,
+        'p50_us': float(np.percentile(latencies, 50)) / 1e3,
+        'p99_us': float(np.percentile(latencies, 99)) / 1e3,
+        'p999_us': float(np.percentile(latencies, 99.9)) / 1e3,
+        'max_us': float(np.max(latencies)) / 1e3,
+        'optimal_fraction': sum(client.optimal for client in clients) / total,
+    }
+    result.update(server.stats())
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--algorithm', default='UCB1', help='Clase de algorithms.__all__ sin contexto a servir.')
+    parser.add_argument('--k', type=int, default=10, help='Número de brazos.')
+    parser.add_argument('--decisions', type=int, default=20_000, help='Decisiones en total, repartidas entre los clientes.')
+    parser.add_argument('--clients', type=int, default=8, help='Clientes concurrentes.')
+    parser.add_argument('--delay-ms', type=float, default=5.0, help='Retardo medio de las recompensas, en milisegundos.')
+    parser.add_argument('--batch-size', type=int, default=64, help='Tamaño de los micro-lotes de recompensas.')
+    parser.add_argument('--flush-interval', type=float, default=0.005, help='Segundos máximos entre micro-lotes.')
+    parser.add_argument('--http', action='store_true', help='Atacar el servidor HTTP local en lugar de llamar en proceso.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Fichero JSON donde guardar los resultados.')
+    args = parser.parse_args(argv)
+
+    with np.errstate(divide='ignore', invalid='ignore'):  # UCB2 produce NaN de forma esperada en algunos índices
+        result = run(args)
+
+    print(f"{result['algorithm']} {result['mode']} clients={result['clients']}: "
+          f"{result['decisions_per_second']:.0f} decisions/s p50={result['p50_us']:.1f}us "
+          f"p99={result['p99_us']:.1f}us p99.9={result['p999_us']:.1f}us max={result['max_us']:.1f}us | "
+          f"rewards applied={result['rewards_applied']} rejected={result['rewards_rejected']} "
+          f"batches={result['batches']} optimal={result['optimal_fraction']:.1%}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'meta': {'python': platform.python_version(), 'numpy': np.__version__,
+                                'platform': platform.platform()},
+                       'results': [result]}, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,13 +13,19 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
 # Importación de módulos o clases
-from .algorithm import Algorithm
+from .algorithm import Algorithm, DTYPE_POLICIES
 from .epsilon_greedy import EpsilonGreedy
 from .ucb1 import UCB1
 from .ucb2 import UCB2
+from .kl_ucb import KLUCB
+from .ucbv import UCBV
 from .softmax import Softmax
 from .gradient_bandit import GradientBandit
+from .thompson_sampling import ThompsonBernoulli, ThompsonBinomial, ThompsonNormal
+from .linear import LinearAlgorithm, LinUCB, LinearThompson
+from .estimators import ConstantStep, Discounted, SlidingWindow
 
 # Lista de módulos o clases públicas
-__all__ = ['Algorithm', 'EpsilonGreedy', 'UCB1', 'UCB2', 'Softmax', 'GradientBandit']
-
+__all__ = ['Algorithm', 'DTYPE_POLICIES', 'EpsilonGreedy', 'UCB1', 'UCB2', 'KLUCB', 'UCBV', 'Softmax', 'GradientBandit',
+           'ThompsonBernoulli', 'ThompsonBinomial', 'ThompsonNormal', 'LinearAlgorithm', 'LinUCB', 'LinearThompson',
+           'ConstantStep', 'Discounted', 'SlidingWindow']
@@ -13,21 +13,50 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
 
+import copy
 from abc import ABC, abstractmethod
+from typing import Optional
+
 import numpy as np
 
+from randomness import get_rng
+
+# Políticas de tipos del estado: (tipo de los contadores, tipo de los valores reales). Los contadores son counts,
+# las épocas de UCB2...; los valores reales, values, las preferencias, las posterioris, los buffers de los estimadores...
+# 'compact' ocupa la mitad por brazo, a cambio de limitar las cuentas a 2^32 - 1 y los valores a precisión simple.
+DTYPE_POLICIES = {
+    'default': (np.int64, np.float64),
+    'compact': (np.uint32, np.float32),
+}
+
+
 class Algorithm(ABC):
-    def __init__(self, k: int):
+    STATE_ATTRIBUTES = ('counts', 'values')  # Atributos que forman el estado guardado por get_state
+    contextual = False  # Los algoritmos contextuales reciben el contexto en select_arm y update
+    dtype_policy = 'default'  # Política de tipos del estado (DTYPE_POLICIES), por clase o con set_dtype_policy
+
+    def __init__(self, k: int, rng=None, estimator=None):
         """
         Inicializa el algoritmo con k brazos.
         :param k: Número de brazos.
+        :param rng: Generador aleatorio (np.random.Generator o BufferedGenerator). Si es None se usa np.random.
+        :param estimator: Estimador de la recompensa de cada brazo (ConstantStep, Discounted o SlidingWindow).
+                          Si es None se usa la media muestral. Cada algoritmo trabaja con su propia copia.
         """
         # Número de brazos
         self.k: int = k
+        # Generador aleatorio del algoritmo
+        self.rng = rng
+        # Número de bandidos independientes en modo por lotes (None -> un único bandido)
+        self.n_envs: Optional[int] = None
         # Número de veces que se ha seleccionado cada brazo
-        self.counts: np.ndarray = np.zeros(k, dtype=int)
+        self.counts: np.ndarray = np.zeros(k, dtype=self.count_dtype)
         # Recompensa promedio estimada de cada brazo
-        self.values: np.ndarray = np.zeros(k, dtype=float)
+        self.values: np.ndarray = np.zeros(k, dtype=self.value_dtype)
+        # Estimador alternativo a la media muestral (None -> media muestral)
+        self.estimator = copy.deepcopy(estimator)
+        if self.estimator is not None:
+            self.estimator.reset(self)
 
     @abstractmethod
     def select_arm(self) -> int:
@@ -44,6 +73,9 @@ class Algorithm(ABC):
         :param reward: Recompensa obtenida.
         """
         self.counts[chosen_arm] += 1  # Incrementa el conteo del brazo seleccionado
+        if self.estimator is not None:
+            self.estimator.update(self, chosen_arm, reward)
+            return
 
         n = self.counts[chosen_arm]  # Número de veces que el brazo seleccionado ha sido seleccionado
         value = self.values[chosen_arm]  # Valor actual del brazo seleccionado
@@ -53,9 +85,205 @@ class Algorithm(ABC):
 
         self.values[chosen_arm] = value + (reward - value) / n
 
+    def select_arms(self) -> np.ndarray:
+        """
+        Selecciona un brazo para cada uno de los n_envs bandidos en modo por lotes.
+        :return: Array (n_envs,) con el índice del brazo seleccionado en cada bandido.
+        """
+        raise NotImplementedError("Este método debe ser implementado por la subclase.")
+
+    def update_batch(self, arms: np.ndarray, rewards: np.ndarray):
+        """
+        Actualiza las recompensas promedio estimadas de todos los bandidos en modo por lotes.
+        :param arms: Array (n_envs,) con el brazo tirado en cada bandido.
+        :param rewards: Array (n_envs,) con la recompensa obtenida en cada bandido.
+        """
+        rows = np.arange(self.n_envs)
+
+        # Cada fila actualiza una única celda, así que la asignación por índices equivale a un scatter-add
+        self.counts[rows, arms] += 1
+        if self.estimator is not None:
+            self.estimator.update_batch(self, rows, arms, rewards)
+            return
+        n = self.counts[rows, arms]
+        self.values[rows, arms] += (rewards - self.values[rows, arms]) / n
+
+    def update_many(self, arms: np.ndarray, rewards: np.ndarray):
+        """
+        Incorpora de una vez un lote de tiradas, como un sistema que solo actualiza su política cada cierto
+        número de decisiones. Las cuentas y sumas de recompensa de cada brazo se acumulan con un único
+        scatter-add (np.bincount) y se combinan con las medias actuales, así que con la media muestral el
+        resultado es el mismo que con una llamada a update por tirada.
+
+        Con un estimador (ConstantStep, Discounted o SlidingWindow) el resultado depende del orden de las
+        recompensas, así que se aplican una a una.
+
+        :param arms: Array (m,) con los brazos tirados o, en modo por lotes, (n_envs, m) con m tiradas por bandido.
+        :param rewards: Array de la misma forma con la recompensa de cada tirada.
+        """
+        assert not self.contextual, "Los algoritmos contextuales necesitan el contexto de cada tirada."
+        arms = np.asarray(arms)
+        rewards = np.asarray(rewards, dtype=float)
+        assert arms.shape == rewards.shape, "Los brazos y las recompensas deben tener la misma forma."
+
+        if self.estimator is not None:
+            for column in range(arms.shape[-1]):
+                if self.n_envs is None:
+                    self.update(int(arms[column]), rewards[column])
+                else:
+                    self.update_batch(arms[:, column], rewards[:, column])
+            return
+
+        self._update_many(arms, rewards, self._scatter_sum(arms).astype(self.count_dtype, copy=False))
+
+    def _update_many(self, arms: np.ndarray, rewards: np.ndarray, batch_counts: np.ndarray):
+        """
+        Parte vectorizada de update_many, que las subclases amplían con su propio estado.
+        :param batch_counts: Número de tiradas de cada brazo en el lote, con la forma de counts.
+        """
+        self.counts += batch_counts
+        self._merge_means(self.values, batch_counts, self._scatter_sum(arms, rewards))
+
+    def _scatter_sum(self, arms: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Suma de weights (o número de apariciones, si es None) de cada brazo de un lote, con la forma de counts.
+        """
+        shape = self._state_shape()
+        cells = arms if self.n_envs is None else arms + self.k * np.arange(self.n_envs)[:, None]
+        sums = np.bincount(cells.ravel(), weights=None if weights is None else weights.ravel(),
+                           minlength=shape[0] if self.n_envs is None else self.n_envs * self.k)
+        return sums.reshape(shape)
+
+    def _merge_means(self, means: np.ndarray, batch_counts: np.ndarray, batch_sums: np.ndarray):
+        """
+        Combina unas medias con las sumas de un lote, una vez incorporado el lote a counts:
+        media + (suma - n_lote * media) / counts es la media incremental tras n_lote observaciones.
+        """
+        pulled = batch_counts > 0
+        means[pulled] += (batch_sums[pulled] - batch_counts[pulled] * means[pulled]) / self.counts[pulled]
+
     def reset(self):
         """
         Reinicia el estado del algoritmo (opcional).
         """
-        self.counts = np.zeros(self.k, dtype=int)
-        self.values = np.zeros(self.k, dtype=float)
+        self.counts = np.zeros(self._state_shape(), dtype=self.count_dtype)
+        self.values = np.zeros(self._state_shape(), dtype=self.value_dtype)
+        if self.estimator is not None:
+            self.estimator.reset(self)
+
+    def reset_batch(self, n_envs: int):
+        """
+        Reinicia el algoritmo en modo por lotes, con estado (n_envs, k) para n_envs bandidos independientes.
+        :param n_envs: Número de bandidos independientes.
+        """
+        assert n_envs > 0, "El número de bandidos n_envs debe ser mayor que 0."
+
+        self.n_envs = n_envs
+        self.reset()
+
+    def get_state(self) -> dict:
+        """
+        Estado del algoritmo, para guardarlo en un punto de control.
+        :return: Diccionario con una copia de cada atributo de STATE_ATTRIBUTES como array.
+        """
+        state = {name: np.array(getattr(self, name)) for name in self.STATE_ATTRIBUTES}
+        if self.estimator is not None:
+            state.update({'estimator.' + name: np.array(value) for name, value in self.estimator.get_state().items()})
+        return state
+
+    def set_state(self, state: dict):
+        """
+        Restaura un estado obtenido con get_state. El modo (un único bandido o por lotes) se deduce de la forma de counts.
+        :param state: Diccionario con un array por cada atributo de STATE_ATTRIBUTES.
+        """
+        for name in self.STATE_ATTRIBUTES:
+            value = self._cast_state(np.array(state[name]))
+            setattr(self, name, value.item() if value.ndim == 0 else value)
+        self.n_envs = None if self.counts.ndim == 1 else len(self.counts)
+        if self.estimator is not None:
+            self.estimator.set_state(self, {name[len('estimator.'):]: value
+                                            for name, value in state.items() if name.startswith('estimator.')})
+
+    def _cast_state(self, value: np.ndarray) -> np.ndarray:
+        """
+        Convierte un array del estado a los tipos de la política: los enteros al de los contadores y los reales
+        al de los valores. Los escalares, como los contadores de paso, no se convierten.
+        """
+        if value.ndim == 0:
+            return value
+        if np.issubdtype(value.dtype, np.integer):
+            return value.astype(self.count_dtype, copy=False)
+        if np.issubdtype(value.dtype, np.floating):
+            return value.astype(self.value_dtype, copy=False)
+        return value
+
+    @property
+    def count_dtype(self) -> type:
+        """
+        Tipo de los contadores del estado según la política de tipos.
+        """
+        return DTYPE_POLICIES[self.dtype_policy][0]
+
+    @property
+    def value_dtype(self) -> type:
+        """
+        Tipo de los valores reales del estado según la política de tipos.
+        """
+        return DTYPE_POLICIES[self.dtype_policy][1]
+
+    def set_dtype_policy(self, policy: str):
+        """
+        Cambia la política de tipos del algoritmo y convierte su estado actual (el de get_state) a los nuevos tipos.
+        Para que todos los algoritmos nuevos usen una política, basta con cambiar Algorithm.dtype_policy.
+        :param policy: Nombre de la política en DTYPE_POLICIES ('default' o 'compact').
+        """
+        assert policy in DTYPE_POLICIES, f"La política de tipos debe ser una de {tuple(DTYPE_POLICIES)}."
+
+        self.dtype_policy = policy
+        self.set_state(self.get_state())
+
+    def state_nbytes(self) -> int:
+        """
+        Memoria ocupada por los arrays del algoritmo, de su estimador y de su índice (árbol de segmentos), si lo tiene:
+        el estado por brazo y las cachés derivadas de él, como las probabilidades de GradientBandit. Los nodos del
+        árbol son listas de Python, así que se cuentan con su propio nbytes.
+        :return: Número de bytes.
+        """
+        parts = (self, self.estimator)
+        nbytes = sum(value.nbytes for part in parts if part is not None
+                     for value in vars(part).values() if isinstance(value, np.ndarray))
+        tree = getattr(self, 'tree', None)
+        return nbytes if tree is None else nbytes + tree.nbytes()
+
+    def _exploration_statistics(self, t):
+        """
+        Cuentas por brazo y total que usan los términos de exploración de UCB. Con la media muestral son
+        counts y t; con un estimador, las cuentas de la información que conserva (descontadas o en la ventana).
+        :param t: Total de tiradas (por bandido).
+        :return: Tupla (counts, t).
+        """
+        if self.estimator is None:
+            return self.counts, t
+        return self.estimator.exploration_counts(self), self.estimator.exploration_time(self, t)
+
+    def _state_shape(self) -> tuple:
+        """
+        Forma de los arrays de estado: (k,) para un único bandido o (n_envs, k) en modo por lotes.
+        """
+        return (self.k,) if self.n_envs is None else (self.n_envs, self.k)
+
+    @staticmethod
+    def _softmax(x: np.ndarray) -> np.ndarray:
+        """
+        Distribución softmax sobre el último eje.
+        """
+        exp_x = np.exp(x - np.max(x, axis=-1, keepdims=True))  # Restar el máximo no cambia el resultado y evita overflow
+        return exp_x / np.sum(exp_x, axis=-1, keepdims=True)
+
+    def _sample_categorical(self, probabilities: np.ndarray) -> np.ndarray:
+        """
+        Muestrea un índice por fila a partir de una matriz de probabilidades (n_envs, k).
+        """
+        cdf = np.cumsum(probabilities, axis=1)
+        u = get_rng(self.rng).random((len(cdf), 1)) * cdf[:, -1:]
+        return np.minimum(np.sum(cdf < u, axis=1), cdf.shape[1] - 1)
@@ -15,21 +15,29 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 import numpy as np
 
 from algorithms.algorithm import Algorithm
+from algorithms.segment_tree import MaxSegmentTree
+from randomness import get_rng
 
 class EpsilonGreedy(Algorithm):
 
-    def __init__(self, k: int, epsilon: float = 0.1):
+    def __init__(self, k: int, epsilon: float = 0.1, rng=None, indexed: bool = False, estimator=None):
         """
         Inicializa el algoritmo epsilon-greedy.
 
         :param k: Número de brazos.
         :param epsilon: Probabilidad de exploración (seleccionar un brazo al azar).
+        :param rng: Generador aleatorio (opcional).
+        :param indexed: Modo para k grande: mantiene un árbol de segmentos sobre los valores estimados,
+                        de modo que la selección greedy cuesta O(1) y cada actualización O(log k).
+        :param estimator: Estimador de la recompensa de cada brazo (opcional, media muestral por defecto).
         :raises ValueError: Si epsilon no está en [0, 1].
         """
         assert 0 <= epsilon <= 1, "El parámetro epsilon debe estar entre 0 y 1."
 
-        super().__init__(k)
+        super().__init__(k, rng, estimator)
         self.epsilon = epsilon
+        self.indexed = indexed
+        self._reset_index()
 
     def select_arm(self) -> int:
         """
@@ -37,15 +45,63 @@ class EpsilonGreedy(Algorithm):
         :return: índice del brazo seleccionado.
         """
 
-        if np.random.random() < self.epsilon:
+        rng = get_rng(self.rng)
+        if rng.random() < self.epsilon:
             # Selecciona un brazo al azar
-            chosen_arm = np.random.choice(self.k)
+            chosen_arm = rng.choice(self.k)
         else:
             # Selecciona el brazo con la recompensa promedio estimada más alta
-            chosen_arm = np.argmax(self.values)
+            chosen_arm = self.tree.argmax() if self.tree is not None else np.argmax(self.values)
 
         return chosen_arm
 
+    def update(self, chosen_arm: int, reward: float):
+        """
+        Actualiza la recompensa promedio estimada del brazo seleccionado y, en modo indexado, su hoja del árbol.
+        :param chosen_arm: Índice del brazo que fue tirado.
+        :param reward: Recompensa obtenida.
+        """
+        super().update(chosen_arm, reward)
+
+        if self.tree is not None:
+            self.tree.update(chosen_arm, self.values[chosen_arm])
+
+    def select_arms(self) -> np.ndarray:
+        """
+        Selecciona un brazo por bandido basado en la política epsilon-greedy, en modo por lotes.
+        :return: índices de los brazos seleccionados.
+        """
+        # Selecciona el brazo con la recompensa promedio estimada más alta
+        chosen_arms = np.argmax(self.values, axis=1)
 
+        # Los bandidos que exploran seleccionan un brazo al azar
+        rng = get_rng(self.rng)
+        explore = rng.random(self.n_envs) < self.epsilon
+        chosen_arms[explore] = rng.choice(self.k, size=np.count_nonzero(explore))
 
+        return chosen_arms
+
+    def reset(self):
+        """
+        Reinicia el estado del algoritmo.
+        """
+        super().reset()
+        self._reset_index()
+
+    def set_state(self, state: dict):
+        """
+        Restaura el estado y reconstruye el árbol de segmentos a partir de los valores.
+        """
+        super().set_state(state)
+        self._reset_index()
+
+    def _update_many(self, arms: np.ndarray, rewards: np.ndarray, batch_counts: np.ndarray):
+        """
+        Actualiza las recompensas promedio de un lote de tiradas y, en modo indexado, reconstruye el árbol una sola vez.
+        """
+        super()._update_many(arms, rewards, batch_counts)
+        self._reset_index()
 
+    def _reset_index(self):
+        # El árbol solo se usa con un único bandido; en modo por lotes select_arms trabaja sobre los arrays completos
+        self.tree = MaxSegmentTree(self.values) if self.indexed and self.n_envs is None else None
@@ -0,0 +1,178 @@
+"""
+Module: algorithms/estimators.py
+Description: Estimadores alternativos a la media muestral para la recompensa de cada brazo, pensados para entornos no estacionarios.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+
+# Un estimador se pasa a cualquier algoritmo con el argumento estimator y sustituye a la media muestral
+# en update y update_batch. Cuando se llama, algo.counts ya incluye la tirada actual. Además indica a los
+# algoritmos UCB cuánta información queda de cada brazo (exploration_counts) y del total (exploration_time),
+# para que el término de exploración crezca cuando las observaciones antiguas pierden peso. set_state recibe
+# los arrays tal como se guardaron y los convierte a los tipos de la política del algoritmo.
+
+
+class ConstantStep:
+    """
+    Paso constante: value += step_size * (reward - value). Pondera las recompensas con un peso que decae
+    exponencialmente con su antigüedad, así que sigue los cambios de la distribución.
+    """
+
+    def __init__(self, step_size: float = 0.1):
+        """
+        :param step_size: Tamaño del paso, en (0, 1].
+        """
+        assert 0 < step_size <= 1, "El tamaño del paso debe estar en (0, 1]."
+
+        self.step_size = step_size
+
+    def reset(self, algo):
+        pass
+
+    def update(self, algo, arm: int, reward: float):
+        algo.values[arm] += self.step_size * (reward - algo.values[arm])
+
+    def update_batch(self, algo, rows: np.ndarray, arms: np.ndarray, rewards: np.ndarray):
+        algo.values[rows, arms] += self.step_size * (rewards - algo.values[rows, arms])
+
+    def exploration_counts(self, algo) -> np.ndarray:
+        return algo.counts
+
+    def exploration_time(self, algo, t):
+        return t
+
+    def get_state(self) -> dict:
+        return {}
+
+    def set_state(self, algo, state: dict):
+        pass
+
+
+class Discounted:
+    """
+    Media descontada (D-UCB): cada observación pesa gamma^(antigüedad), y el valor de un brazo es la suma
+    descontada de sus recompensas entre la suma descontada de sus tiradas.
+
+    Descontar todos los brazos en cada paso costaría O(k). En su lugar, la observación del paso t se guarda con
+    peso scale = gamma^(-t), creciente, y el factor común se cancela en el cociente; las cuentas descontadas son
+    weights / scale. Cuando scale se hace muy grande, todo se divide por él, así que cada paso cuesta O(1) amortizado.
+
+    weights y sums se guardan siempre en float64, sea cual sea la política de tipos: con MAX_SCALE desbordarían
+    un float32 mucho antes de renormalizar.
+    """
+
+    MAX_SCALE = 1e150  # Límite de scale antes de renormalizar
+
+    def __init__(self, gamma: float = 0.99):
+        """
+        :param gamma: Factor de descuento, en (0, 1].
+        """
+        assert 0 < gamma <= 1, "El factor de descuento gamma debe estar en (0, 1]."
+
+        self.gamma = gamma
+
+    def reset(self, algo):
+        self.weights = np.zeros(algo.counts.shape)  # Suma de los pesos de las tiradas de cada brazo
+        self.sums = np.zeros(algo.counts.shape)  # Suma ponderada de las recompensas de cada brazo
+        self.scale = 1.0  # Peso de la observación actual: todos los bandidos avanzan a la vez
+
+    def _advance(self):
+        self.scale /= self.gamma
+        if self.scale > self.MAX_SCALE:
+            self.weights /= self.scale
+            self.sums /= self.scale
+            self.scale = 1.0
+
+    def update(self, algo, arm: int, reward: float):
+        self._advance()
+        self.weights[arm] += self.scale
+        self.sums[arm] += self.scale * reward
+        algo.values[arm] = self.sums[arm] / self.weights[arm]
+
+    def update_batch(self, algo, rows: np.ndarray, arms: np.ndarray, rewards: np.ndarray):
+        self._advance()
+        self.weights[rows, arms] += self.scale
+        self.sums[rows, arms] += self.scale * rewards
+        algo.values[rows, arms] = self.sums[rows, arms] / self.weights[rows, arms]
+
+    def exploration_counts(self, algo) -> np.ndarray:
+        return self.weights / self.scale
+
+    def exploration_time(self, algo, t):
+        # Suma de las cuentas descontadas de todos los brazos, (n_envs, 1) en modo por lotes
+        return np.sum(self.weights, axis=-1, keepdims=self.weights.ndim > 1) / self.scale
+
+    def get_state(self) -> dict:
+        return {'weights': self.weights, 'sums': self.sums, 'scale': self.scale}
+
+    def set_state(self, algo, state: dict):
+        self.weights = np.array(state['weights'], dtype=np.float64)
+        self.sums = np.array(state['sums'], dtype=np.float64)
+        self.scale = float(state['scale'])
+
+
+class SlidingWindow:
+    """
+    Ventana deslizante por brazo (SW-UCB): el valor de un brazo es la media de sus últimas window recompensas.
+
+    Las recompensas se guardan en un buffer circular preasignado por brazo, de modo que la memoria es
+    O(k * window) y cada actualización es O(1): se resta la recompensa que sale de la ventana y se suma la
+    que entra. Cada vez que el buffer de un brazo da la vuelta, su suma se recalcula para no acumular errores.
+    """
+
+    def __init__(self, window: int = 100):
+        """
+        :param window: Número de recompensas recientes de cada brazo.
+        """
+        assert window > 0, "El tamaño de la ventana debe ser mayor que 0."
+
+        self.window = window
+
+    def reset(self, algo):
+        self.buffer = np.zeros(algo.counts.shape + (self.window,), dtype=algo.value_dtype)  # Buffer circular de recompensas de cada brazo
+        self.position = np.zeros(algo.counts.shape, dtype=algo.count_dtype)  # Siguiente posición a escribir de cada buffer
+        self.sums = np.zeros(algo.counts.shape, dtype=algo.value_dtype)  # Suma de las recompensas de la ventana de cada brazo
+
+    def update(self, algo, arm: int, reward: float):
+        position = self.position[arm]
+        self.sums[arm] += reward - self.buffer[arm, position]  # La posición guarda la recompensa que sale (o 0)
+        self.buffer[arm, position] = reward
+        self.position[arm] = (position + 1) % self.window
+        if self.position[arm] == 0:
+            self.sums[arm] = np.sum(self.buffer[arm])
+        algo.values[arm] = self.sums[arm] / min(algo.counts[arm], self.window)
+
+    def update_batch(self, algo, rows: np.ndarray, arms: np.ndarray, rewards: np.ndarray):
+        position = self.position[rows, arms]
+        self.sums[rows, arms] += rewards - self.buffer[rows, arms, position]
+        self.buffer[rows, arms, position] = rewards
+        position = (position + 1) % self.window
+        self.position[rows, arms] = position
+
+        wrapped = position == 0
+        if wrapped.any():
+            self.sums[rows[wrapped], arms[wrapped]] = np.sum(self.buffer[rows[wrapped], arms[wrapped]], axis=-1)
+        algo.values[rows, arms] = self.sums[rows, arms] / np.minimum(algo.counts[rows, arms], self.window)
+
+    def exploration_counts(self, algo) -> np.ndarray:
+        return np.minimum(algo.counts, self.window)
+
+    def exploration_time(self, algo, t):
+        return t
+
+    def get_state(self) -> dict:
+        return {'buffer': self.buffer, 'position': self.position, 'sums': self.sums}
+
+    def set_state(self, algo, state: dict):
+        self.buffer = np.array(state['buffer'], dtype=algo.value_dtype)
+        self.position = np.array(state['position'], dtype=algo.count_dtype)
+        self.sums = np.array(state['sums'], dtype=algo.value_dtype)
@@ -13,29 +13,93 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
 from algorithms.algorithm import Algorithm
+from randomness import get_rng
 import numpy as np
 
 
 class GradientBandit(Algorithm):
-    def __init__(self, k: int, alpha: float = 0.1):
-        super().__init__(k)
+    STATE_ATTRIBUTES = Algorithm.STATE_ATTRIBUTES + ('preferences', 'avg_reward', 't')
+
+    def __init__(self, k: int, alpha: float = 0.1, rng=None, estimator=None):
+        assert estimator is None, "El gradiente usa la recompensa promedio de todas las tiradas y no admite otro estimador."
+        super().__init__(k, rng, estimator)
         self.alpha = alpha
-        self.preferences = np.zeros(k) # Inicializamos las preferencias en 0
+        self.preferences = np.zeros(k, dtype=self.value_dtype) # Inicializamos las preferencias en 0
         self.avg_reward = 0 # Recompensa promedio acumulada
         self.t = 0 
+        self._cache_probabilities()
 
     def select_arm(self) -> int:
-        exp_preferences = np.exp(self.preferences)
-        probabilities = exp_preferences / np.sum(exp_preferences) # Aquí calculamos la distribución softmax, que convierte las preferencias H(a) en probabilidades
-        return np.random.choice(self.k, p=probabilities) # Elegimos un brazo aleatorio en base a esas probabilidades
+        # La distribución softmax de las preferencias y su CDF se calculan una sola vez por paso, al final de update,
+        # así que elegir un brazo es una búsqueda binaria O(log k) sobre la CDF
+        u = get_rng(self.rng).random()
+        return min(int(np.searchsorted(self.cdf, u, side='right')), self.k - 1)
+
+    def select_arms(self) -> np.ndarray:
+        return self._sample_categorical(self.probabilities) # Una distribución softmax por bandido, ya calculada
 
     def update(self, chosen_arm: int, reward: float):
+        super().update(chosen_arm, reward) # Mantenemos counts y values para las estadísticas de los brazos
         self.t += 1
         self.avg_reward += (reward - self.avg_reward) / self.t # Actualizamos la recompensa promedio acumulada
-        probabilities = np.exp(self.preferences) / np.sum(np.exp(self.preferences)) # Calculamos otra vez las probabilidades actuales con softmax
+        delta = self.alpha * (reward - self.avg_reward)
+
+        # Actualizamos todas las preferencias a la vez usando gradientes, con las probabilidades ya calculadas:
+        # los otros brazos bajan delta * p (suben si el elegido fue malo) y el elegido sube delta * (1 - p)
+        gradient = delta * self.probabilities
+        gradient[chosen_arm] = -delta * (1 - self.probabilities[chosen_arm])
+        self.preferences -= gradient
+
+        self._cache_probabilities()
+
+    def update_batch(self, arms: np.ndarray, rewards: np.ndarray):
+        super().update_batch(arms, rewards)
+        self.t += 1
+        self.avg_reward += (rewards - self.avg_reward) / self.t # Una recompensa promedio por bandido
+
+        # Todos los brazos bajan en proporción a su probabilidad y el elegido recupera el término completo,
+        # que es lo mismo que sumar delta * (1 - p) al elegido y restar delta * p a los demás
+        delta = self.alpha * (rewards - self.avg_reward)
+        self.preferences -= delta[:, None] * self.probabilities
+        self.preferences[np.arange(self.n_envs), arms] += delta
+
+        self._cache_probabilities()
+
+    def _update_many(self, arms: np.ndarray, rewards: np.ndarray, batch_counts: np.ndarray):
+        super()._update_many(arms, rewards, batch_counts)
+
+        # La línea base de cada recompensa es la recompensa promedio tras incorporarla, como en update,
+        # calculada para todo el lote con una suma acumulada
+        m = arms.shape[-1]
+        baselines = (self.t * np.expand_dims(self.avg_reward, -1) + np.cumsum(rewards, axis=-1)) / (self.t + np.arange(1, m + 1))
+        self.t += m
+        self.avg_reward = baselines[-1] if self.n_envs is None else baselines[:, -1].astype(self.value_dtype)
+
+        # Gradiente de todo el lote con las probabilidades de la política que tomó las decisiones: todos los brazos
+        # bajan la suma de los delta por su probabilidad y cada brazo recupera los delta de sus tiradas
+        delta = self.alpha * (rewards - baselines)
+        self.preferences -= np.sum(delta, axis=-1)[..., None] * self.probabilities
+        self.preferences += self._scatter_sum(arms, delta)
+
+        self._cache_probabilities()
+
+    def reset(self):
+        super().reset()
+        self.preferences = np.zeros(self._state_shape(), dtype=self.value_dtype) # Reiniciamos las preferencias a 0
+        self.avg_reward = 0 if self.n_envs is None else np.zeros(self.n_envs, dtype=self.value_dtype)
+        self.t = 0
+        self._cache_probabilities()
+
+    def set_state(self, state: dict):
+        super().set_state(state)
+        self._cache_probabilities()
 
-        for i in range(self.k): # Actualizamos preferencias usando gradientes
-            if i == chosen_arm:
-                self.preferences[i] += self.alpha * (reward - self.avg_reward) * (1 - probabilities[i]) # El brazo elegido sube su preferencia si da una recompensa mayor que el promedio, si no, baja
-            else:
-                self.preferences[i] -= self.alpha * (reward - self.avg_reward) * probabilities[i] # Los otros brazos suben un poco si el elegido fue malo, si no, bajan
+    def _cache_probabilities(self):
+        # Distribución softmax, que convierte las preferencias H(a) en probabilidades; la usan tanto la selección como la siguiente actualización
+        if self.n_envs is None:
+            exp_preferences = np.exp(self.preferences)
+            self.probabilities = exp_preferences / np.sum(exp_preferences)
+            self.cdf = np.cumsum(self.probabilities)
+            self.cdf /= self.cdf[-1]
+        else:
+            self.probabilities = self._softmax(self.preferences)
@@ -0,0 +1,145 @@
+"""
+Module: algorithms/kl_ucb.py
+Description: Implementación del algoritmo KL-UCB (Bernoulli y gaussiano) para el problema de los k-brazos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from algorithms.algorithm import Algorithm
+import numpy as np
+
+EPSILON = 1e-12  # Margen para no evaluar el logaritmo en 0 ni en 1
+
+
+def _bernoulli_kl(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    Divergencia de Kullback-Leibler entre Bernoulli(p) y Bernoulli(q), elemento a elemento.
+    """
+    p = np.clip(p, EPSILON, 1 - EPSILON)
+    q = np.clip(q, EPSILON, 1 - EPSILON)
+    return p * np.log(p / q) + (1 - p) * np.log((1 - p) / (1 - q))
+
+
+def _bernoulli_kl_bound(p: np.ndarray, d: np.ndarray, start: np.ndarray, tol: float = 1e-9,
+                        max_iter: int = 50) -> np.ndarray:
+    """
+    Resuelve kl(p, q) = d en q, con q en [p, 1], para todos los brazos a la vez.
+
+    Newton salvaguardado con bisección: cada brazo mantiene un intervalo [lo, hi] que contiene la raíz, que se
+    estrecha con el signo de kl(p, q) - d, y si el paso de Newton sale del intervalo se toma su punto medio.
+    El intervalo inicial es [p, p + sqrt(d / 2)], por la desigualdad de Pinsker, recortado a 1 - EPSILON. Partiendo de las cotas del paso
+    anterior, que cambian poco, la mayoría de los brazos converge en dos o tres iteraciones.
+
+    :param p: Medias estimadas.
+    :param d: Nivel de divergencia de cada brazo (infinito para los brazos sin explorar, cuya cota es 1 - EPSILON).
+    :param start: Punto de partida de cada brazo.
+    :param tol: Tolerancia en q.
+    :param max_iter: Número máximo de iteraciones.
+    :return: Cota superior de cada brazo.
+    """
+    shape = np.shape(p)
+    # En float64 aunque values sea float32 (política 'compact'): en float32, 1 - EPSILON se redondea a 1
+    p = np.minimum(np.maximum(np.ravel(p).astype(np.float64), 0.0), 1 - EPSILON)
+    d = np.broadcast_to(d, shape).ravel()
+    lo = np.where(np.isinf(d), 1 - EPSILON, p)
+    hi = np.minimum(p + np.sqrt(d / 2), 1 - EPSILON)  # Más arriba la divergencia recortada ya no crece
+    q = np.minimum(np.maximum(np.ravel(start), lo), hi)
+
+    # Cada iteración trabaja solo con los brazos que aún no han convergido
+    active = np.arange(len(q))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Términos de la divergencia que solo dependen de p (con 0 * log(0) = 0)
+        p_log_p = np.where(p > 0, p * np.log(np.maximum(p, EPSILON)), 0.0)
+        r_log_r = (1 - p) * np.log(1 - p)
+
+        for _ in range(max_iter):
+            pa, qa, lo_a, hi_a = p[active], np.maximum(q[active], EPSILON), lo[active], hi[active]
+            f = p_log_p[active] - pa * np.log(qa) + r_log_r[active] - (1 - pa) * np.log(1 - qa) - d[active]
+            lo_a = np.where(f < 0, qa, lo_a)
+            hi_a = np.where(f >= 0, qa, hi_a)
+            lo[active], hi[active] = lo_a, hi_a
+
+            # El paso de Newton se da en x = -log(1 - q): en q la derivada (q - p) / (q (1 - q)) explota cerca
+            # de 1 y los pasos se vuelven diminutos sin haber convergido, mientras que en x es (q - p) / q <= 1
+            dx = f * qa / (qa - pa)
+            newton = 1 - (1 - qa) * np.exp(dx)
+            inside = (newton >= lo_a) & (newton <= hi_a)
+            q[active] = np.where(inside, newton, (lo_a + hi_a) / 2)
+
+            converged = (inside & (np.abs(dx) < tol)) | (hi_a - lo_a < tol)
+            active = active[~converged]
+            if len(active) == 0:
+                break
+
+    return q.reshape(shape)
+
+
+class KLUCB(Algorithm):
+    FAMILIES = ('bernoulli', 'gaussian')
+    STATE_ATTRIBUTES = Algorithm.STATE_ATTRIBUTES + ('t', 'bounds')
+
+    def __init__(self, k: int, family: str = 'bernoulli', c: float = 0, sigma: float = 1, rng=None, estimator=None):
+        """
+        KL-UCB: la cota de cada brazo es el mayor q tal que counts * KL(value, q) <= log(t) + c * log(log(t)).
+
+        Con recompensas en [0, 1] la divergencia de Bernoulli da cotas mucho más ajustadas que la de Hoeffding
+        de UCB1, sobre todo cerca de 0 y de 1. Con la divergencia gaussiana la cota tiene forma cerrada,
+        value + sigma * sqrt(2 * d).
+
+        :param k: Número de brazos.
+        :param family: Divergencia usada, 'bernoulli' o 'gaussian'.
+        :param c: Peso del término log(log(t)). 0 es lo recomendado en la práctica.
+        :param sigma: Desviación típica supuesta de las recompensas (solo en la familia gaussiana).
+        :param rng: Generador aleatorio (opcional).
+        :param estimator: Estimador de values (opcional).
+        """
+        assert family in self.FAMILIES, f"La familia debe ser una de {self.FAMILIES}."
+        assert c >= 0, "El parámetro c debe ser mayor o igual que 0."
+        assert sigma > 0, "La desviación típica sigma debe ser mayor que 0."
+
+        super().__init__(k, rng, estimator)
+        self.family = family
+        self.c = c
+        self.sigma = sigma
+        self.t = 0  # Paso actual
+        self.bounds = np.ones(k, dtype=self.value_dtype)  # Cotas del último paso, punto de partida del siguiente
+
+    def select_arm(self) -> int:
+        self.t += 1
+
+        unpulled = np.flatnonzero(self.counts == 0)  # Explorar cada brazo al menos una vez
+        if len(unpulled):
+            return int(unpulled[0])
+
+        return int(np.argmax(self._upper_bounds()))
+
+    def select_arms(self) -> np.ndarray:
+        self.t += 1
+        unpulled = self.counts == 0  # Los bandidos con algún brazo sin explorar eligen el primero de ellos
+
+        return np.where(unpulled.any(axis=1), np.argmax(unpulled, axis=1), np.argmax(self._upper_bounds(), axis=1))
+
+    def reset(self):
+        super().reset()
+        self.t = 0
+        self.bounds = np.ones(self._state_shape(), dtype=self.value_dtype)
+
+    def _upper_bounds(self) -> np.ndarray:
+        counts, t = self._exploration_statistics(self.t)
+        log_t = np.log(np.maximum(t, 1))
+        exploration = log_t + self.c * np.log(np.maximum(log_t, 1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d = np.where(counts > 0, exploration / counts, np.inf)
+
+        if self.family == 'gaussian':
+            return self.values + self.sigma * np.sqrt(2 * d)
+
+        self.bounds = _bernoulli_kl_bound(self.values, d, self.bounds).astype(self.value_dtype, copy=False)
+        return self.bounds
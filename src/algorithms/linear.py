@@ -0,0 +1,167 @@
+"""
+Module: algorithms/linear.py
+Description: Implementación de los algoritmos contextuales LinUCB y Thompson Sampling lineal.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from abc import abstractmethod
+
+import numpy as np
+
+from algorithms.algorithm import Algorithm
+from randomness import get_rng
+
+
+class LinearAlgorithm(Algorithm):
+    """
+    Base de los algoritmos contextuales con un modelo lineal por brazo: la recompensa esperada del brazo a
+    para el contexto x se estima como x . theta_a, con theta_a = A_a^-1 b_a por mínimos cuadrados regularizados
+    (A_a = lam * I + suma de x x^T y b_a = suma de recompensa * x de las tiradas del brazo).
+
+    Se mantiene directamente la inversa A_a^-1, actualizada con Sherman-Morrison en O(d^2) en cada tirada,
+    así que nunca se invierte ni se factoriza una matriz. La puntuación de todos los brazos para un lote de
+    contextos es la estimación más un término de exploración proporcional a sqrt(x^T A_a^-1 x), y ambos se
+    calculan con una llamada a einsum cada uno, en O(k d^2) por contexto.
+
+    select_arm y update reciben el contexto. En modo por lotes hay un modelo por bandido y un contexto por bandido.
+    """
+    contextual = True
+    STATE_ATTRIBUTES = Algorithm.STATE_ATTRIBUTES + ('inverse_design', 'response', 'theta')
+
+    def __init__(self, k: int, d: int, lam: float = 1.0, rng=None):
+        """
+        :param k: Número de brazos.
+        :param d: Dimensión de los contextos.
+        :param lam: Regularización de los mínimos cuadrados (A_a = lam * I al inicio).
+        :param rng: Generador aleatorio (opcional).
+        """
+        assert d > 0, "La dimensión d debe ser mayor que 0."
+        assert lam > 0, "La regularización lam debe ser mayor que 0."
+
+        super().__init__(k, rng)
+        self.d = d
+        self.lam = lam
+        self._reset_model()
+
+    def select_arm(self, context: np.ndarray):
+        """
+        Selecciona un brazo para un contexto (d,) o uno por contexto para un lote (n, d) con el mismo modelo.
+
+        :return: Índice del brazo o array (n,) de índices.
+        """
+        scores = self._scores(context)
+        return int(np.argmax(scores)) if scores.ndim == 1 else np.argmax(scores, axis=-1)
+
+    def select_arms(self, contexts: np.ndarray) -> np.ndarray:
+        """
+        Selecciona un brazo para cada bandido en modo por lotes.
+
+        :param contexts: Array (n_envs, d) con el contexto de cada bandido.
+        """
+        return np.argmax(self._scores(contexts), axis=-1)
+
+    def update(self, chosen_arm: int, reward: float, context: np.ndarray):
+        super().update(chosen_arm, reward)  # Mantenemos counts y values para las estadísticas de los brazos
+
+        # Sherman-Morrison: (A + x x^T)^-1 = A^-1 - (A^-1 x)(A^-1 x)^T / (1 + x^T A^-1 x)
+        inverse = self.inverse_design[chosen_arm]
+        projected = inverse @ context
+        inverse -= np.outer(projected, projected) / (1 + context @ projected)
+
+        self.response[chosen_arm] += reward * context
+        self.theta[chosen_arm] = inverse @ self.response[chosen_arm]
+
+    def update_batch(self, arms: np.ndarray, rewards: np.ndarray, contexts: np.ndarray):
+        super().update_batch(arms, rewards)
+        rows = np.arange(self.n_envs)
+
+        inverse = self.inverse_design[rows, arms]
+        projected = np.einsum('nde,ne->nd', inverse, contexts)
+        denominator = 1 + np.einsum('nd,nd->n', contexts, projected)
+        inverse -= np.einsum('nd,ne->nde', projected, projected) / denominator[:, None, None]
+        self.inverse_design[rows, arms] = inverse
+
+        self.response[rows, arms] += rewards[:, None] * contexts
+        self.theta[rows, arms] = np.einsum('nde,ne->nd', inverse, self.response[rows, arms])
+
+    def reset(self):
+        super().reset()
+        self._reset_model()
+
+    def _scores(self, contexts: np.ndarray) -> np.ndarray:
+        """
+        Puntuación de cada brazo: estimación x . theta_a más el término de exploración del algoritmo.
+
+        :param contexts: Array (..., d). En modo por lotes, (n_envs, d).
+        :return: Array (..., k).
+        """
+        means = np.einsum('...d,...kd->...k', contexts, self.theta)
+        widths = np.sqrt(np.einsum('...d,...kde,...e->...k', contexts, self.inverse_design, contexts))
+        return means + self._exploration(widths)
+
+    @abstractmethod
+    def _exploration(self, widths: np.ndarray) -> np.ndarray:
+        """
+        Término de exploración a partir de la anchura sqrt(x^T A_a^-1 x) de cada brazo.
+        """
+        raise NotImplementedError("Este método debe ser implementado por la subclase.")
+
+    def _reset_model(self):
+        shape = self._state_shape()
+        self.inverse_design = np.broadcast_to(np.eye(self.d, dtype=self.value_dtype) / self.lam,
+                                              shape + (self.d, self.d)).copy()
+        self.response = np.zeros(shape + (self.d,), dtype=self.value_dtype)
+        self.theta = np.zeros(shape + (self.d,), dtype=self.value_dtype)
+
+
+class LinUCB(LinearAlgorithm):
+    def __init__(self, k: int, d: int, alpha: float = 1.0, lam: float = 1.0, rng=None):
+        """
+        LinUCB (cota superior de confianza con modelos lineales disjuntos): x . theta_a + alpha * sqrt(x^T A_a^-1 x).
+
+        :param k: Número de brazos.
+        :param d: Dimensión de los contextos.
+        :param alpha: Peso del término de exploración.
+        :param lam: Regularización de los mínimos cuadrados.
+        :param rng: Generador aleatorio (opcional).
+        """
+        assert alpha >= 0, "El parámetro alpha debe ser mayor o igual que 0."
+
+        super().__init__(k, d, lam, rng)
+        self.alpha = alpha
+
+    def _exploration(self, widths: np.ndarray) -> np.ndarray:
+        return self.alpha * widths
+
+
+class LinearThompson(LinearAlgorithm):
+    def __init__(self, k: int, d: int, v: float = 1.0, lam: float = 1.0, rng=None):
+        """
+        Thompson Sampling lineal: la posteriori de theta_a es N(theta_a, v^2 A_a^-1).
+
+        Para un contexto, la puntuación muestreada x . theta_a~ tiene distribución N(x . theta_a, v^2 x^T A_a^-1 x),
+        así que se muestrea directamente esa normal unidimensional por brazo en lugar del vector theta_a~: se elige
+        el mismo brazo con la misma probabilidad sin factorizar A_a^-1 (O(d^3)) en cada paso. Cada contexto de un
+        lote recibe su propia muestra de la posteriori.
+
+        :param k: Número de brazos.
+        :param d: Dimensión de los contextos.
+        :param v: Escala de la posteriori (mayor v, más exploración).
+        :param lam: Regularización de los mínimos cuadrados.
+        :param rng: Generador aleatorio (opcional).
+        """
+        assert v > 0, "La escala v debe ser mayor que 0."
+
+        super().__init__(k, d, lam, rng)
+        self.v = v
+
+    def _exploration(self, widths: np.ndarray) -> np.ndarray:
+        return self.v * widths * get_rng(self.rng).standard_normal(widths.shape)
@@ -0,0 +1,187 @@
+"""
+Module: algorithms/segment_tree.py
+Description: Árboles de segmentos para seleccionar y muestrear brazos en tiempo O(log k) cuando k es muy grande.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import sys
+
+import numpy as np
+
+
+def _list_nbytes(values: list) -> int:
+    """
+    Memoria de una lista de Python y de los números que contiene (cada uno es un objeto aparte).
+    """
+    return sys.getsizeof(values) + sum(map(sys.getsizeof, values))
+
+
+class MaxSegmentTree:
+    """
+    Árbol de segmentos sobre k valores que mantiene el índice del máximo.
+
+    Actualizar un valor cuesta O(log k) y consultar el índice del máximo O(1). Ante empates se devuelve
+    el índice más bajo, igual que np.argmax. Los nodos se guardan en listas de Python porque el acceso
+    escalar a una lista es más barato que a un array de NumPy.
+    """
+
+    def __init__(self, values: np.ndarray):
+        """
+        Construye el árbol en O(k) a partir de los valores iniciales.
+
+        :param values: Array (k,) de valores.
+        """
+        self.k = len(values)
+        self.size = 1 << max(self.k - 1, 0).bit_length()  # Número de hojas: potencia de 2 >= k
+
+        # Nodo i: hijos 2i y 2i+1; hojas en [size, 2 * size)
+        tree = np.full(2 * self.size, -np.inf)
+        arg = np.zeros(2 * self.size, dtype=int)
+        tree[self.size:self.size + self.k] = values
+        arg[self.size:] = np.arange(self.size)
+
+        # Construcción vectorizada nivel a nivel, de las hojas a la raíz
+        start = self.size
+        while start > 1:
+            parents = np.arange(start // 2, start)
+            left, right = 2 * parents, 2 * parents + 1
+            take_left = tree[left] >= tree[right]
+            tree[parents] = np.where(take_left, tree[left], tree[right])
+            arg[parents] = np.where(take_left, arg[left], arg[right])
+            start //= 2
+
+        self.tree = tree.tolist()
+        self.arg = arg.tolist()
+
+    def update(self, index: int, value: float):
+        """
+        Cambia el valor de una hoja y recalcula sus ancestros.
+
+        :param index: Índice del valor (0 a k-1).
+        :param value: Nuevo valor.
+        """
+        tree, arg = self.tree, self.arg
+        node = index + self.size
+        tree[node] = value
+
+        node //= 2
+        while node >= 1:
+            left, right = 2 * node, 2 * node + 1
+            if tree[left] >= tree[right]:
+                tree[node], arg[node] = tree[left], arg[left]
+            else:
+                tree[node], arg[node] = tree[right], arg[right]
+            node //= 2
+
+    def argmax(self) -> int:
+        """
+        :return: Índice del valor máximo.
+        """
+        return self.arg[1]
+
+    def max(self) -> float:
+        """
+        :return: Valor máximo.
+        """
+        return self.tree[1]
+
+    def nbytes(self) -> int:
+        """
+        :return: Memoria ocupada por los nodos del árbol, en bytes.
+        """
+        return _list_nbytes(self.tree) + _list_nbytes(self.arg)
+
+
+class SumSegmentTree:
+    """
+    Árbol de segmentos sobre k pesos no negativos que mantiene sus sumas parciales.
+
+    Permite cambiar un peso en O(log k) y muestrear un índice con probabilidad proporcional a su peso
+    en O(log k), sin normalizar ni construir la función de distribución en cada paso.
+    """
+
+    def __init__(self, weights: np.ndarray):
+        """
+        Construye el árbol en O(k) a partir de los pesos iniciales.
+
+        :param weights: Array (k,) de pesos no negativos.
+        """
+        self.k = len(weights)
+        self.size = 1 << max(self.k - 1, 0).bit_length()  # Número de hojas: potencia de 2 >= k
+
+        # Nodo i: hijos 2i y 2i+1; hojas en [size, 2 * size)
+        tree = np.zeros(2 * self.size)
+        tree[self.size:self.size + self.k] = weights
+
+        # Construcción vectorizada nivel a nivel, de las hojas a la raíz
+        start = self.size
+        while start > 1:
+            parents = np.arange(start // 2, start)
+            tree[parents] = tree[2 * parents] + tree[2 * parents + 1]
+            start //= 2
+
+        self.tree = tree.tolist()
+
+    def update(self, index: int, weight: float):
+        """
+        Cambia el peso de una hoja y recalcula las sumas de sus ancestros.
+
+        :param index: Índice del peso (0 a k-1).
+        :param weight: Nuevo peso.
+        """
+        tree = self.tree
+        node = index + self.size
+        tree[node] = weight
+
+        node //= 2
+        while node >= 1:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]  # Se recalcula la suma, sin acumular errores de redondeo
+            node //= 2
+
+    def find(self, mass: float) -> int:
+        """
+        Índice i tal que la suma de los pesos anteriores a i es <= mass y la suma hasta i incluido es > mass.
+
+        :param mass: Valor en [0, total).
+        :return: Índice encontrado.
+        """
+        tree = self.tree
+        node = 1
+        while node < self.size:
+            left = 2 * node
+            if mass < tree[left]:
+                node = left
+            else:
+                mass -= tree[left]
+                node = left + 1
+
+        return min(node - self.size, self.k - 1)
+
+    def sample(self, u: float) -> int:
+        """
+        Muestrea un índice con probabilidad proporcional a su peso.
+
+        :param u: Uniforme en [0, 1).
+        :return: Índice muestreado.
+        """
+        return self.find(u * self.tree[1])
+
+    def total(self) -> float:
+        """
+        :return: Suma de todos los pesos.
+        """
+        return self.tree[1]
+
+    def nbytes(self) -> int:
+        """
+        :return: Memoria ocupada por los nodos del árbol, en bytes.
+        """
+        return _list_nbytes(self.tree)
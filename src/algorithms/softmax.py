@@ -13,7 +13,10 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
 from algorithms.algorithm import Algorithm
+from algorithms.segment_tree import SumSegmentTree
+from randomness import get_rng
 import numpy as np
+import math
 
 # Aquí básicamente seleccionamos cada brazo con una probabilidad proporcional a su valor estimado. La temperatura (tau) nos indica: 
 # A más alta -> más exploración (todas las probabilidades son casi iguales)
@@ -22,11 +25,51 @@ import numpy as np
 
 
 class Softmax(Algorithm):
-    def __init__(self, k: int, tau: float = 1.0):
-        super().__init__(k)
+    MAX_EXPONENT = 500.0  # Si (valor - desplazamiento) / tau supera este límite, los pesos se recalculan con un nuevo desplazamiento
+
+    def __init__(self, k: int, tau: float = 1.0, rng=None, estimator=None):
+        super().__init__(k, rng, estimator)
         self.tau = tau
+        self._build_tree()
 
     def select_arm(self) -> int: 
-        exp_values = np.exp(self.values / self.tau) # Elevamos a e los valores estimados de cada brazo (self.values) y dividimos por tau
-        probabilities = exp_values / np.sum(exp_values) # Se normalizan las probabilidades
-        return np.random.choice(self.k, p=probabilities) # Se elige un brazo al azar, pero con sesgo hacia los de mayor probabilidad
\ No newline at end of file
+        # El árbol de sumas guarda los pesos exp(values / tau) (salvo un factor común), así que muestrear
+        # un brazo con probabilidad proporcional a su peso cuesta O(log k) y no hay que normalizar nada
+        return self.tree.sample(get_rng(self.rng).random())
+
+    def select_arms(self) -> np.ndarray:
+        probabilities = self._softmax(self.values / self.tau) # Una distribución softmax por bandido
+        return self._sample_categorical(probabilities)
+
+    def update(self, chosen_arm: int, reward: float):
+        super().update(chosen_arm, reward)
+
+        # Solo cambia el valor del brazo elegido, así que solo hay que actualizar su peso
+        exponent = (self.values[chosen_arm] - self.shift) / self.tau
+        if exponent > self.MAX_EXPONENT:
+            self._build_tree() # Evitamos el overflow desplazando todos los pesos
+        else:
+            self.tree.update(chosen_arm, math.exp(exponent))
+            if self.tree.total() < 1e-300: # Todos los pesos se han ido a 0 (underflow)
+                self._build_tree()
+
+    def _update_many(self, arms: np.ndarray, rewards: np.ndarray, batch_counts: np.ndarray):
+        super()._update_many(arms, rewards, batch_counts)
+        self._build_tree() # Han cambiado varios pesos a la vez: se reconstruye el árbol una sola vez
+
+    def reset(self):
+        super().reset()
+        self._build_tree()
+
+    def set_state(self, state: dict):
+        super().set_state(state)
+        self._build_tree()
+
+    def _build_tree(self):
+        # Los pesos se desplazan por el valor máximo: exp((values - shift) / tau) es proporcional a exp(values / tau)
+        # El árbol solo se usa con un único bandido; en modo por lotes select_arms trabaja sobre los arrays completos
+        if self.n_envs is not None:
+            self.tree = None
+            return
+        self.shift = np.max(self.values)
+        self.tree = SumSegmentTree(np.exp((self.values - self.shift) / self.tau))
@@ -0,0 +1,191 @@
+"""
+Module: algorithms/thompson_sampling.py
+Description: Implementación de Thompson Sampling (Beta-Bernoulli, Beta-Binomial y Normal-Gamma) para el problema de los k-brazos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+
+from algorithms.algorithm import Algorithm
+from randomness import get_rng
+
+# Thompson Sampling mantiene una distribución a posteriori de la recompensa media de cada brazo. En cada paso
+# extrae una muestra de cada posteriori y elige el brazo con la mayor: los brazos con mucha incertidumbre
+# se exploran porque a veces dan muestras altas, y la exploración desaparece sola a medida que se concentran.
+# Las muestras de todos los brazos (y de todos los bandidos en modo por lotes) se extraen con una única llamada.
+
+
+class ThompsonBernoulli(Algorithm):
+    STATE_ATTRIBUTES = Algorithm.STATE_ATTRIBUTES + ('alphas', 'betas')
+
+    def __init__(self, k: int, alpha_prior: float = 1.0, beta_prior: float = 1.0, rng=None, estimator=None):
+        """
+        Thompson Sampling con a priori Beta(alpha_prior, beta_prior) para recompensas Bernoulli.
+
+        :param k: Número de brazos.
+        :param alpha_prior: Parámetro alpha de la a priori (éxitos ficticios).
+        :param beta_prior: Parámetro beta de la a priori (fracasos ficticios).
+        :param rng: Generador aleatorio (opcional).
+        :param estimator: No se admite: la posteriori usa todas las recompensas, y un estimador con olvido
+        (Discounted, SlidingWindow) solo cambiaría values, no la política.
+        """
+        assert alpha_prior > 0 and beta_prior > 0, "Los parámetros de la a priori Beta deben ser positivos."
+        assert estimator is None, "Thompson Sampling actualiza la posteriori con todas las recompensas y no admite otro estimador."
+
+        super().__init__(k, rng, estimator)
+        self.alpha_prior = alpha_prior
+        self.beta_prior = beta_prior
+        self.n = 1  # Ensayos por tirada
+        self._reset_posterior()
+
+    def select_arm(self) -> int:
+        return int(np.argmax(get_rng(self.rng).beta(self.alphas, self.betas)))
+
+    def select_arms(self) -> np.ndarray:
+        return np.argmax(get_rng(self.rng).beta(self.alphas, self.betas), axis=1)
+
+    def update(self, chosen_arm: int, reward: float):
+        super().update(chosen_arm, reward)
+        # Posteriori conjugada: los éxitos suman a alpha y los fracasos a beta. Las recompensas fuera de [0, n]
+        # se recortan para que la posteriori siga siendo una Beta válida
+        successes = min(max(reward, 0), self.n)
+        self.alphas[chosen_arm] += successes
+        self.betas[chosen_arm] += self.n - successes
+
+    def update_batch(self, arms: np.ndarray, rewards: np.ndarray):
+        super().update_batch(arms, rewards)
+        rows = np.arange(self.n_envs)
+        successes = np.clip(rewards, 0, self.n)
+        self.alphas[rows, arms] += successes
+        self.betas[rows, arms] += self.n - successes
+
+    def _update_many(self, arms: np.ndarray, rewards: np.ndarray, batch_counts: np.ndarray):
+        super()._update_many(arms, rewards, batch_counts)
+        successes = self._scatter_sum(arms, np.clip(rewards, 0, self.n))
+        self.alphas += successes
+        self.betas += self.n * batch_counts - successes
+
+    def reset(self):
+        super().reset()
+        self._reset_posterior()
+
+    def _reset_posterior(self):
+        self.alphas = np.full(self._state_shape(), self.alpha_prior, dtype=self.value_dtype)
+        self.betas = np.full(self._state_shape(), self.beta_prior, dtype=self.value_dtype)
+
+
+class ThompsonBinomial(ThompsonBernoulli):
+    def __init__(self, k: int, n: int = 10, alpha_prior: float = 1.0, beta_prior: float = 1.0, rng=None, estimator=None):
+        """
+        Thompson Sampling con a priori Beta(alpha_prior, beta_prior) sobre la probabilidad de éxito de recompensas
+        Binomial(n, p). Cada tirada aporta n ensayos, y elegir el mayor p muestreado equivale a elegir el mayor n * p.
+
+        :param k: Número de brazos.
+        :param n: Número de ensayos de cada tirada (el mismo para todos los brazos, 10 como en ArmBinomial.generate_arms).
+        :param alpha_prior: Parámetro alpha de la a priori.
+        :param beta_prior: Parámetro beta de la a priori.
+        :param rng: Generador aleatorio (opcional).
+        :param estimator: No se admite: la posteriori usa todas las recompensas, y un estimador con olvido
+        (Discounted, SlidingWindow) solo cambiaría values, no la política.
+        """
+        assert n > 0, "El número de ensayos n debe ser mayor que 0."
+
+        super().__init__(k, alpha_prior, beta_prior, rng, estimator)
+        self.n = n
+
+
+class ThompsonNormal(Algorithm):
+    STATE_ATTRIBUTES = Algorithm.STATE_ATTRIBUTES + ('means', 'kappas', 'alphas', 'betas')
+
+    def __init__(self, k: int, mu_prior: float = 0.0, kappa_prior: float = 1.0, alpha_prior: float = 1.0,
+                 beta_prior: float = 1.0, rng=None, estimator=None):
+        """
+        Thompson Sampling con a priori Normal-Gamma para recompensas normales de media y varianza desconocidas.
+
+        La precisión lambda sigue una Gamma(alpha, beta) y la media, dada la precisión, una N(mu, 1 / (kappa * lambda)).
+
+        :param k: Número de brazos.
+        :param mu_prior: Media a priori.
+        :param kappa_prior: Número de observaciones ficticias que respaldan mu_prior.
+        :param alpha_prior: Forma de la a priori Gamma de la precisión.
+        :param beta_prior: Tasa de la a priori Gamma de la precisión.
+        :param rng: Generador aleatorio (opcional).
+        :param estimator: No se admite: la posteriori usa todas las recompensas, y un estimador con olvido
+        (Discounted, SlidingWindow) solo cambiaría values, no la política.
+        """
+        assert kappa_prior > 0 and alpha_prior > 0 and beta_prior > 0, \
+            "Los parámetros kappa, alpha y beta de la a priori deben ser positivos."
+        assert estimator is None, "Thompson Sampling actualiza la posteriori con todas las recompensas y no admite otro estimador."
+
+        super().__init__(k, rng, estimator)
+        self.mu_prior = mu_prior
+        self.kappa_prior = kappa_prior
+        self.alpha_prior = alpha_prior
+        self.beta_prior = beta_prior
+        self._reset_posterior()
+
+    def _sample_means(self) -> np.ndarray:
+        # Dos llamadas vectorizadas: la precisión de cada brazo y, dada ella, su media
+        rng = get_rng(self.rng)
+        precision = rng.gamma(self.alphas, 1.0 / self.betas)
+        return rng.normal(self.means, 1.0 / np.sqrt(self.kappas * precision))
+
+    def select_arm(self) -> int:
+        return int(np.argmax(self._sample_means()))
+
+    def select_arms(self) -> np.ndarray:
+        return np.argmax(self._sample_means(), axis=1)
+
+    def update(self, chosen_arm: int, reward: float):
+        super().update(chosen_arm, reward)
+
+        # Actualización conjugada de la Normal-Gamma con una observación
+        mean, kappa = self.means[chosen_arm], self.kappas[chosen_arm]
+        self.betas[chosen_arm] += kappa * (reward - mean) ** 2 / (2 * (kappa + 1))
+        self.alphas[chosen_arm] += 0.5
+        self.means[chosen_arm] = (kappa * mean + reward) / (kappa + 1)
+        self.kappas[chosen_arm] = kappa + 1
+
+    def update_batch(self, arms: np.ndarray, rewards: np.ndarray):
+        super().update_batch(arms, rewards)
+
+        rows = np.arange(self.n_envs)
+        mean, kappa = self.means[rows, arms], self.kappas[rows, arms]
+        self.betas[rows, arms] += kappa * (rewards - mean) ** 2 / (2 * (kappa + 1))
+        self.alphas[rows, arms] += 0.5
+        self.means[rows, arms] = (kappa * mean + rewards) / (kappa + 1)
+        self.kappas[rows, arms] = kappa + 1
+
+    def _update_many(self, arms: np.ndarray, rewards: np.ndarray, batch_counts: np.ndarray):
+        super()._update_many(arms, rewards, batch_counts)
+
+        # Actualización conjugada con las n observaciones de cada brazo a la vez, a partir de su media
+        # muestral y su suma de cuadrados de las desviaciones: equivale a n actualizaciones de una observación
+        pulled = batch_counts > 0
+        n = batch_counts[pulled]
+        sums = self._scatter_sum(arms, rewards)[pulled]
+        batch_mean = sums / n
+        deviations = np.maximum(self._scatter_sum(arms, rewards ** 2)[pulled] - sums * batch_mean, 0)  # Sin negativos por redondeo
+        mean, kappa = self.means[pulled], self.kappas[pulled]
+        self.betas[pulled] += deviations / 2 + kappa * n * (batch_mean - mean) ** 2 / (2 * (kappa + n))
+        self.alphas[pulled] += n / 2
+        self.means[pulled] = (kappa * mean + sums) / (kappa + n)
+        self.kappas[pulled] = kappa + n
+
+    def reset(self):
+        super().reset()
+        self._reset_posterior()
+
+    def _reset_posterior(self):
+        self.means = np.full(self._state_shape(), self.mu_prior, dtype=self.value_dtype)
+        self.kappas = np.full(self._state_shape(), self.kappa_prior, dtype=self.value_dtype)
+        self.alphas = np.full(self._state_shape(), self.alpha_prior, dtype=self.value_dtype)
+        self.betas = np.full(self._state_shape(), self.beta_prior, dtype=self.value_dtype)
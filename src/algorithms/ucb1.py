@@ -13,23 +13,92 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
 from algorithms.algorithm import Algorithm
+from algorithms.segment_tree import MaxSegmentTree
 import numpy as np
+import math
 
 
 class UCB1(Algorithm):
-    def __init__(self, k: int, c: float = 1):
-        super().__init__(k)
+    REFRESH_RATIO = 1.1  # En modo indexado, las cotas se recalculan todas cuando t crece este factor
+    STATE_ATTRIBUTES = Algorithm.STATE_ATTRIBUTES + ('t',)
+
+    def __init__(self, k: int, c: float = 1, rng=None, indexed: bool = False, estimator=None):
+        assert not (indexed and estimator is not None), "El modo indexado solo admite la media muestral."
+        super().__init__(k, rng, estimator)
         self.t = 0  # Paso actual
         self.c = c  # Parámetro para ajustar exploración
+        self.indexed = indexed  # Modo para k grande: cursor de brazos sin explorar y árbol de segmentos sobre las cotas
+        self._reset_index()
 
     def select_arm(self) -> int:
         self.t += 1
+        if self.indexed:
+            return self._select_indexed()
+
         for i in range(self.k):
             if self.counts[i] == 0: # Explorar cada brazo al menos una vez
                 return i  
 
         # Cálculo del valor UCB1 para cada brazo, según fórmula de las diapositivas
-        ucb_values = self.values + self.c * np.sqrt(2 * np.log(self.t) / self.counts)
+        # (con un estimador descontado o con ventana, las cuentas son las de la información que conserva)
+        counts, t = self._exploration_statistics(self.t)
+        ucb_values = self.values + self.c * np.sqrt(2 * np.log(t) / counts)
 
         # Seleccionamos brazo con mayor valor UCB
         return np.argmax(ucb_values)
+
+    def select_arms(self) -> np.ndarray:
+        self.t += 1
+        unpulled = self.counts == 0 # Los bandidos con algún brazo sin explorar eligen el primero de ellos
+
+        counts, t = self._exploration_statistics(self.t)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ucb_values = self.values + self.c * np.sqrt(2 * np.log(t) / counts)
+
+        return np.where(unpulled.any(axis=1), np.argmax(unpulled, axis=1), np.argmax(ucb_values, axis=1))
+
+    def update(self, chosen_arm: int, reward: float):
+        super().update(chosen_arm, reward)
+
+        if self.indexed:
+            while self.next_unpulled < self.k and self.counts[self.next_unpulled] > 0: # Avanzamos el cursor
+                self.next_unpulled += 1
+            if self.tree is not None: # Solo la cota del brazo elegido cambia de forma apreciable
+                self.tree.update(chosen_arm, self.values[chosen_arm] + self.c * math.sqrt(2 * math.log(self.t) / self.counts[chosen_arm]))
+
+    def reset(self):
+        super().reset()
+        self.t = 0
+        self._reset_index()
+
+    def set_state(self, state: dict):
+        super().set_state(state)
+        self._rebuild_index()
+
+    def _update_many(self, arms: np.ndarray, rewards: np.ndarray, batch_counts: np.ndarray):
+        super()._update_many(arms, rewards, batch_counts)
+        self._rebuild_index() # Han cambiado varias cotas a la vez: el árbol se reconstruye una vez en la siguiente selección
+
+    def _rebuild_index(self):
+        self._reset_index()
+        if self.indexed and self.n_envs is None: # El cursor se recoloca en el primer brazo sin explorar; el árbol se reconstruye al seleccionar
+            unpulled = np.flatnonzero(self.counts == 0)
+            self.next_unpulled = int(unpulled[0]) if len(unpulled) else self.k
+
+    def _select_indexed(self) -> int:
+        # Mientras quede algún brazo sin explorar, el cursor apunta al primero de ellos
+        if self.next_unpulled < self.k:
+            return self.next_unpulled
+
+        # Refresco perezoso: la cota de los brazos no elegidos solo cambia a través de log(t),
+        # así que todas las cotas se recalculan únicamente cuando t ha crecido un factor REFRESH_RATIO
+        if self.tree is None or self.t >= self.REFRESH_RATIO * self.refresh_t:
+            self.tree = MaxSegmentTree(self.values + self.c * np.sqrt(2 * np.log(self.t) / self.counts))
+            self.refresh_t = self.t
+
+        return self.tree.argmax()
+
+    def _reset_index(self):
+        self.next_unpulled = 0  # Primer brazo sin explorar
+        self.tree = None  # Se construye cuando todos los brazos se han explorado
+        self.refresh_t = 0  # Paso del último recálculo completo de las cotas
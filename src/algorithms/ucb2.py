@@ -1,27 +1,43 @@
 from algorithms.algorithm import Algorithm
+from algorithms.segment_tree import MaxSegmentTree
 import numpy as np
 import math
 
 class UCB2(Algorithm):
-    def __init__(self, k: int, alpha: float = 0.1):
+    REFRESH_RATIO = 1.1  # En modo indexado, las cotas se recalculan todas cuando el total de tiradas crece este factor
+    STATE_ATTRIBUTES = Algorithm.STATE_ATTRIBUTES + ('epochs', 'tau')
+
+    def __init__(self, k: int, alpha: float = 0.1, rng=None, indexed: bool = False, estimator=None):
         """
         Inicializa el algoritmo UCB2 con k brazos y un parámetro alpha para el balance entre exploración y explotación.
 
         :param k: Número de brazos.
         :param alpha: Parámetro de ajuste (0 < alpha < 1), controla la frecuencia de exploración.
+        :param rng: Generador aleatorio (opcional). UCB2 es determinista, se acepta por uniformidad.
+        :param indexed: Modo para k grande: cursor de brazos sin explorar y árbol de segmentos sobre los índices UCB2,
+                        con refresco perezoso, para que cada decisión cueste O(log k) amortizado.
+        :param estimator: Estimador de la recompensa de cada brazo (opcional, media muestral por defecto). No es
+                          compatible con el modo indexado. Con un estimador descontado, el total de tiradas del
+                          término de exploración es el total descontado.
         """
         assert 0 < alpha < 1, "El parámetro alpha debe estar en el rango (0,1)."
-        super().__init__(k)  
+        assert not (indexed and estimator is not None), "El modo indexado solo admite la media muestral."
+        super().__init__(k, rng, estimator)  
         self.alpha = alpha
-        self.epochs = np.zeros(k, dtype=int)  # Número de épocas por brazo
-        self.tau = np.ones(k, dtype=int)  # Tamaño de la época por brazo
+        self.epochs = np.zeros(k, dtype=self.count_dtype)  # Número de épocas por brazo
+        self.tau = np.ones(k, dtype=self.count_dtype)  # Tamaño de la época por brazo
         self.MAX_TAU = 10_000  # Límite máximo de tau para evitar overflow
+        self.indexed = indexed
+        self._reset_index()
 
     def select_arm(self) -> int:
         """
         Selecciona el brazo con el índice UCB2 más alto.
         :return: Índice del brazo seleccionado.
         """
+        if self.indexed:
+            return self._select_indexed()
+
         # Explorar cada brazo al menos una vez
         for arm in range(self.k):
             if self.counts[arm] == 0:
@@ -29,12 +45,31 @@ class UCB2(Algorithm):
         
         # Calcular UCB2 para cada brazo según la ecuación teórica
         total_count = sum(self.counts)
+        if self.estimator is not None:
+            _, total_count = self._exploration_statistics(total_count)
         ucb_values = self.values + np.sqrt(
             (1 + self.alpha) * np.log(math.e * total_count / np.maximum(self.tau, 1)) / (2 * np.maximum(self.tau, 1))
         )
 
         return np.argmax(ucb_values)  # Seleccionar el brazo con el mayor índice UCB2
 
+    def select_arms(self) -> np.ndarray:
+        """
+        Selecciona el brazo con el índice UCB2 más alto en cada bandido, en modo por lotes.
+        :return: Índices de los brazos seleccionados.
+        """
+        # Los bandidos con algún brazo sin explorar eligen el primero de ellos
+        unpulled = self.counts == 0
+
+        total_count = np.sum(self.counts, axis=1, keepdims=True)
+        if self.estimator is not None:
+            _, total_count = self._exploration_statistics(total_count)
+        tau = np.maximum(self.tau, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ucb_values = self.values + np.sqrt((1 + self.alpha) * np.log(math.e * total_count / tau) / (2 * tau))
+
+        return np.where(unpulled.any(axis=1), np.argmax(unpulled, axis=1), np.argmax(ucb_values, axis=1))
+
     def update(self, chosen_arm: int, reward: float):
         """
         Actualiza la recompensa promedio del brazo seleccionado y su época.
@@ -48,12 +83,97 @@ class UCB2(Algorithm):
         self.epochs[chosen_arm] += 1
 
         # Actualizar τ (duración de la siguiente época) con un límite máximo
-        self.tau[chosen_arm] = min(math.ceil((1 + self.alpha) ** self.epochs[chosen_arm]), self.MAX_TAU)
+        with np.errstate(over='ignore'):
+            self.tau[chosen_arm] = math.ceil(min((1 + self.alpha) ** self.epochs[chosen_arm], self.MAX_TAU))
+
+        if self.indexed:
+            self.total_count += 1
+            while self.next_unpulled < self.k and self.counts[self.next_unpulled] > 0:  # Avanzar el cursor
+                self.next_unpulled += 1
+            if self.tree is not None:  # Solo el índice del brazo elegido cambia de forma apreciable
+                self.tree.update(chosen_arm, self._indices(chosen_arm))
+
+    def update_batch(self, arms: np.ndarray, rewards: np.ndarray):
+        """
+        Actualiza la recompensa promedio y la época del brazo seleccionado en cada bandido.
+
+        :param arms: Brazo seleccionado en cada bandido.
+        :param rewards: Recompensa obtenida en cada bandido.
+        """
+        super().update_batch(arms, rewards)
+
+        rows = np.arange(self.n_envs)
+        self.epochs[rows, arms] += 1
+        with np.errstate(over='ignore'):  # Con muchas épocas la potencia desborda a inf y se acota en MAX_TAU
+            tau = np.ceil((1 + self.alpha) ** self.epochs[rows, arms])
+        self.tau[rows, arms] = np.minimum(tau, self.MAX_TAU)
 
     def reset(self):
         """
         Reinicia el estado del algoritmo.
         """
         super().reset()  # Llama al reset de Algorithm
-        self.epochs = np.zeros(self.k, dtype=int)  # Reiniciar épocas
-        self.tau = np.ones(self.k, dtype=int)  # Reiniciar tamaño de época
+        self.epochs = np.zeros(self._state_shape(), dtype=self.count_dtype)  # Reiniciar épocas
+        self.tau = np.ones(self._state_shape(), dtype=self.count_dtype)  # Reiniciar tamaño de época
+        self._reset_index()
+
+    def set_state(self, state: dict):
+        """
+        Restaura el estado. En modo indexado, el cursor y el total de tiradas se recalculan a partir de counts
+        y el árbol se reconstruye en la siguiente selección.
+        """
+        super().set_state(state)
+        self._rebuild_index()
+
+    def _update_many(self, arms: np.ndarray, rewards: np.ndarray, batch_counts: np.ndarray):
+        """
+        Actualiza las recompensas promedio y las épocas de un lote de tiradas: cada tirada cuenta como una época
+        del brazo, igual que en update, así que las épocas crecen con el número de tiradas de cada brazo en el lote.
+        """
+        super()._update_many(arms, rewards, batch_counts)
+
+        pulled = batch_counts > 0
+        self.epochs += batch_counts
+        with np.errstate(over='ignore'):  # Con muchas épocas la potencia desborda a inf y se acota en MAX_TAU
+            self.tau[pulled] = np.minimum(np.ceil((1 + self.alpha) ** self.epochs[pulled]), self.MAX_TAU)
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        """
+        En modo indexado, recalcula el cursor y el total de tiradas a partir de counts; el árbol se reconstruye
+        en la siguiente selección.
+        """
+        self._reset_index()
+        if self.indexed and self.n_envs is None:
+            unpulled = np.flatnonzero(self.counts == 0)
+            self.next_unpulled = int(unpulled[0]) if len(unpulled) else self.k
+            self.total_count = int(np.sum(self.counts))
+
+    def _indices(self, arms=slice(None)):
+        """
+        Índices UCB2 de los brazos indicados, usando el total de tiradas acumulado en lugar de sumar counts.
+        El logaritmo se acota en 0 para que el término de exploración nunca sea NaN.
+        """
+        tau = np.maximum(self.tau[arms], 1)
+        return self.values[arms] + np.sqrt(
+            (1 + self.alpha) * np.maximum(np.log(math.e * self.total_count / tau), 0) / (2 * tau)
+        )
+
+    def _select_indexed(self) -> int:
+        # Mientras quede algún brazo sin explorar, el cursor apunta al primero de ellos
+        if self.next_unpulled < self.k:
+            return self.next_unpulled
+
+        # Refresco perezoso: el índice de los brazos no elegidos solo cambia a través de log(total_count),
+        # así que todos los índices se recalculan únicamente cuando el total ha crecido un factor REFRESH_RATIO
+        if self.tree is None or self.total_count >= self.REFRESH_RATIO * self.refresh_count:
+            self.tree = MaxSegmentTree(self._indices())
+            self.refresh_count = self.total_count
+
+        return self.tree.argmax()
+
+    def _reset_index(self):
+        self.total_count = 0  # Total de tiradas, para no sumar counts en cada paso
+        self.next_unpulled = 0  # Primer brazo sin explorar
+        self.tree = None  # Se construye cuando todos los brazos se han explorado
+        self.refresh_count = 0  # Total de tiradas en el último recálculo completo de los índices
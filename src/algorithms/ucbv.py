@@ -0,0 +1,88 @@
+"""
+Module: algorithms/ucbv.py
+Description: Implementación del algoritmo UCB-V para el problema de los k-brazos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from algorithms.algorithm import Algorithm
+import numpy as np
+
+
+class UCBV(Algorithm):
+    STATE_ATTRIBUTES = Algorithm.STATE_ATTRIBUTES + ('t', 'square_values')
+
+    def __init__(self, k: int, b: float = 1, zeta: float = 1.2, c: float = 1, rng=None, estimator=None):
+        """
+        UCB-V: cota de Bernstein con la varianza empírica de cada brazo,
+        value + sqrt(2 * V * E / counts) + c * 3 * b * E / counts, con E = zeta * log(t).
+
+        Los brazos con poca varianza reciben un término de exploración mucho menor que el de UCB1.
+
+        :param k: Número de brazos.
+        :param b: Amplitud del rango de las recompensas.
+        :param zeta: Factor de la función de exploración E = zeta * log(t).
+        :param c: Peso del término de rango.
+        :param rng: Generador aleatorio (opcional).
+        :param estimator: No se admite: la varianza usa la media muestral de los cuadrados, que un estimador con
+        olvido (Discounted, SlidingWindow) desacoplaría de values.
+        """
+        assert estimator is None, "UCB-V calcula la varianza con medias muestrales y no admite otro estimador."
+        assert b > 0, "La amplitud b debe ser mayor que 0."
+        assert zeta > 0, "El factor zeta debe ser mayor que 0."
+        assert c >= 0, "El parámetro c debe ser mayor o igual que 0."
+
+        super().__init__(k, rng, estimator)
+        self.b = b
+        self.zeta = zeta
+        self.c = c
+        self.t = 0  # Paso actual
+        self.square_values = np.zeros(k, dtype=self.value_dtype)  # Media de los cuadrados de las recompensas de cada brazo
+
+    def select_arm(self) -> int:
+        self.t += 1
+
+        unpulled = np.flatnonzero(self.counts == 0)  # Explorar cada brazo al menos una vez
+        if len(unpulled):
+            return int(unpulled[0])
+
+        return int(np.argmax(self._upper_bounds()))
+
+    def select_arms(self) -> np.ndarray:
+        self.t += 1
+        unpulled = self.counts == 0  # Los bandidos con algún brazo sin explorar eligen el primero de ellos
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bounds = self._upper_bounds()
+        return np.where(unpulled.any(axis=1), np.argmax(unpulled, axis=1), np.argmax(bounds, axis=1))
+
+    def update(self, chosen_arm: int, reward: float):
+        super().update(chosen_arm, reward)
+        self.square_values[chosen_arm] += (reward ** 2 - self.square_values[chosen_arm]) / self.counts[chosen_arm]
+
+    def update_batch(self, arms: np.ndarray, rewards: np.ndarray):
+        super().update_batch(arms, rewards)
+        rows = np.arange(self.n_envs)
+        self.square_values[rows, arms] += (rewards ** 2 - self.square_values[rows, arms]) / self.counts[rows, arms]
+
+    def _update_many(self, arms: np.ndarray, rewards: np.ndarray, batch_counts: np.ndarray):
+        super()._update_many(arms, rewards, batch_counts)
+        self._merge_means(self.square_values, batch_counts, self._scatter_sum(arms, rewards ** 2))
+
+    def reset(self):
+        super().reset()
+        self.t = 0
+        self.square_values = np.zeros(self._state_shape(), dtype=self.value_dtype)
+
+    def _upper_bounds(self) -> np.ndarray:
+        counts, t = self._exploration_statistics(self.t)
+        exploration = self.zeta * np.log(t)
+        variance = np.maximum(self.square_values - self.values ** 2, 0)  # Varianza empírica (sin corregir)
+        return self.values + np.sqrt(2 * variance * exploration / counts) + self.c * 3 * self.b * exploration / counts
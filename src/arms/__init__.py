@@ -18,9 +18,11 @@ from .arm import Arm
 from .armnormal import ArmNormal
 from .armbernoulli import ArmBernoulli
 from .armbinomial import ArmBinomial
-from .bandit import Bandit
+from .bandit import Bandit, BanditTestbed
+from .contextual import ArmLinear, ContextualBandit
+from .nonstationary import NonStationaryBandit, RandomWalkDrift, ChangePointDrift
 
 # Lista de módulos o clases públicas
-__all__ = ['Arm', 'ArmNormal', 'ArmBernoulli', 'ArmBinomial', 'Bandit']
+__all__ = ['Arm', 'ArmNormal', 'ArmBernoulli', 'ArmBinomial', 'Bandit', 'BanditTestbed', 'NonStationaryBandit', 'RandomWalkDrift', 'ChangePointDrift', 'ArmLinear', 'ContextualBandit']
 
 
@@ -16,6 +16,9 @@ from abc import ABC, abstractmethod
 
 
 class Arm(ABC):
+    # Arms declare their attributes in __slots__: without a per-instance __dict__, each arm takes a fraction
+    # of the memory, which matters for bandits with millions of arms
+    __slots__ = ()
 
     @classmethod
     def generate_arms(cls, k: int):
@@ -14,24 +14,27 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 
 
 from arms import Arm
-import numpy as np
+from randomness import get_rng
 
 
 class ArmBernoulli(Arm):
-    def __init__(self, p: float):
+    __slots__ = ('p', 'rng')
+
+    def __init__(self, p: float, rng=None):
         assert 0 <= p <= 1, "La probabilidad p debe estar entre 0 y 1."
         self.p = p
+        self.rng = rng
 
     def pull(self):
-        return np.random.binomial(1, self.p)
+        return get_rng(self.rng).binomial(1, self.p)
 
     def get_expected_value(self) -> float:
         return self.p
 
     @classmethod
-    def generate_arms(cls, k: int):
-        ps = np.random.uniform(0, 1, k)
-        return [cls(p) for p in ps]
+    def generate_arms(cls, k: int, rng=None):
+        ps = get_rng(rng).uniform(0, 1, k)
+        return [cls(p, rng) for p in ps.tolist()]  # Floats de Python: más rápidos de crear y de usar que escalares de NumPy
 
     def __str__(self):
         return f"ArmBernoulli(p={self.p:.2f})"
@@ -13,26 +13,29 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
 from arms import Arm
-import numpy as np
+from randomness import get_rng
 
 
 class ArmBinomial(Arm):
-    def __init__(self, n: int, p: float):
+    __slots__ = ('n', 'p', 'rng')
+
+    def __init__(self, n: int, p: float, rng=None):
         assert n > 0, "El parámetro n debe ser mayor que 0."
         assert 0 <= p <= 1, "La probabilidad p debe estar entre 0 y 1."
         self.n = n
         self.p = p
+        self.rng = rng
 
     def pull(self):
-        return np.random.binomial(self.n, self.p)
+        return get_rng(self.rng).binomial(self.n, self.p)
 
     def get_expected_value(self) -> float:
         return self.n * self.p
 
     @classmethod
-    def generate_arms(cls, k: int, n: int = 10):
-        ps = np.random.uniform(0, 1, k)
-        return [cls(n, p) for p in ps]
+    def generate_arms(cls, k: int, n: int = 10, rng=None):
+        ps = get_rng(rng).uniform(0, 1, k)
+        return [cls(n, p, rng) for p in ps.tolist()]  # Floats de Python: más rápidos de crear y de usar que escalares de NumPy
 
     def __str__(self):
         return f"ArmBinomial(n={self.n}, p={self.p:.2f})"
@@ -13,23 +13,31 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
 
+import math
+
 import numpy as np
 
 from arms import Arm
+from randomness import get_rng
 
 
 class ArmNormal(Arm):
-    def __init__(self, mu: float, sigma: float):
+    __slots__ = ('mu', 'sigma', 'rng')
+    DECIMALS = 2  # Decimales de las medias generadas por generate_arms
+
+    def __init__(self, mu: float, sigma: float, rng=None):
         """
         Inicializa el brazo con distribución normal.
 
         :param mu: Media de la distribución.
         :param sigma: Desviación estándar de la distribución.
+        :param rng: Generador aleatorio (np.random.Generator o BufferedGenerator). Si es None se usa np.random.
         """
         assert sigma > 0, "La desviación estándar sigma debe ser positiva."
 
         self.mu = mu
         self.sigma = sigma
+        self.rng = rng
 
     def pull(self):
         """
@@ -37,7 +45,7 @@ class ArmNormal(Arm):
 
         :return: Recompensa obtenida del brazo.
         """
-        reward = np.random.normal(self.mu, self.sigma)
+        reward = get_rng(self.rng).normal(self.mu, self.sigma)
         return reward
 
     def get_expected_value(self) -> float:
@@ -58,30 +66,39 @@ class ArmNormal(Arm):
         return f"ArmNormal(mu={self.mu}, sigma={self.sigma})"
 
     @classmethod
-    def generate_arms(cls, k: int, mu_min: float = 1, mu_max: float = 10.0):
+    def mean_grid(cls, mu_min: float, mu_max: float) -> np.ndarray:
+        """
+        Medias posibles de los brazos generados: los valores con DECIMALS decimales del intervalo [mu_min, mu_max].
+
+        :param mu_min: Valor mínimo de la media.
+        :param mu_max: Valor máximo de la media.
+        :return: Array ordenado de medias.
+        """
+        scale = 10 ** cls.DECIMALS
+        # La tolerancia evita que el redondeo de mu_min * scale deje fuera un extremo representable
+        return np.arange(math.ceil(mu_min * scale - 1e-9), math.floor(mu_max * scale + 1e-9) + 1) / scale
+
+    @classmethod
+    def generate_arms(cls, k: int, mu_min: float = 1, mu_max: float = 10.0, rng=None):
         """
         Genera k brazos con medias únicas en el rango [mu_min, mu_max].
 
+        Las medias se eligen sin reemplazamiento entre los valores con DECIMALS decimales del rango (una permutación
+        parcial de la rejilla), de una sola vez y sin repetir extracciones hasta encontrar valores distintos.
+
         :param k: Número de brazos a generar.
         :param mu_min: Valor mínimo de la media.
         :param mu_max: Valor máximo de la media.
+        :param rng: Generador aleatorio para las medias y para los brazos generados (opcional).
         :return: Lista de brazos generados.
         """
         assert k > 0, "El número de brazos k debe ser mayor que 0."
         assert mu_min < mu_max, "El valor de mu_min debe ser menor que mu_max."
 
-        # Generar k- valores únicos de mu con decimales
-        mu_values = set()
-        while len(mu_values) < k:
-            mu = np.random.uniform(mu_min, mu_max)
-            mu = round(mu, 2)
-            mu_values.add(mu)
+        grid = cls.mean_grid(mu_min, mu_max)
+        assert k <= len(grid), f"Solo hay {len(grid)} medias distintas con {cls.DECIMALS} decimales en [mu_min, mu_max]."
 
-        mu_values = list(mu_values)
+        mu_values = grid[get_rng(rng).choice(len(grid), k, replace=False)]
         sigma = 1.0
 
-        arms = [ArmNormal(mu, sigma) for mu in mu_values]
-
-        return arms
-
-
+        return [cls(mu, sigma, rng) for mu in mu_values.tolist()]
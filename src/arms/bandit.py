@@ -14,25 +14,52 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 
 
 # bandit.py
+import sys
 from typing import List
 
 import numpy as np
 
-from arms import Arm
+from arms import Arm, ArmNormal, ArmBernoulli, ArmBinomial
+from randomness import get_rng
 
 
 class Bandit:
-    def __init__(self, arms: List[Arm]):
+    stationary = True  # The arms' distributions do not change over time
+    batched = False  # All runs of an experiment play the same arms (see BanditTestbed)
+
+    def __init__(self, arms: List[Arm], rng=None):
         """
         Initializes the bandit with a list of arms.
 
         :param arms: List of instances of classes derived from Arm.
         :type arms: list of Arm
+        :param rng: Random generator used by pull_arms (np.random.Generator or BufferedGenerator).
+                    If None, the global np.random state is used. pull_arm uses each arm's own generator.
         """
         self.arms = arms
+        self.rng = rng
         self.k = len(arms)
         self.expected_rewards = self.get_expected_rewards()
         self.optimal_arm = self.get_optimal_arm()
+        self._expected = np.asarray(self.expected_rewards, dtype=float)
+        self._build_parameter_arrays()
+
+    def _build_parameter_arrays(self):
+        """
+        Builds the struct-of-arrays representation of the arms, with one parameter array per
+        distribution family, so that a batch of pulls needs one sampler call per family.
+
+        Normal arms fill `mu` and `sigma`; Bernoulli and Binomial arms fill `n` and `p`
+        (a Bernoulli arm is a Binomial arm with n = 1). Entries of other families are left as NaN or 0.
+        """
+        self.is_normal = np.array([isinstance(arm, ArmNormal) for arm in self.arms], dtype=bool)
+        self.is_binomial = np.array([isinstance(arm, (ArmBernoulli, ArmBinomial)) for arm in self.arms], dtype=bool)
+        self.is_other = ~(self.is_normal | self.is_binomial)
+
+        self.mu = np.array([arm.mu if normal else np.nan for arm, normal in zip(self.arms, self.is_normal)], dtype=float)
+        self.sigma = np.array([arm.sigma if normal else np.nan for arm, normal in zip(self.arms, self.is_normal)], dtype=float)
+        self.n = np.array([getattr(arm, "n", 1) if binomial else 0 for arm, binomial in zip(self.arms, self.is_binomial)], dtype=int)
+        self.p = np.array([arm.p if binomial else np.nan for arm, binomial in zip(self.arms, self.is_binomial)], dtype=float)
 
     def pull_arm(self, index: int) -> float:
         """
@@ -48,6 +75,81 @@ class Bandit:
         reward = self.arms[index].pull()
         return reward
 
+    def pull_arms(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Pulls a batch of arms and returns their rewards, drawing all the rewards of each
+        distribution family with a single sampler call.
+
+        :param indices: Array of arm indices (0 to k-1), of any shape.
+        :return: Array of rewards with the same shape as indices.
+        :raises IndexError: If any index is out of the valid range.
+        """
+        indices = np.asarray(indices)
+        if indices.size and (indices.min() < 0 or indices.max() >= self.k):
+            raise IndexError("Arm index out of range.")
+
+        rng = get_rng(self.rng)
+
+        # Caso habitual: todos los brazos son de la misma familia
+        if self.is_normal.all():
+            return rng.normal(self.mu[indices], self.sigma[indices])
+        if self.is_binomial.all():
+            return rng.binomial(self.n[indices], self.p[indices]).astype(float)
+
+        rewards = np.empty(indices.shape, dtype=float)
+
+        normal = self.is_normal[indices]
+        if normal.any():
+            rewards[normal] = rng.normal(self.mu[indices[normal]], self.sigma[indices[normal]])
+
+        binomial = self.is_binomial[indices]
+        if binomial.any():
+            rewards[binomial] = rng.binomial(self.n[indices[binomial]], self.p[indices[binomial]])
+
+        other = self.is_other[indices]
+        if other.any():
+            rewards[other] = [self.arms[index].pull() for index in indices[other]]
+
+        return rewards
+
+    def regret(self, chosen_arms: np.ndarray) -> np.ndarray:
+        """
+        Instantaneous regret of a batch of chosen arms at the current step: expected reward of the
+        optimal arm minus expected reward of each chosen arm.
+
+        :param chosen_arms: Array of arm indices, of any shape.
+        :return: Array of regrets with the same shape as chosen_arms.
+        """
+        return self._expected[self.optimal_arm] - self._expected[chosen_arms]
+
+    def advance(self):
+        """
+        Advances the environment one step. A stationary bandit does not change.
+        """
+
+    def reset(self):
+        """
+        Restores the environment to its initial state. A stationary bandit has nothing to restore.
+        """
+
+    def state_nbytes(self) -> int:
+        """
+        Approximate memory taken by the bandit: its parameter arrays plus the Python objects of its arms
+        (the list, each arm and the attributes declared in its __slots__, except the shared generator).
+
+        :return: Number of bytes.
+        """
+        nbytes = sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+        nbytes += sys.getsizeof(self.arms) + sys.getsizeof(self.expected_rewards)
+        nbytes += sum(sys.getsizeof(value) for value in self.expected_rewards)
+        for arm in self.arms:
+            nbytes += sys.getsizeof(arm)
+            for name in type(arm).__slots__:
+                value = getattr(arm, name, None)
+                if name != 'rng' and value is not None:
+                    nbytes += value.nbytes if isinstance(value, np.ndarray) else sys.getsizeof(value)
+        return nbytes
+
     def get_optimal_arm(self) -> int:
         """
         Identifies the arm with the highest expected reward.
@@ -71,6 +173,47 @@ class Bandit:
     def get_expected_value(self, numer_arm):
         return self.arms[numer_arm].get_expected_value()
 
+    @staticmethod
+    def generate_many(n_bandits: int, k: int, family: str = 'normal', rng=None, mu_min: float = 1,
+                      mu_max: float = 10.0, sigma: float = 1.0, n: int = 10) -> 'BanditTestbed':
+        """
+        Generates n_bandits independent bandits of k arms of one family in a single call, with the same
+        distributions as the generate_arms method of each arm class, but without building any Arm object.
+
+        Normal means are drawn without replacement from ArmNormal.mean_grid, independently for each bandit;
+        Bernoulli and Binomial probabilities are uniform in [0, 1].
+
+        :param n_bandits: Number of bandits.
+        :param k: Number of arms of each bandit.
+        :param family: 'normal', 'bernoulli' or 'binomial'.
+        :param rng: Random generator used to draw the parameters, and stored for pull_arms.
+                    If None, the global np.random state is used.
+        :param mu_min: Minimum mean of normal arms.
+        :param mu_max: Maximum mean of normal arms.
+        :param sigma: Standard deviation of normal arms.
+        :param n: Number of trials of binomial arms.
+        :return: Testbed with the parameters of all the bandits.
+        """
+        assert n_bandits > 0, "The number of bandits must be greater than 0."
+        assert k > 0, "The number of arms k must be greater than 0."
+        assert family in BanditTestbed.FAMILIES, f"The family must be one of {BanditTestbed.FAMILIES}."
+        generator = get_rng(rng)
+
+        if family == 'normal':
+            assert mu_min < mu_max, "mu_min must be less than mu_max."
+            grid = ArmNormal.mean_grid(mu_min, mu_max)
+            assert k <= len(grid), f"There are only {len(grid)} distinct means with {ArmNormal.DECIMALS} decimals in [mu_min, mu_max]."
+            # Partial permutation of the grid per bandit: the k positions with the smallest uniform keys,
+            # ordered by key, are a uniformly random ordered sample without replacement
+            keys = generator.random((n_bandits, len(grid)))
+            positions = np.argpartition(keys, k - 1, axis=1)[:, :k] if k < len(grid) else np.argsort(keys, axis=1)
+            order = np.argsort(np.take_along_axis(keys, positions, axis=1), axis=1)
+            mu = grid[np.take_along_axis(positions, order, axis=1)]
+            return BanditTestbed(family, mu=mu, sigma=sigma, rng=rng)
+
+        p = generator.uniform(0, 1, (n_bandits, k))
+        return BanditTestbed(family, n=1 if family == 'bernoulli' else n, p=p, rng=rng)
+
     def __len__(self):
         """
         Returns the number of arms in the bandit.
@@ -87,3 +230,137 @@ class Bandit:
         """
         arms_description = ", ".join([str(arm) for arm in self.arms])
         return f"Bandit with {self.k} arms: {arms_description}"
+
+
+class BanditTestbed:
+    """
+    Struct-of-arrays testbed of n_bandits independent bandits with k arms of the same family, as in the
+    10-armed testbed: the parameters of all the arms are (n_bandits, k) arrays and no Arm object is built.
+
+    It takes the place of a Bandit in the batched runner with runs = n_bandits, and run r plays bandit r,
+    so the experiment averages over the testbed instead of over repetitions of a single bandit:
+
+        testbed = Bandit.generate_many(2000, 10)
+        run_experiment(testbed, algorithms, steps, runs=testbed.n_bandits)
+
+    optimal_arm is an (n_bandits,) array with the optimal arm of each bandit. Reward tapes and the numba
+    backend need a single bandit shared by all the runs and do not accept a testbed.
+    """
+    stationary = True
+    batched = True  # Run r of an experiment plays bandit r
+    FAMILIES = ('normal', 'bernoulli', 'binomial')
+
+    def __init__(self, family: str, mu=None, sigma=None, n=None, p=None, rng=None):
+        """
+        Initializes the testbed from the parameters of its arms.
+
+        :param family: 'normal', 'bernoulli' or 'binomial'.
+        :param mu: Means of normal arms, (n_bandits, k).
+        :param sigma: Standard deviations of normal arms, (n_bandits, k) or a scalar shared by all the arms.
+        :param n: Number of trials of binomial arms, (n_bandits, k) or a scalar. Bernoulli arms use n = 1.
+        :param p: Success probabilities of Bernoulli and Binomial arms, (n_bandits, k).
+        :param rng: Random generator used by pull_arms. If None, the global np.random state is used.
+        """
+        assert family in self.FAMILIES, f"The family must be one of {self.FAMILIES}."
+        self.family = family
+        self.rng = rng
+
+        # Scalar parameters are kept as scalars instead of being broadcast to (n_bandits, k)
+        if family == 'normal':
+            self.mu = np.asarray(mu, dtype=float)
+            self.sigma = float(sigma) if np.ndim(sigma) == 0 else np.asarray(sigma, dtype=float)
+            assert np.all(self.sigma > 0), "The standard deviations must be greater than 0."
+            self.expected_rewards = self.mu
+        else:
+            self.p = np.asarray(p, dtype=float)
+            n = 1 if family == 'bernoulli' else n
+            self.n = int(n) if np.ndim(n) == 0 else np.asarray(n, dtype=int)
+            assert np.all((self.p >= 0) & (self.p <= 1)), "The probabilities must be in [0, 1]."
+            assert np.all(self.n > 0), "The number of trials must be greater than 0."
+            self.expected_rewards = self.n * self.p
+
+        assert self.expected_rewards.ndim == 2, "The parameters must be (n_bandits, k) arrays."
+        self.n_bandits, self.k = self.expected_rewards.shape
+        self.optimal_arm = np.argmax(self.expected_rewards, axis=1)
+        self._rows = np.arange(self.n_bandits)
+        self._optimal_rewards = self.expected_rewards[self._rows, self.optimal_arm]
+
+    def _at(self, values, indices: np.ndarray):
+        """
+        Parameter of the chosen arm of each bandit, or the scalar parameter shared by all the arms.
+        """
+        return values if np.ndim(values) == 0 else values[self._rows, indices]
+
+    def pull_arms(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Pulls one arm of every bandit, drawing all the rewards with a single sampler call.
+
+        :param indices: Array of arm indices (0 to k-1) whose last axis has length n_bandits: entry r of
+                        that axis is an arm of bandit r.
+        :return: Array of rewards with the same shape as indices.
+        :raises IndexError: If any index is out of the valid range.
+        """
+        indices = np.asarray(indices)
+        assert indices.shape[-1:] == (self.n_bandits,), "The last axis of indices must have one entry per bandit."
+        if indices.min() < 0 or indices.max() >= self.k:
+            raise IndexError("Arm index out of range.")
+
+        rng = get_rng(self.rng)
+        if self.family == 'normal':
+            return rng.normal(self.mu[self._rows, indices], self._at(self.sigma, indices))
+        return rng.binomial(self._at(self.n, indices), self.p[self._rows, indices]).astype(float)
+
+    def regret(self, chosen_arms: np.ndarray) -> np.ndarray:
+        """
+        Instantaneous regret of one chosen arm of every bandit.
+
+        :param chosen_arms: Array of arm indices whose last axis has length n_bandits.
+        :return: Array of regrets with the same shape as chosen_arms.
+        """
+        return self._optimal_rewards - self.expected_rewards[self._rows, chosen_arms]
+
+    def advance(self):
+        """
+        Advances the environment one step. A stationary testbed does not change.
+        """
+
+    def reset(self):
+        """
+        Restores the environment to its initial state. A stationary testbed has nothing to restore.
+        """
+
+    def bandit(self, index: int) -> Bandit:
+        """
+        Builds one of the bandits of the testbed as a Bandit with Arm objects.
+
+        :param index: Index of the bandit (0 to n_bandits-1).
+        :return: Bandit sharing the testbed's random generator.
+        """
+        if self.family == 'normal':
+            sigma = np.broadcast_to(self.sigma, self.mu.shape)[index]
+            arms = [ArmNormal(mu, s, self.rng) for mu, s in zip(self.mu[index].tolist(), sigma.tolist())]
+        elif self.family == 'bernoulli':
+            arms = [ArmBernoulli(p, self.rng) for p in self.p[index].tolist()]
+        else:
+            n = np.broadcast_to(self.n, self.p.shape)[index]
+            arms = [ArmBinomial(trials, p, self.rng) for trials, p in zip(n.tolist(), self.p[index].tolist())]
+        return Bandit(arms, rng=self.rng)
+
+    def state_nbytes(self) -> int:
+        """
+        Memory taken by the parameter arrays of the testbed. Each array is counted once, even if several
+        attributes refer to it (expected_rewards is mu in the normal family).
+
+        :return: Number of bytes.
+        """
+        arrays = {id(value): value for value in vars(self).values() if isinstance(value, np.ndarray)}
+        return sum(value.nbytes for value in arrays.values())
+
+    def __len__(self):
+        """
+        Returns the number of arms of each bandit.
+        """
+        return self.k
+
+    def __str__(self):
+        return f"BanditTestbed with {self.n_bandits} {self.family} bandits of {self.k} arms"
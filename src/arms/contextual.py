@@ -0,0 +1,177 @@
+"""
+Module: arms/contextual.py
+Description: Contains the ArmLinear class and the ContextualBandit, whose expected rewards depend on a per-request context.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from arms import Arm
+from randomness import get_rng
+
+
+class ArmLinear(Arm):
+    __slots__ = ('theta', 'sigma', 'rng')
+
+    def __init__(self, theta: np.ndarray, sigma: float = 1.0, rng=None):
+        """
+        Arm whose reward for a context x is normal with mean x . theta and standard deviation sigma.
+
+        :param theta: Parameter vector (d,).
+        :param sigma: Standard deviation of the noise.
+        :param rng: Random generator (np.random.Generator or BufferedGenerator). If None, np.random is used.
+        """
+        assert sigma > 0, "The standard deviation sigma must be positive."
+
+        self.theta = np.asarray(theta, dtype=float)
+        self.sigma = sigma
+        self.rng = rng
+
+    def pull(self, context: np.ndarray) -> float:
+        """
+        Generates a reward for a context.
+
+        :param context: Context vector (d,).
+        :return: Reward obtained from the arm.
+        """
+        return get_rng(self.rng).normal(self.get_expected_value(context), self.sigma)
+
+    def get_expected_value(self, context: np.ndarray) -> float:
+        """
+        Expected reward for a context.
+
+        :param context: Context vector (d,).
+        """
+        return float(np.dot(context, self.theta))
+
+    def __str__(self):
+        return f"ArmLinear(d={len(self.theta)}, sigma={self.sigma})"
+
+    @classmethod
+    def generate_arms(cls, k: int, d: int = 10, sigma: float = 1.0, rng=None):
+        """
+        Generates k arms with parameters drawn from a standard normal distribution.
+
+        :param k: Number of arms.
+        :param d: Dimension of the contexts.
+        :param sigma: Standard deviation of the noise of every arm.
+        :param rng: Random generator for the parameters and for the generated arms (optional).
+        :return: List of arms.
+        """
+        assert k > 0, "The number of arms k must be greater than 0."
+        assert d > 0, "The dimension d must be greater than 0."
+
+        thetas = get_rng(rng).normal(size=(k, d))
+        return [cls(theta, sigma, rng) for theta in thetas]
+
+
+class ContextualBandit:
+    """
+    Bandit with linear-reward arms: every request comes with a context x and arm a pays x . theta_a plus noise.
+
+    The arms' parameters are stacked into a (k, d) matrix, so the expected rewards of a batch of contexts
+    for all arms are a single einsum and a batch of pulls is a single sampler call. The optimal arm
+    depends on the context, so it is returned per context instead of being an attribute.
+    """
+    stationary = True
+
+    def __init__(self, arms: List[ArmLinear], rng=None):
+        """
+        Initializes the bandit.
+
+        :param arms: List of linear arms with the same dimension.
+        :param rng: Random generator used by contexts and pull_arms. If None, the global np.random state is used.
+        """
+        assert len({len(arm.theta) for arm in arms}) == 1, "All the arms must have the same dimension."
+
+        self.arms = arms
+        self.rng = rng
+        self.k = len(arms)
+        self.d = len(arms[0].theta)
+        self.theta = np.stack([arm.theta for arm in arms])
+        self.sigma = np.array([arm.sigma for arm in arms], dtype=float)
+
+    def contexts(self, n: Optional[int] = None, rng=None) -> np.ndarray:
+        """
+        Draws contexts from N(0, I / d), so that their norm is close to 1.
+
+        :param n: Number of contexts. If None, a single context (d,) is returned.
+        :param rng: Random generator for the contexts. If None, the bandit's generator is used.
+        :return: Array (d,) or (n, d).
+        """
+        size = (self.d,) if n is None else (n, self.d)
+        return get_rng(rng if rng is not None else self.rng).normal(0.0, 1.0 / np.sqrt(self.d), size)
+
+    def expected_rewards(self, contexts: np.ndarray) -> np.ndarray:
+        """
+        Expected reward of every arm for each context.
+
+        :param contexts: Array (..., d).
+        :return: Array (..., k).
+        """
+        return np.einsum('...d,kd->...k', contexts, self.theta)
+
+    def optimal_arms(self, contexts: np.ndarray) -> np.ndarray:
+        """
+        Optimal arm for each context.
+
+        :param contexts: Array (..., d).
+        :return: Array (...) of arm indices.
+        """
+        return np.argmax(self.expected_rewards(contexts), axis=-1)
+
+    def pull_arm(self, context: np.ndarray, index: int) -> float:
+        """
+        Pulls an arm for a context and returns the reward.
+
+        :param context: Context vector (d,).
+        :param index: Index of the arm to pull (0 to k-1).
+        :return: Reward obtained from the arm.
+        :raises IndexError: If the index is out of the valid range.
+        """
+        if index < 0 or index >= self.k:
+            raise IndexError("Arm index out of range.")
+
+        return self.arms[index].pull(context)
+
+    def pull_arms(self, contexts: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """
+        Pulls one arm for each context, drawing all the noise with a single sampler call.
+
+        :param contexts: Array (n, d).
+        :param indices: Array (n,) of arm indices.
+        :return: Array (n,) of rewards.
+        """
+        indices = np.asarray(indices)
+        if indices.size and (indices.min() < 0 or indices.max() >= self.k):
+            raise IndexError("Arm index out of range.")
+
+        means = np.einsum('nd,nd->n', contexts, self.theta[indices])
+        return get_rng(self.rng).normal(means, self.sigma[indices])
+
+    def regret(self, contexts: np.ndarray, chosen_arms: np.ndarray) -> np.ndarray:
+        """
+        Instantaneous regret of one chosen arm per context.
+
+        :param contexts: Array (n, d).
+        :param chosen_arms: Array (n,) of arm indices.
+        :return: Array (n,) of regrets.
+        """
+        expected = self.expected_rewards(contexts)
+        return np.max(expected, axis=-1) - expected[np.arange(len(chosen_arms)), chosen_arms]
+
+    def __len__(self):
+        return self.k
+
+    def __str__(self):
+        return f"Contextual bandit with {self.k} linear arms of dimension {self.d}"
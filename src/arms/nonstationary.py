@@ -0,0 +1,201 @@
+"""
+Module: arms/nonstationary.py
+Description: Contains the NonStationaryBandit class and the drift models that make its arms change over time.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from arms import Arm
+from arms.bandit import Bandit
+from randomness import get_rng
+
+
+class RandomWalkDrift:
+    """
+    Gaussian random walk: every step, each parameter moves by an independent N(0, scale^2) increment.
+    """
+
+    def __init__(self, scale: float):
+        """
+        :param scale: Standard deviation of the per-step increment.
+        """
+        assert scale > 0, "The drift scale must be positive."
+
+        self.scale = scale
+
+    def step(self, values: np.ndarray, rng) -> Optional[np.ndarray]:
+        """
+        Applies one step of drift in place.
+
+        :param values: Array of parameters.
+        :param rng: Random generator.
+        :return: None, since every parameter changes.
+        """
+        values += rng.normal(0.0, self.scale, len(values))
+        return None
+
+    def __str__(self):
+        return f"RandomWalkDrift(scale={self.scale})"
+
+
+class ChangePointDrift:
+    """
+    Abrupt change points: every step, each parameter independently jumps with probability rate to a new
+    value drawn uniformly from [low, high].
+
+    The number of jumps is drawn first, so a step costs O(number of jumps) instead of O(k).
+    """
+
+    def __init__(self, rate: float, low: float, high: float):
+        """
+        :param rate: Per-step probability that a parameter jumps.
+        :param low: Lower bound of the new values.
+        :param high: Upper bound of the new values.
+        """
+        assert 0 <= rate <= 1, "The change rate must be between 0 and 1."
+        assert low < high, "low must be lower than high."
+
+        self.rate = rate
+        self.low = low
+        self.high = high
+
+    def step(self, values: np.ndarray, rng) -> Optional[np.ndarray]:
+        """
+        Applies one step of drift in place.
+
+        :param values: Array of parameters.
+        :param rng: Random generator.
+        :return: Indices of the parameters that changed (may contain repeats).
+        """
+        n_changes = rng.binomial(len(values), self.rate)
+        indices = rng.choice(len(values), n_changes)
+        values[indices] = rng.uniform(self.low, self.high, n_changes)
+        return indices
+
+    def __str__(self):
+        return f"ChangePointDrift(rate={self.rate}, low={self.low}, high={self.high})"
+
+
+class NonStationaryBandit(Bandit):
+    """
+    Bandit whose arms' distributions change over time.
+
+    The drift is applied to the struct-of-arrays parameters built by Bandit (the mean `mu` of normal arms and
+    the success probability `p` of Bernoulli and binomial arms, clipped to [0, 1]) with one vectorized call
+    per step, so the arm objects keep their initial parameters. `expected_rewards` is an array that is
+    updated only where the parameters changed, and the optimal arm is tracked incrementally: it is only
+    recomputed over all arms when every arm changed or when the current optimum got worse.
+    """
+    stationary = False
+
+    def __init__(self, arms: List[Arm], drift, rng=None):
+        """
+        Initializes the bandit.
+
+        :param arms: List of normal, Bernoulli or binomial arms with the initial parameters.
+        :param drift: Drift model (RandomWalkDrift, ChangePointDrift or any object with the same step method).
+        :param rng: Random generator used by pull_arms and by the drift. If None, the global np.random state is used.
+        """
+        super().__init__(arms, rng)
+        assert not self.is_other.any(), "Non-stationary bandits only support normal, Bernoulli and binomial arms."
+
+        self.drift = drift
+        self._normal_index = np.flatnonzero(self.is_normal)
+        self._binomial_index = np.flatnonzero(self.is_binomial)
+        self._initial_mu = self.mu.copy()
+        self._initial_p = self.p.copy()
+        self.reset()
+
+    def reset(self):
+        """
+        Restores the initial parameters. The arrays are replaced, not modified, so shallow copies
+        of the bandit do not share their drift.
+        """
+        self.t = 0
+        self.mu = self._initial_mu.copy()
+        self.p = self._initial_p.copy()
+        self.expected_rewards = np.where(self.is_normal, self.mu, self.n * self.p)
+        self._expected = self.expected_rewards
+        self.optimal_arm = int(np.argmax(self.expected_rewards))
+
+    def advance(self):
+        """
+        Advances the environment one step, drifting the arms' parameters.
+        """
+        self.t += 1
+        rng = get_rng(self.rng)
+
+        changed = []
+        if len(self._normal_index):
+            changed.append(self._drift_family(self.mu, self._normal_index, rng))
+        if len(self._binomial_index):
+            changed.append(self._drift_family(self.p, self._binomial_index, rng, bounds=(0.0, 1.0)))
+        arms = np.concatenate(changed)
+
+        previous_best = self.expected_rewards[self.optimal_arm]
+        self.expected_rewards[arms] = np.where(self.is_normal[arms], self.mu[arms], self.n[arms] * self.p[arms])
+        self._update_optimal_arm(arms, previous_best)
+
+    def _drift_family(self, values: np.ndarray, index: np.ndarray, rng, bounds=None) -> np.ndarray:
+        """
+        Drifts the parameters of one family of arms in place.
+
+        :return: Indices of the arms whose parameters changed.
+        """
+        full = len(index) == self.k
+        family_values = values if full else values[index]
+
+        changed = self.drift.step(family_values, rng)
+        if bounds is not None:
+            if changed is None:
+                np.clip(family_values, *bounds, out=family_values)
+            else:
+                family_values[changed] = np.clip(family_values[changed], *bounds)
+
+        if changed is None:
+            if not full:
+                values[index] = family_values
+            return index
+
+        if not full:
+            values[index[changed]] = family_values[changed]
+        return index[changed]
+
+    def _update_optimal_arm(self, arms: np.ndarray, previous_best: float):
+        if len(arms) == 0:
+            return
+
+        if len(arms) >= self.k or (np.any(arms == self.optimal_arm) and self.expected_rewards[self.optimal_arm] < previous_best):
+            self.optimal_arm = int(np.argmax(self.expected_rewards))
+            return
+
+        candidate = arms[np.argmax(self.expected_rewards[arms])]
+        if self.expected_rewards[candidate] > self.expected_rewards[self.optimal_arm]:
+            self.optimal_arm = int(candidate)
+
+    def pull_arm(self, index: int) -> float:
+        """
+        Pulls a specific arm with its current parameters and returns the reward.
+
+        :param index: Index of the arm to pull (0 to k-1).
+        :return: Reward obtained from the arm.
+        :raises IndexError: If the index is out of the valid range.
+        """
+        return float(self.pull_arms(np.array([index]))[0])
+
+    def get_expected_value(self, numer_arm):
+        return self.expected_rewards[numer_arm]
+
+    def __str__(self):
+        return f"Non-stationary bandit with {self.k} arms and {self.drift}"
@@ -0,0 +1,33 @@
+"""
+Module: experiments/__init__.py
+Description: Contiene las importaciones y modulos/clases públicas del paquete experiments.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+# Importación de módulos o clases
+from .tape import RewardTape
+from .trajectory import TrajectoryRecorder, TrajectoryReader
+from .metrics import WelfordAccumulator, StreamingHistogram, StreamingMetrics, log_checkpoints
+from .runner import run_experiment, run_experiment_streaming, iterate_steps, simulate, arm_statistics
+from .contextual import run_contextual_experiment
+from .parallel import run_experiment_parallel
+from .sweep import build_configs, successive_halving
+from .kernels import NUMBA_AVAILABLE, verify_kernel
+from .cache import ResultCache, run_experiment_cached
+from .checkpoint import run_experiment_resumable, save_checkpoint, load_checkpoint
+
+# Lista de módulos o clases públicas
+__all__ = ['RewardTape', 'WelfordAccumulator', 'StreamingHistogram', 'StreamingMetrics', 'log_checkpoints',
+           'run_experiment', 'run_experiment_streaming', 'iterate_steps', 'simulate', 'arm_statistics',
+           'run_experiment_parallel', 'NUMBA_AVAILABLE', 'verify_kernel',
+           'run_experiment_resumable', 'save_checkpoint', 'load_checkpoint',
+           'ResultCache', 'run_experiment_cached', 'TrajectoryRecorder', 'TrajectoryReader',
+           'build_configs', 'successive_halving', 'run_contextual_experiment']
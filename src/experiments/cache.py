@@ -0,0 +1,217 @@
+"""
+Module: experiments/cache.py
+Description: Caché en disco de resultados de experimentos, direccionada por el contenido de su configuración.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import copy
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from algorithms import Algorithm
+from arms import Bandit
+from experiments.parallel import _run_shard
+
+
+def _parameters(obj) -> dict:
+    """
+    Parámetros del constructor de un objeto (salvo rng), leídos de sus atributos del mismo nombre.
+    """
+    names = inspect.signature(type(obj).__init__).parameters
+    return {name: getattr(obj, name) for name in names if name not in ('self', 'rng')}
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, '__dict__'):  # Objetos de configuración, como los estimadores
+        return [type(value).__name__, _parameters(value)]
+    raise TypeError(f"Valor no serializable en la clave de la caché: {value!r}")
+
+
+class ResultCache:
+    """
+    Caché en disco de resultados, con una entrada por configuración (bandido, algoritmo, semilla, pasos, ejecuciones).
+
+    Cada entrada es un directorio, con nombre el hash SHA-256 de la configuración, que contiene un fichero .npy
+    por array; al leerla, los arrays se abren con mmap en lugar de cargarse en memoria. Cuando el tamaño total
+    supera max_bytes se borran las entradas usadas hace más tiempo (LRU, según la fecha de último acceso).
+    """
+
+    VERSION = 1  # Cambiarlo invalida todas las entradas, por ejemplo si cambia la semántica de los resultados
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        """
+        :param directory: Directorio de la caché. Se crea si no existe.
+        :param max_bytes: Tamaño máximo en bytes del conjunto de entradas.
+        """
+        assert max_bytes > 0, "El tamaño máximo de la caché debe ser mayor que 0."
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def key(cls, bandit: Bandit, algo: Algorithm, seed: int, steps: int, runs: int, **extra) -> str:
+        """
+        Clave de una configuración: hash de los parámetros de los brazos, la clase, los hiperparámetros y la
+        política de tipos del algoritmo, la semilla, los pasos y las ejecuciones.
+
+        :param extra: Otros valores de los que dependa el resultado (opcional).
+        :return: Hash hexadecimal.
+        """
+        description = {
+            'version': cls.VERSION,
+            'bandit': [[type(arm).__name__, _parameters(arm)] for arm in bandit.arms],
+            'algorithm': [type(algo).__name__, _parameters(algo), algo.dtype_policy],
+            'seed': seed,
+            'steps': steps,
+            'runs': runs,
+            'extra': extra,
+        }
+        encoded = json.dumps(description, sort_keys=True, default=_jsonable)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Lee una entrada y la marca como usada.
+
+        :param key: Clave de la entrada.
+        :return: Diccionario de arrays de solo lectura (mmap), o None si la entrada no existe.
+        """
+        entry = os.path.join(self.directory, key)
+        if not os.path.isdir(entry):
+            return None
+
+        os.utime(entry)  # La fecha de modificación del directorio hace de marca de último uso
+        return {name[:-len('.npy')]: np.load(os.path.join(entry, name), mmap_mode='r')
+                for name in os.listdir(entry) if name.endswith('.npy')}
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray]):
+        """
+        Guarda una entrada y, si hace falta, libera espacio.
+
+        La entrada se escribe en un directorio temporal y se renombra al final, así que un lector nunca ve
+        una entrada a medias.
+
+        :param key: Clave de la entrada.
+        :param arrays: Diccionario de arrays a guardar.
+        """
+        temporary = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+        for name, value in arrays.items():
+            np.save(os.path.join(temporary, name + '.npy'), value)
+
+        entry = os.path.join(self.directory, key)
+        try:
+            os.replace(temporary, entry)
+        except OSError:  # Otro proceso ya ha guardado la misma entrada
+            shutil.rmtree(temporary, ignore_errors=True)
+
+        self.evict()
+
+    def entries(self) -> List[Tuple[str, float, int]]:
+        """
+        :return: Lista de tuplas (key, último uso, tamaño en bytes), de la menos a la más recientemente usada.
+        """
+        result = []
+        for key in os.listdir(self.directory):
+            entry = os.path.join(self.directory, key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+            result.append((key, os.path.getmtime(entry), size))
+
+        return sorted(result, key=lambda item: item[1])
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Tamaño total en bytes de las entradas.
+        """
+        return sum(size for _, _, size in self.entries())
+
+    def evict(self):
+        """
+        Borra las entradas menos recientemente usadas hasta que el tamaño total no supere max_bytes.
+        """
+        entries = self.entries()
+        total = sum(size for _, _, size in entries)
+        for key, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """
+        Borra todas las entradas.
+        """
+        for key, _, _ in self.entries():
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+
+
+def run_experiment_cached(bandit: Bandit, algorithms: List[Algorithm], steps: int, runs: int, seed: int,
+                          cache: Union[str, ResultCache]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]:
+    """
+    Ejecuta el experimento de comparación de algoritmos reutilizando los resultados guardados en la caché.
+
+    Cada algoritmo se simula con su propio np.random.Generator, construido con SeedSequence(seed), de modo que
+    su resultado solo depende de su configuración y no de qué otros algoritmos se ejecuten antes que él:
+    así cada entrada de la caché sirve para cualquier lista de algoritmos que lo incluya.
+
+    :param bandit: Bandido sobre el que se ejecutan los algoritmos.
+    :param algorithms: Lista de instancias de algoritmos a comparar. No se modifican.
+    :param steps: Número de pasos de cada ejecución.
+    :param runs: Número de ejecuciones independientes.
+    :param seed: Semilla de cada algoritmo (obligatoria: sin semilla el resultado no es reproducible).
+    :param cache: Caché o directorio de la caché.
+    :return: Tupla (rewards, optimal_selections, regret_accumulated, arm_stats) con el mismo formato que run_experiment.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+    assert seed is not None, "Se necesita una semilla para poder reutilizar resultados."
+    assert bandit.stationary, "La clave de la caché solo describe bandidos estacionarios."
+    assert not bandit.batched, "La clave de la caché solo describe un único bandido."
+
+    if not isinstance(cache, ResultCache):
+        cache = ResultCache(cache)
+
+    sums = np.zeros((len(algorithms), 3, steps))
+    arm_stats = []
+    for idx, algo in enumerate(algorithms):
+        key = ResultCache.key(bandit, algo, seed, steps, runs)
+        entry = cache.get(key)
+        if entry is None:
+            shard_sums, stats = _run_shard(bandit, copy.deepcopy(algo), steps, runs, np.random.SeedSequence(seed), True)
+            entry = {'sums': shard_sums, 'mean_rewards': stats['mean_rewards'], 'selection_counts': stats['selection_counts']}
+            cache.put(key, entry)
+
+        sums[idx] = entry['sums']
+        arm_stats.append({
+            "mean_rewards": np.array(entry['mean_rewards']),
+            "selection_counts": np.array(entry['selection_counts']),
+            "optimal_arm": bandit.optimal_arm
+        })
+
+    rewards = sums[:, 0] / runs
+    optimal_selections = sums[:, 1] / runs
+    regret_accumulated = np.cumsum(sums[:, 2], axis=1) / runs
+
+    return rewards, optimal_selections, regret_accumulated, arm_stats
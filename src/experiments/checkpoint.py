@@ -0,0 +1,191 @@
+"""
+Module: experiments/checkpoint.py
+Description: Puntos de control de experimentos largos, para reanudarlos y ampliarlos con más pasos o ejecuciones.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import copy
+import json
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from algorithms import Algorithm
+from arms import Bandit
+from experiments.runner import iterate_steps
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    """
+    Guarda un punto de control en un fichero .npz comprimido.
+
+    Los arrays (estado de los algoritmos y sumas parciales) se guardan como entradas binarias y el resto
+    (semilla raíz, algoritmos, bloques y estado de los generadores) como una cabecera JSON. El fichero se
+    escribe primero en una ruta temporal y después se renombra, así que un fallo a mitad nunca lo corrompe.
+
+    :param path: Ruta del fichero.
+    :param checkpoint: Punto de control, con el formato que devuelve load_checkpoint.
+    """
+    arrays = {}
+    blocks = []
+    for idx, algorithm_blocks in enumerate(checkpoint['blocks']):
+        blocks.append([])
+        for b, block in enumerate(algorithm_blocks):
+            prefix = f'{idx}/{b}/'
+            arrays[prefix + 'sums'] = block['sums']
+            for name, value in (block['state'] or {}).items():
+                arrays[prefix + 'state/' + name] = value
+            blocks[idx].append({
+                'runs': block['runs'],
+                'steps': block['steps'],
+                'rng': block['rng'],
+                'state': sorted(block['state']) if block['state'] is not None else None,
+            })
+
+    header = {'entropy': checkpoint['entropy'], 'k': checkpoint['k'],
+              'algorithms': checkpoint['algorithms'], 'blocks': blocks}
+
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        np.savez_compressed(f, header=np.array(json.dumps(header)), **arrays)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Lee un punto de control guardado con save_checkpoint.
+
+    :param path: Ruta del fichero.
+    :return: Diccionario con entropy (semilla raíz), k, algorithms (nombres de clase) y blocks, una lista por
+             algoritmo de bloques de ejecuciones con runs, steps (pasos completados), rng (estado del generador),
+             state (estado del algoritmo) y sums (array (3, steps) con las sumas de recompensas, selecciones
+             óptimas y regret de cada paso).
+    """
+    with np.load(path) as data:
+        header = json.loads(str(data['header']))
+        blocks = []
+        for idx, algorithm_blocks in enumerate(header['blocks']):
+            blocks.append([])
+            for b, block in enumerate(algorithm_blocks):
+                prefix = f'{idx}/{b}/'
+                state = None
+                if block['state'] is not None:
+                    state = {name: data[prefix + 'state/' + name] for name in block['state']}
+                blocks[idx].append(dict(block, state=state, sums=data[prefix + 'sums']))
+
+    return dict(header, blocks=blocks)
+
+
+def _advance_block(bandit: Bandit, algo: Algorithm, block: dict, seed_sequence: np.random.SeedSequence,
+                   steps: int, checkpoint_every: int, save):
+    """
+    Continúa un bloque de ejecuciones desde su último paso completado hasta steps.
+
+    El bloque extrae todos sus números aleatorios de un np.random.Generator propio, restaurado desde el punto
+    de control si existe, así que su trayectoria es la misma tanto si se interrumpe y se reanuda como si no.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    if block['rng'] is not None:
+        rng.bit_generator.state = block['rng']
+    bandit = copy.copy(bandit)
+    bandit.rng = rng
+    algo = copy.deepcopy(algo)  # Cada bloque trabaja sobre su propia copia: el algoritmo recibido no cambia
+    algo.rng = rng
+
+    start = block['steps']
+    if start > 0:
+        algo.set_state(block['state'])
+
+    sums = np.zeros((3, steps))
+    sums[:, :start] = block['sums']
+    for step, chosen_arms, step_rewards in iterate_steps(bandit, algo, steps, block['runs'], start=start):
+        sums[0, step] = np.sum(step_rewards)
+        sums[1, step] = np.count_nonzero(chosen_arms == bandit.optimal_arm)
+        sums[2, step] = np.sum(bandit.regret(chosen_arms))
+
+        if (step + 1) % checkpoint_every == 0 or step + 1 == steps:
+            block.update(steps=step + 1, rng=rng.bit_generator.state, state=algo.get_state(), sums=sums[:, :step + 1])
+            save()
+
+
+def run_experiment_resumable(bandit: Bandit, algorithms: List[Algorithm], steps: int, runs: int, path: str,
+                             seed: Optional[int] = None,
+                             checkpoint_every: int = 100) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]:
+    """
+    Ejecuta el experimento de comparación de algoritmos guardando puntos de control periódicos en path.
+
+    Si path ya existe, el experimento continúa desde el punto de control en lugar de empezar de cero:
+      - Si se interrumpió, cada bloque de ejecuciones sigue desde su último paso guardado.
+      - Si se piden más pasos, los bloques ya terminados continúan desde su estado final hasta el nuevo horizonte.
+      - Si se piden más ejecuciones, se añade un bloque nuevo con las que faltan.
+
+    Cada bloque (algoritmo, ampliación de ejecuciones) tiene su propio generador, con semilla obtenida del árbol
+    SeedSequence(seed) -> algoritmo -> bloque, igual que run_experiment_parallel. Por eso reanudar o ampliar
+    el horizonte da exactamente el mismo resultado que ejecutar el experimento de una vez; al ampliar las
+    ejecuciones, el resultado depende de cómo se repartieron en bloques.
+
+    :param bandit: Bandido sobre el que se ejecutan los algoritmos.
+    :param algorithms: Lista de instancias de algoritmos a comparar.
+    :param steps: Número de pasos de cada ejecución (al menos los ya guardados).
+    :param runs: Número de ejecuciones independientes (al menos las ya guardadas).
+    :param path: Fichero .npz del punto de control.
+    :param seed: Semilla raíz del árbol de semillas (opcional). Al reanudar se usa la guardada.
+    :param checkpoint_every: Número de pasos entre dos puntos de control.
+    :return: Tupla (rewards, optimal_selections, regret_accumulated, arm_stats) con el mismo formato que run_experiment.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+    assert checkpoint_every > 0, "El número de pasos entre puntos de control debe ser mayor que 0."
+    assert bandit.stationary, "El estado de un bandido no estacionario no se guarda en los puntos de control."
+    assert not bandit.batched, \
+        "Los puntos de control no admiten un BanditTestbed: sus bloques de ejecuciones comparten un único bandido."
+
+    names = [type(algo).__name__ for algo in algorithms]
+    if os.path.exists(path):
+        checkpoint = load_checkpoint(path)
+        assert checkpoint['algorithms'] == names and checkpoint['k'] == bandit.k, \
+            "El punto de control no corresponde con los algoritmos o el bandido del experimento."
+    else:
+        checkpoint = {'entropy': np.random.SeedSequence(seed).entropy, 'k': bandit.k,
+                      'algorithms': names, 'blocks': [[] for _ in algorithms]}
+
+    saved_runs = sum(block['runs'] for block in checkpoint['blocks'][0])
+    saved_steps = max((block['steps'] for blocks in checkpoint['blocks'] for block in blocks), default=0)
+    assert runs >= saved_runs and steps >= saved_steps, \
+        "El experimento solo se puede ampliar: el punto de control tiene más ejecuciones o pasos de los pedidos."
+
+    if runs > saved_runs:
+        for blocks in checkpoint['blocks']:
+            blocks.append({'runs': runs - saved_runs, 'steps': 0, 'rng': None, 'state': None, 'sums': np.zeros((3, 0))})
+
+    for idx, algo in enumerate(algorithms):
+        for b, block in enumerate(checkpoint['blocks'][idx]):
+            if block['steps'] < steps:
+                seed_sequence = np.random.SeedSequence(checkpoint['entropy'], spawn_key=(idx, b))
+                _advance_block(bandit, algo, block, seed_sequence, steps, checkpoint_every,
+                               lambda: save_checkpoint(path, checkpoint))
+
+    sums = np.array([np.sum([block['sums'] for block in blocks], axis=0) for blocks in checkpoint['blocks']])
+    arm_stats = []
+    for blocks in checkpoint['blocks']:
+        state = blocks[0]['state']  # Estadísticas de la primera ejecución del primer bloque
+        arm_stats.append({
+            "mean_rewards": state['values'][0].copy(),
+            "selection_counts": state['counts'][0].copy(),
+            "optimal_arm": bandit.optimal_arm
+        })
+
+    rewards = sums[:, 0] / runs
+    optimal_selections = sums[:, 1] / runs
+    regret_accumulated = np.cumsum(sums[:, 2], axis=1) / runs
+
+    return rewards, optimal_selections, regret_accumulated, arm_stats
@@ -0,0 +1,82 @@
+"""
+Module: experiments/contextual.py
+Description: Ejecutor vectorizado de experimentos con bandidos contextuales.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from algorithms import LinearAlgorithm
+from arms import ContextualBandit
+
+
+def run_contextual_experiment(bandit: ContextualBandit, algorithms: List[LinearAlgorithm], steps: int, runs: int,
+                              seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]:
+    """
+    Ejecuta el experimento de comparación de algoritmos contextuales, con todas las ejecuciones a la vez como
+    run_experiment: en cada paso cada ejecución recibe un contexto, y la selección de brazos, la extracción de
+    recompensas y la actualización de los modelos son una operación vectorizada para todas las ejecuciones.
+
+    Los contextos salen de un generador con la misma semilla para todos los algoritmos, así que todos se
+    comparan sobre la misma secuencia de contextos.
+
+    :param bandit: Bandido contextual.
+    :param algorithms: Lista de instancias de algoritmos contextuales, con la dimensión del bandido.
+    :param steps: Número de pasos de cada ejecución.
+    :param runs: Número de ejecuciones independientes.
+    :param seed: Semilla de los contextos y de las recompensas (opcional).
+    :return: Tupla (rewards, optimal_selections, regret_accumulated, arm_stats) con el mismo formato que
+             run_experiment. En arm_stats, optimal_arm es el brazo óptimo para más contextos de la primera ejecución.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+    assert all(algo.contextual and algo.d == bandit.d for algo in algorithms), \
+        "Los algoritmos deben ser contextuales y tener la dimensión de los contextos del bandido."
+
+    if seed is not None:
+        np.random.seed(seed)  # Asegurar reproducibilidad de resultados.
+    context_seed = np.random.SeedSequence(seed)
+
+    rewards = np.zeros((len(algorithms), steps))
+    optimal_selections = np.zeros((len(algorithms), steps))
+    regret = np.zeros((len(algorithms), steps))
+    arm_stats = []
+
+    for idx, algo in enumerate(algorithms):
+        context_rng = np.random.default_rng(context_seed)
+        algo.reset_batch(runs)
+        optimal_counts = np.zeros(bandit.k, dtype=int)
+
+        for step in range(steps):
+            contexts = bandit.contexts(runs, rng=context_rng)
+            chosen_arms = algo.select_arms(contexts)
+            step_rewards = bandit.pull_arms(contexts, chosen_arms)
+            algo.update_batch(chosen_arms, step_rewards, contexts)
+
+            optimal_arms = bandit.optimal_arms(contexts)
+            optimal_counts[optimal_arms[0]] += 1
+            rewards[idx, step] = np.sum(step_rewards)
+            optimal_selections[idx, step] = np.count_nonzero(chosen_arms == optimal_arms)
+            regret[idx, step] = np.sum(bandit.regret(contexts, chosen_arms))
+
+        arm_stats.append({
+            "mean_rewards": algo.values[0].copy(),
+            "selection_counts": algo.counts[0].copy(),
+            "optimal_arm": int(np.argmax(optimal_counts))
+        })
+
+    rewards /= runs
+    optimal_selections /= runs
+    regret_accumulated = np.cumsum(regret, axis=1) / runs
+
+    return rewards, optimal_selections, regret_accumulated, arm_stats
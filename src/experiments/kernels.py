@@ -0,0 +1,321 @@
+"""
+Module: experiments/kernels.py
+Description: Núcleos compilados con Numba que ejecutan un episodio completo de cada algoritmo.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import copy
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from algorithms import Algorithm, EpsilonGreedy, UCB1, UCB2, Softmax, GradientBandit
+from arms import Bandit
+from experiments.tape import RewardTape
+from randomness import BufferedGenerator, get_rng
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Sin Numba los núcleos son funciones de Python normales: correctos pero lentos
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+# Cada núcleo ejecuta un episodio de un único bandido con la misma semántica que select_arm/update de su clase.
+# Las recompensas se leen de una matriz (steps, k) y los números aleatorios de un array de uniformes que se
+# consume en el mismo orden que lo haría la clase con un BufferedGenerator: así las trayectorias coinciden.
+# El estado (counts, values...) se recibe ya inicializado y se modifica en el sitio.
+
+@njit(cache=True)
+def _epsilon_greedy_episode(epsilon, rewards, uniforms, chosen, counts, values):
+    steps, k = rewards.shape
+    u = 0
+    for step in range(steps):
+        explore = uniforms[u] < epsilon
+        u += 1
+        if explore:
+            arm = int(uniforms[u] * k)
+            u += 1
+        else:
+            arm = np.argmax(values)
+
+        reward = rewards[step, arm]
+        counts[arm] += 1
+        values[arm] = values[arm] + (reward - values[arm]) / counts[arm]
+        chosen[step] = arm
+
+
+@njit(cache=True)
+def _ucb1_episode(c, t0, rewards, chosen, counts, values):
+    steps, k = rewards.shape
+    t = t0
+    for step in range(steps):
+        t += 1
+        arm = -1
+        for i in range(k):
+            if counts[i] == 0:
+                arm = i
+                break
+        if arm < 0:
+            best = -np.inf
+            for i in range(k):
+                ucb = values[i] + c * np.sqrt(2 * np.log(t) / counts[i])
+                if ucb > best:
+                    best = ucb
+                    arm = i
+
+        reward = rewards[step, arm]
+        counts[arm] += 1
+        values[arm] = values[arm] + (reward - values[arm]) / counts[arm]
+        chosen[step] = arm
+    return t
+
+
+@njit(cache=True)
+def _ucb2_episode(alpha, max_tau, rewards, chosen, counts, values, epochs, tau):
+    steps, k = rewards.shape
+    for step in range(steps):
+        arm = -1
+        for i in range(k):
+            if counts[i] == 0:
+                arm = i
+                break
+        if arm < 0:
+            total_count = 0
+            for i in range(k):
+                total_count += counts[i]
+            best = -np.inf
+            for i in range(k):
+                tau_i = max(tau[i], 1)
+                ucb = values[i] + np.sqrt((1 + alpha) * np.log(math.e * total_count / tau_i) / (2 * tau_i))
+                if np.isnan(ucb):  # np.argmax trata NaN como máximo y devuelve el primero
+                    arm = i
+                    break
+                if ucb > best:
+                    best = ucb
+                    arm = i
+
+        reward = rewards[step, arm]
+        counts[arm] += 1
+        values[arm] = values[arm] + (reward - values[arm]) / counts[arm]
+        epochs[arm] += 1
+        tau[arm] = math.ceil(min((1 + alpha) ** epochs[arm], max_tau))
+        chosen[step] = arm
+
+
+@njit(cache=True)
+def _build_sum_tree(tree, size, values, tau):
+    shift = np.max(values)
+    tree[:] = 0.0
+    for i in range(len(values)):
+        tree[size + i] = np.exp((values[i] - shift) / tau)
+    for node in range(size - 1, 0, -1):
+        tree[node] = tree[2 * node] + tree[2 * node + 1]
+    return shift
+
+
+@njit(cache=True)
+def _softmax_episode(tau, max_exponent, rewards, uniforms, chosen, counts, values):
+    steps, k = rewards.shape
+    size = 1
+    while size < k:
+        size *= 2
+    tree = np.zeros(2 * size)
+    shift = _build_sum_tree(tree, size, values, tau)
+
+    for step in range(steps):
+        # Descenso por el árbol de sumas, igual que SumSegmentTree.sample
+        mass = uniforms[step] * tree[1]
+        node = 1
+        while node < size:
+            left = 2 * node
+            if mass < tree[left]:
+                node = left
+            else:
+                mass -= tree[left]
+                node = left + 1
+        arm = min(node - size, k - 1)
+
+        reward = rewards[step, arm]
+        counts[arm] += 1
+        values[arm] = values[arm] + (reward - values[arm]) / counts[arm]
+        chosen[step] = arm
+
+        exponent = (values[arm] - shift) / tau
+        if exponent > max_exponent:
+            shift = _build_sum_tree(tree, size, values, tau)
+        else:
+            node = arm + size
+            tree[node] = math.exp(exponent)
+            node //= 2
+            while node >= 1:
+                tree[node] = tree[2 * node] + tree[2 * node + 1]
+                node //= 2
+            if tree[1] < 1e-300:
+                shift = _build_sum_tree(tree, size, values, tau)
+
+
+@njit(cache=True)
+def _softmax_cdf(preferences, probabilities, cdf):
+    exp_preferences = np.exp(preferences)
+    probabilities[:] = exp_preferences / np.sum(exp_preferences)
+    cdf[:] = np.cumsum(probabilities)
+    cdf /= cdf[-1]
+
+
+@njit(cache=True)
+def _gradient_bandit_episode(alpha, t0, rewards, uniforms, chosen, counts, values, preferences, avg_reward):
+    steps, k = rewards.shape
+    probabilities = np.empty(k)
+    cdf = np.empty(k)
+    _softmax_cdf(preferences, probabilities, cdf)
+    t = t0
+
+    for step in range(steps):
+        arm = min(np.searchsorted(cdf, uniforms[step], side='right'), k - 1)
+
+        reward = rewards[step, arm]
+        counts[arm] += 1
+        values[arm] = values[arm] + (reward - values[arm]) / counts[arm]
+        chosen[step] = arm
+
+        t += 1
+        avg_reward[0] += (reward - avg_reward[0]) / t
+        delta = alpha * (reward - avg_reward[0])
+        for i in range(k):
+            if i == arm:
+                preferences[i] -= -delta * (1 - probabilities[i])
+            else:
+                preferences[i] -= delta * probabilities[i]
+        _softmax_cdf(preferences, probabilities, cdf)
+    return t
+
+
+def supports(algo: Algorithm) -> bool:
+    """
+    Indica si hay un núcleo compilado para el algoritmo: solo para las clases base y con la media muestral.
+    """
+    return type(algo) in (EpsilonGreedy, UCB1, UCB2, Softmax, GradientBandit) and algo.estimator is None
+
+
+def run_episode(algo: Algorithm, rewards: np.ndarray, uniforms: np.ndarray, run: Optional[int] = None) -> np.ndarray:
+    """
+    Ejecuta un episodio completo del algoritmo con su núcleo compilado.
+
+    :param algo: Instancia del algoritmo. Su estado se actualiza en el sitio: el de un único bandido,
+                 o la fila run si está en modo por lotes.
+    :param rewards: Matriz (steps, k) con la recompensa de cada brazo en cada paso.
+    :param uniforms: Uniformes en [0, 1) que consume la política (al menos 2 * steps).
+    :param run: Fila del estado a usar en modo por lotes (opcional).
+    :return: Array (steps,) con el brazo elegido en cada paso.
+    """
+    row = (lambda state: state) if run is None else (lambda state: state[run])
+    chosen = np.empty(len(rewards), dtype=np.int64)
+    counts, values = row(algo.counts), row(algo.values)
+
+    if type(algo) is EpsilonGreedy:
+        _epsilon_greedy_episode(algo.epsilon, rewards, uniforms, chosen, counts, values)
+    elif type(algo) is UCB1:
+        algo.t = _ucb1_episode(algo.c, algo.t, rewards, chosen, counts, values)
+    elif type(algo) is UCB2:
+        _ucb2_episode(algo.alpha, algo.MAX_TAU, rewards, chosen, counts, values, row(algo.epochs), row(algo.tau))
+    elif type(algo) is Softmax:
+        _softmax_episode(algo.tau, algo.MAX_EXPONENT, rewards, uniforms, chosen, counts, values)
+    elif type(algo) is GradientBandit:
+        avg_reward = np.array([float(row(algo.avg_reward))])
+        algo.t = _gradient_bandit_episode(algo.alpha, algo.t, rewards, uniforms, chosen, counts, values,
+                                          row(algo.preferences), avg_reward)
+        if run is None:
+            algo.avg_reward = avg_reward[0]
+        else:
+            algo.avg_reward[run] = avg_reward[0]
+    else:
+        raise ValueError(f"No hay núcleo compilado para el algoritmo: {type(algo).__name__}")
+
+    return chosen
+
+
+def simulate_compiled(bandit: Bandit, algo: Algorithm, steps: int, runs: int,
+                      tape: Optional[RewardTape] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Equivalente a runner.simulate, pero cada ejecución es un episodio completo dentro de un núcleo compilado.
+
+    Las recompensas de cada ejecución se leen de la cinta o se muestrean para todos los brazos y pasos
+    de una vez, y los uniformes de la política se extraen del generador del algoritmo.
+
+    :return: Tupla (rewards, optimal_selections, regret) de arrays (steps,) con las sumas sobre las ejecuciones.
+    """
+    optimal_arm = bandit.optimal_arm
+    expected_rewards = np.asarray(bandit.expected_rewards, dtype=float)
+    optimal_reward = expected_rewards[optimal_arm]
+    rng = get_rng(algo.rng)
+    arms = np.arange(bandit.k)
+    steps_index = np.arange(steps)
+
+    rewards = np.zeros(steps)
+    optimal_selections = np.zeros(steps)
+    regret = np.zeros(steps)
+
+    algo.reset_batch(runs)  # Estado (runs, k): cada núcleo trabaja sobre una fila
+    for run in range(runs):
+        if tape is None:
+            run_rewards = bandit.pull_arms(np.broadcast_to(arms, (steps, bandit.k)))
+        else:
+            run_rewards = np.asarray(tape.data[run, :steps], dtype=float)
+
+        algo.t = 0  # Los contadores de paso son por episodio
+        chosen_arms = run_episode(algo, run_rewards, rng.random(2 * steps), run)
+
+        rewards += run_rewards[steps_index, chosen_arms]
+        optimal_selections += chosen_arms == optimal_arm
+        regret += optimal_reward - expected_rewards[chosen_arms]
+
+    return rewards, optimal_selections, regret
+
+
+def verify_kernel(algo: Algorithm, rewards: np.ndarray, seed: int = 0) -> bool:
+    """
+    Comprueba que el núcleo compilado de un algoritmo reproduce la trayectoria de su clase de Python.
+
+    Ejecuta el episodio dos veces desde el estado reiniciado, con las mismas recompensas y la misma semilla:
+    una con select_arm/update y un BufferedGenerator, y otra con el núcleo y los mismos uniformes. Cada pasada
+    trabaja sobre una copia, así que el algoritmo recibido no cambia.
+
+    :param algo: Instancia del algoritmo.
+    :param rewards: Matriz (steps, k) de recompensas.
+    :param seed: Semilla de los números aleatorios de la política.
+    :return: True si los brazos elegidos coinciden y los valores estimados son iguales salvo redondeo.
+    """
+    steps = len(rewards)
+
+    reference = copy.deepcopy(algo)
+    reference.rng = BufferedGenerator(seed)
+    reference.n_envs = None
+    reference.reset()
+    expected = np.empty(steps, dtype=np.int64)
+    for step in range(steps):
+        expected[step] = reference.select_arm()
+        reference.update(expected[step], rewards[step, expected[step]])
+
+    compiled = copy.deepcopy(algo)
+    compiled.rng = None
+    compiled.n_envs = None
+    compiled.reset()
+    chosen = run_episode(compiled, rewards, np.random.default_rng(seed).random(2 * steps))
+
+    return bool(np.array_equal(expected, chosen) and np.allclose(reference.values, compiled.values))
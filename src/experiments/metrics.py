@@ -0,0 +1,240 @@
+"""
+Module: experiments/metrics.py
+Description: Acumuladores en línea de métricas con memoria acotada para horizontes largos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from arms import Bandit
+
+
+def log_checkpoints(steps: int, n_points: int) -> np.ndarray:
+    """
+    Pasos espaciados logarítmicamente en [0, steps - 1], incluyendo siempre el primero y el último.
+
+    :param steps: Número de pasos del experimento.
+    :param n_points: Número máximo de puntos.
+    :return: Array creciente de pasos, sin repetidos.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert n_points > 1, "Se necesitan al menos 2 puntos."
+
+    return np.unique(np.geomspace(1, steps, n_points).astype(int)) - 1
+
+
+class WelfordAccumulator:
+    """
+    Media y varianza en línea (algoritmo de Welford) de un vector de posiciones.
+
+    Cada actualización añade un lote de observaciones a una posición combinando sus estadísticos
+    con la fórmula de Chan, así que dos acumuladores se pueden fusionar sin perder precisión.
+    """
+
+    def __init__(self, size: int):
+        """
+        :param size: Número de posiciones.
+        """
+        self.count = np.zeros(size, dtype=np.int64)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)  # Suma de los cuadrados de las desviaciones a la media
+
+    def update(self, index: int, values: np.ndarray):
+        """
+        Añade un lote de observaciones a una posición.
+
+        :param index: Posición.
+        :param values: Observaciones.
+        """
+        batch_mean = np.mean(values)
+        self._combine(index, len(values), batch_mean, np.sum((values - batch_mean) ** 2))
+
+    def merge(self, other: "WelfordAccumulator"):
+        """
+        Fusiona en este acumulador las observaciones de otro con las mismas posiciones.
+        """
+        self._combine(slice(None), other.count, other.mean, other.m2)
+
+    def _combine(self, index, count, mean, m2):
+        total = self.count[index] + count
+        delta = mean - self.mean[index]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(total > 0, count / total, 0.0)
+        self.m2[index] += m2 + delta ** 2 * self.count[index] * weight
+        self.mean[index] += delta * weight
+        self.count[index] = total
+
+    @property
+    def variance(self) -> np.ndarray:
+        """
+        Varianza muestral de cada posición (0 donde hay menos de dos observaciones).
+        """
+        return np.where(self.count > 1, self.m2 / np.maximum(self.count - 1, 1), 0.0)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    def interval(self, z: float = 1.96) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Intervalo de confianza normal para la media de cada posición.
+
+        :param z: Cuantil de la normal (1.96 para el 95%).
+        :return: Tupla (lower, upper).
+        """
+        half_width = z * np.sqrt(self.variance / np.maximum(self.count, 1))
+        return self.mean - half_width, self.mean + half_width
+
+
+class StreamingHistogram:
+    """
+    Histograma de tamaño fijo por posición para estimar cuantiles en línea.
+
+    Cada posición i reparte sus observaciones en n_bins intervalos iguales de [0, upper[i]], así que
+    el error de un cuantil está acotado por upper[i] / n_bins y dos histogramas se fusionan sumando.
+    """
+
+    def __init__(self, upper: np.ndarray, n_bins: int = 256):
+        """
+        :param upper: Array (size,) con la cota superior de las observaciones de cada posición.
+        :param n_bins: Número de intervalos por posición.
+        """
+        self.upper = np.maximum(np.asarray(upper, dtype=float), np.finfo(float).tiny)
+        self.n_bins = n_bins
+        self.counts = np.zeros((len(self.upper), n_bins), dtype=np.int64)
+
+    def update(self, index: int, values: np.ndarray):
+        """
+        Añade un lote de observaciones a una posición.
+        """
+        bins = np.clip((values / self.upper[index] * self.n_bins).astype(int), 0, self.n_bins - 1)
+        self.counts[index] += np.bincount(bins, minlength=self.n_bins)
+
+    def merge(self, other: "StreamingHistogram"):
+        self.counts += other.counts
+
+    def quantile(self, q: float) -> np.ndarray:
+        """
+        Cuantil q de cada posición, interpolando linealmente dentro del intervalo que lo contiene.
+
+        :param q: Probabilidad en [0, 1].
+        :return: Array (size,) de cuantiles.
+        """
+        cumulative = np.cumsum(self.counts, axis=1)
+        target = q * cumulative[:, -1]
+        bins = np.minimum(np.sum(cumulative < target[:, None], axis=1), self.n_bins - 1)
+
+        rows = np.arange(len(bins))
+        before = np.where(bins > 0, cumulative[rows, np.maximum(bins - 1, 0)], 0)
+        inside = np.maximum(self.counts[rows, bins], 1)
+        fraction = np.clip((target - before) / inside, 0, 1)
+
+        return (bins + fraction) * self.upper / self.n_bins
+
+
+class StreamingMetrics:
+    """
+    Métricas de un algoritmo acumuladas en línea sobre pasos espaciados logarítmicamente.
+
+    En lugar de matrices densas (steps,), guarda en cada punto de control la media y la varianza entre
+    ejecuciones de la recompensa y del porcentaje de selecciones óptimas (promediadas sobre los pasos
+    desde el punto anterior) y del regret acumulado, además de un histograma del regret para sus cuantiles.
+    La memoria depende del número de ejecuciones y de puntos de control, no del horizonte.
+    """
+
+    def __init__(self, bandit: Bandit, steps: int, n_checkpoints: int = 256, n_bins: int = 256):
+        """
+        :param bandit: Bandido del experimento, para calcular el regret.
+        :param steps: Número de pasos de cada ejecución.
+        :param n_checkpoints: Número máximo de puntos de control.
+        :param n_bins: Número de intervalos del histograma de regret de cada punto de control.
+        """
+        self.bandit = bandit
+        self.steps = steps
+        self.checkpoints = log_checkpoints(steps, n_checkpoints)
+
+        n = len(self.checkpoints)
+        self.rewards = WelfordAccumulator(n)
+        self.optimal_selections = WelfordAccumulator(n)
+        self.regret = WelfordAccumulator(n)
+
+        # El regret acumulado en el paso t está en [0, (t + 1) * mayor diferencia con el brazo óptimo]
+        # (en un bandido no estacionario es la diferencia inicial, y los valores mayores caen en el último intervalo).
+        # El óptimo de cada paso se lee siempre de bandit en update, porque en un bandido no estacionario cambia
+        expected_rewards = np.asarray(bandit.expected_rewards, dtype=float)  # (k,), o (n_bandits, k) en un BanditTestbed
+        max_gap = np.max(np.max(expected_rewards, axis=-1) - np.min(expected_rewards, axis=-1))
+        self.regret_histogram = StreamingHistogram(max_gap * (self.checkpoints + 1), n_bins)
+
+    def update(self, step: int, chosen_arms: np.ndarray, rewards: np.ndarray):
+        """
+        Registra un paso de todas las ejecuciones. Los pasos deben llegar en orden; el paso 0 inicia un nuevo bloque de ejecuciones.
+
+        :param step: Paso de tiempo.
+        :param chosen_arms: Array (runs,) con el brazo elegido en cada ejecución.
+        :param rewards: Array (runs,) con la recompensa obtenida en cada ejecución.
+        """
+        if step == 0:
+            # Estado por ejecución: regret acumulado y sumas desde el último punto de control
+            self._cumulative_regret = np.zeros(len(chosen_arms))
+            self._reward_sum = np.zeros(len(chosen_arms))
+            self._optimal_sum = np.zeros(len(chosen_arms))
+            self._next = 0
+            self._last_checkpoint = -1
+
+        self._cumulative_regret += self.bandit.regret(chosen_arms)  # Con el óptimo del paso actual
+        self._reward_sum += rewards
+        self._optimal_sum += chosen_arms == self.bandit.optimal_arm
+
+        if self._next < len(self.checkpoints) and step == self.checkpoints[self._next]:
+            span = step - self._last_checkpoint
+            self.rewards.update(self._next, self._reward_sum / span)
+            self.optimal_selections.update(self._next, self._optimal_sum / span)
+            self.regret.update(self._next, self._cumulative_regret)
+            self.regret_histogram.update(self._next, self._cumulative_regret)
+
+            self._reward_sum[:] = 0
+            self._optimal_sum[:] = 0
+            self._last_checkpoint = step
+            self._next += 1
+
+    def merge(self, other: "StreamingMetrics"):
+        """
+        Fusiona las métricas de otro bloque de ejecuciones del mismo experimento.
+        """
+        assert np.array_equal(self.checkpoints, other.checkpoints), "Los puntos de control deben coincidir."
+
+        self.rewards.merge(other.rewards)
+        self.optimal_selections.merge(other.optimal_selections)
+        self.regret.merge(other.regret)
+        self.regret_histogram.merge(other.regret_histogram)
+
+    def regret_quantiles(self, quantiles: Sequence[float] = (0.05, 0.5, 0.95)) -> np.ndarray:
+        """
+        Cuantiles del regret acumulado entre ejecuciones en cada punto de control.
+
+        :param quantiles: Probabilidades de los cuantiles.
+        :return: Array (len(quantiles), n_checkpoints).
+        """
+        return np.stack([self.regret_histogram.quantile(q) for q in quantiles])
+
+    def band(self, metric: str, z: float = 1.96) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Curva media y banda de confianza de una métrica, lista para dibujar.
+
+        :param metric: 'rewards', 'optimal_selections' o 'regret'.
+        :param z: Cuantil de la normal del intervalo de confianza.
+        :return: Tupla (steps, mean, lower, upper).
+        """
+        accumulator = getattr(self, metric)
+        lower, upper = accumulator.interval(z)
+        return self.checkpoints, accumulator.mean, lower, upper
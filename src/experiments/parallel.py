@@ -0,0 +1,100 @@
+"""
+Module: experiments/parallel.py
+Description: Ejecución de experimentos repartida entre varios procesos con semillas deterministas por bloque.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from algorithms import Algorithm
+from arms import Bandit
+from experiments.runner import simulate, arm_statistics
+
+
+def _run_shard(bandit: Bandit, algo: Algorithm, steps: int, runs: int, seed_sequence: np.random.SeedSequence,
+               with_arm_stats: bool) -> Tuple[np.ndarray, Optional[dict]]:
+    """
+    Ejecuta un bloque de ejecuciones de un algoritmo en el proceso actual.
+
+    El bandido y el algoritmo extraen sus números aleatorios de un np.random.Generator propio del bloque,
+    construido a partir de su SeedSequence.
+
+    :return: Tupla (sums, arm_stats), con sums un array (3, steps) con las sumas de recompensas,
+             selecciones óptimas y regret de cada paso, y arm_stats las estadísticas de la primera
+             ejecución del bloque si with_arm_stats es True.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    bandit = copy.copy(bandit)
+    bandit.rng = rng
+    algo.rng = rng
+    sums = np.stack(simulate(bandit, algo, steps, runs))
+    return sums, arm_statistics(bandit, algo) if with_arm_stats else None
+
+
+def run_experiment_parallel(bandit: Bandit, algorithms: List[Algorithm], steps: int, runs: int,
+                            seed: Optional[int] = None, n_workers: Optional[int] = None,
+                            shard_runs: int = 100) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]:
+    """
+    Ejecuta el experimento de comparación de algoritmos repartiendo el trabajo entre varios procesos.
+
+    El trabajo se divide en bloques (algoritmo, shard_runs ejecuciones) y cada bloque recibe su propia semilla,
+    obtenida del árbol SeedSequence(seed) -> algoritmo -> bloque. Las sumas por paso de cada bloque se reducen
+    en el proceso padre siempre en el mismo orden, de modo que el resultado es idéntico bit a bit sea cual sea
+    el número de procesos. Sí depende de shard_runs, que fija cómo se reparten las ejecuciones.
+
+    :param bandit: Bandido sobre el que se ejecutan los algoritmos.
+    :param algorithms: Lista de instancias de algoritmos a comparar. No se modifican.
+    :param steps: Número de pasos de cada ejecución.
+    :param runs: Número de ejecuciones independientes.
+    :param seed: Semilla raíz del árbol de semillas (opcional).
+    :param n_workers: Número de procesos. None usa tantos como núcleos y 1 ejecuta todo en el proceso actual.
+    :param shard_runs: Número de ejecuciones de cada bloque.
+    :return: Tupla (rewards, optimal_selections, regret_accumulated, arm_stats) con el mismo formato que run_experiment.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+    assert shard_runs > 0, "El número de ejecuciones por bloque debe ser mayor que 0."
+    assert not bandit.batched, \
+        "El ejecutor paralelo no admite un BanditTestbed: sus bloques de ejecuciones comparten un único bandido."
+
+    starts = list(range(0, runs, shard_runs))
+    algorithm_seeds = np.random.SeedSequence(seed).spawn(len(algorithms))
+
+    shards = []
+    for idx, algo in enumerate(algorithms):
+        for seed_sequence, start in zip(algorithm_seeds[idx].spawn(len(starts)), starts):
+            shard_size = min(shard_runs, runs - start)
+            shards.append((bandit, copy.deepcopy(algo), steps, shard_size, seed_sequence, start == 0))
+
+    if n_workers == 1:
+        results = [_run_shard(*shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_run_shard, *zip(*shards)))
+
+    # Reducción en orden fijo: algoritmo a algoritmo y bloque a bloque
+    sums = np.zeros((len(algorithms), 3, steps))
+    arm_stats = []
+    for idx in range(len(algorithms)):
+        for sums_shard, stats in results[idx * len(starts):(idx + 1) * len(starts)]:
+            sums[idx] += sums_shard
+            if stats is not None:
+                arm_stats.append(stats)
+
+    rewards = sums[:, 0] / runs
+    optimal_selections = sums[:, 1] / runs
+    regret_accumulated = np.cumsum(sums[:, 2], axis=1) / runs
+
+    return rewards, optimal_selections, regret_accumulated, arm_stats
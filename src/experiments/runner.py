@@ -0,0 +1,252 @@
+"""
+Module: experiments/runner.py
+Description: Ejecución vectorizada de experimentos sobre el problema de los k-brazos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import os
+import warnings
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from algorithms import Algorithm
+from arms import Bandit
+from experiments.tape import RewardTape
+from experiments.metrics import StreamingMetrics
+from experiments.trajectory import TrajectoryRecorder
+from experiments.kernels import NUMBA_AVAILABLE, simulate_compiled, supports
+
+BACKENDS = ('numpy', 'numba')
+
+
+def iterate_steps(bandit: Bandit, algo: Algorithm, steps: int, runs: int, tape: Optional[RewardTape] = None,
+                  start: int = 0, feedback_delay: int = 0,
+                  update_every: int = 1) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Ejecuta runs ejecuciones de un algoritmo a la vez, con estado (runs, k), y devuelve paso a paso lo ocurrido.
+
+    Por defecto el algoritmo se actualiza justo después de cada tirada. Con feedback_delay y update_every se
+    simula un sistema real, que recibe las recompensas con retraso y actualiza la política por lotes: cada
+    update_every pasos se incorporan con una sola llamada a update_many todas las recompensas ya llegadas.
+    Las recompensas que llegarían después del último paso no se aplican.
+
+    :param bandit: Bandido sobre el que se ejecuta el algoritmo.
+    :param algo: Instancia del algoritmo. Se reinicia en modo por lotes con una fila por ejecución.
+    :param steps: Número de pasos de cada ejecución.
+    :param runs: Número de ejecuciones.
+    :param tape: Cinta de recompensas de la que leer las recompensas (opcional).
+    :param start: Paso desde el que continuar. Si es mayor que 0, el algoritmo no se reinicia: debe tener ya
+                  el estado por lotes de ese paso (por ejemplo, restaurado con set_state).
+    :param feedback_delay: Pasos de retraso de las recompensas: la del paso s se recibe al final del paso
+                           s + feedback_delay, y la primera decisión que la tiene en cuenta es la siguiente.
+    :param update_every: Número de pasos entre dos actualizaciones de la política.
+    :return: Generador de tuplas (step, chosen_arms, rewards), con arrays (runs,).
+    """
+    assert feedback_delay >= 0, "El retraso de las recompensas no puede ser negativo."
+    assert update_every > 0, "El número de pasos entre actualizaciones debe ser mayor que 0."
+    delayed = feedback_delay > 0 or update_every > 1
+    assert start == 0 or not delayed, "Solo se puede continuar un experimento con actualizaciones inmediatas."
+
+    pending_arms, pending_rewards = [], []  # Tiradas cuya recompensa aún no se ha aplicado, una entrada por paso
+    if start == 0:
+        algo.reset_batch(runs)  # Estado (runs, k): una fila por ejecución
+        bandit.reset()  # Un bandido no estacionario vuelve a sus parámetros iniciales
+
+    for step in range(start, steps):
+        chosen_arms = algo.select_arms()
+        if tape is None:
+            step_rewards = bandit.pull_arms(chosen_arms)
+        else:
+            step_rewards = tape.rewards(step, chosen_arms)
+
+        if not delayed:
+            algo.update_batch(chosen_arms, step_rewards)
+        else:
+            pending_arms.append(chosen_arms)
+            pending_rewards.append(step_rewards)
+            ready = len(pending_arms) - feedback_delay  # Los feedback_delay pasos más recientes aún no han llegado
+            if (step + 1) % update_every == 0 and ready > 0:
+                algo.update_many(np.stack(pending_arms[:ready], axis=1), np.stack(pending_rewards[:ready], axis=1))
+                del pending_arms[:ready], pending_rewards[:ready]
+
+        yield step, chosen_arms, step_rewards
+        bandit.advance()  # Después de que el consumidor haya calculado el regret con el óptimo de este paso
+
+
+def simulate(bandit: Bandit, algo: Algorithm, steps: int, runs: int,
+             tape: Optional[RewardTape] = None, backend: str = 'numpy',
+             recorder: Optional[TrajectoryRecorder] = None, feedback_delay: int = 0,
+             update_every: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ejecuta runs ejecuciones de un algoritmo a la vez, con estado (runs, k), y acumula sus métricas por paso.
+
+    :param bandit: Bandido sobre el que se ejecuta el algoritmo.
+    :param algo: Instancia del algoritmo. Se reinicia en modo por lotes con una fila por ejecución.
+    :param steps: Número de pasos de cada ejecución.
+    :param runs: Número de ejecuciones.
+    :param tape: Cinta de recompensas de la que leer las recompensas (opcional).
+    :param backend: 'numpy' para avanzar todas las ejecuciones a la vez con operaciones vectorizadas, o 'numba'
+                    para ejecutar cada episodio completo en un núcleo compilado. Si Numba no está instalado o el
+                    algoritmo no tiene núcleo, se avisa y se usa 'numpy'.
+    :param recorder: Registro de trayectorias al que pasar cada paso (opcional). Solo con el backend 'numpy'.
+    :param feedback_delay: Pasos de retraso de las recompensas; ver iterate_steps. Solo con el backend 'numpy'.
+    :param update_every: Número de pasos entre actualizaciones; ver iterate_steps. Solo con el backend 'numpy'.
+    :return: Tupla (rewards, optimal_selections, regret) de arrays (steps,) con la suma sobre las ejecuciones
+             de la recompensa, del número de selecciones óptimas y del regret instantáneo de cada paso.
+    """
+    assert backend in BACKENDS, f"El backend debe ser uno de {BACKENDS}."
+
+    if backend == 'numba':
+        immediate = feedback_delay == 0 and update_every == 1
+        if NUMBA_AVAILABLE and supports(algo) and recorder is None and bandit.stationary and immediate \
+                and not bandit.batched:
+            return simulate_compiled(bandit, algo, steps, runs, tape)
+        warnings.warn(f"Backend 'numba' no disponible para {type(algo).__name__}; se usa 'numpy'.", RuntimeWarning)
+
+    rewards = np.zeros(steps)
+    optimal_selections = np.zeros(steps)
+    regret = np.zeros(steps)
+
+    for step, chosen_arms, step_rewards in iterate_steps(bandit, algo, steps, runs, tape,
+                                                         feedback_delay=feedback_delay, update_every=update_every):
+        rewards[step] = np.sum(step_rewards)
+        # Óptimo y regret del paso actual: en un bandido no estacionario cambian con el tiempo
+        optimal_selections[step] = np.count_nonzero(chosen_arms == bandit.optimal_arm)
+        regret[step] = np.sum(bandit.regret(chosen_arms))
+        if recorder is not None:
+            recorder.update(step, chosen_arms, step_rewards)
+
+    return rewards, optimal_selections, regret
+
+
+def arm_statistics(bandit: Bandit, algo: Algorithm, run: int = 0) -> dict:
+    """
+    Estadísticas de los brazos de una de las ejecuciones de un algoritmo en modo por lotes.
+
+    :param bandit: Bandido sobre el que se ha ejecutado el algoritmo.
+    :param algo: Instancia del algoritmo tras la simulación.
+    :param run: Ejecución de la que tomar las estadísticas.
+    :return: Diccionario con mean_rewards, selection_counts y optimal_arm, como espera plot_arm_statistics.
+    """
+    return {
+        "mean_rewards": algo.values[run].copy(),
+        "selection_counts": algo.counts[run].copy(),
+        "optimal_arm": bandit.optimal_arm[run] if bandit.batched else bandit.optimal_arm  # Un bandido por ejecución
+    }
+
+
+def run_experiment(bandit: Bandit, algorithms: List[Algorithm], steps: int, runs: int,
+                   seed: Optional[int] = None, tape: Optional[RewardTape] = None,
+                   backend: str = 'numpy', trajectory_dir: Optional[str] = None, feedback_delay: int = 0,
+                   update_every: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]:
+    """
+    Ejecuta el experimento de comparación de algoritmos.
+
+    En lugar de repetir cada ejecución de forma secuencial, todas las ejecuciones avanzan a la vez:
+    el estado de cada algoritmo se guarda en arrays (runs, k) y en cada paso se hace una única
+    selección vectorizada de brazos y una única extracción de recompensas para todas las ejecuciones.
+
+    :param bandit: Bandido sobre el que se ejecutan los algoritmos, o un BanditTestbed con un bandido por ejecución.
+    :param algorithms: Lista de instancias de algoritmos a comparar.
+    :param steps: Número de pasos de cada ejecución.
+    :param runs: Número de ejecuciones independientes. Con un BanditTestbed, su n_bandits.
+    :param seed: Semilla para asegurar la reproducibilidad de los resultados (opcional).
+    :param tape: Cinta de recompensas pre-muestreada y compartida por todos los algoritmos (opcional).
+                 Si se indica, las recompensas se leen de la cinta en lugar de tirar de los brazos.
+    :param backend: 'numpy' (por defecto) o 'numba'; ver simulate.
+    :param trajectory_dir: Directorio donde registrar las trayectorias completas (opcional), en un subdirectorio
+                           por algoritmo que se puede leer después con TrajectoryReader.
+    :param feedback_delay: Pasos de retraso con que llega cada recompensa al algoritmo (0 -> inmediata).
+    :param update_every: Cada cuántos pasos se actualizan los algoritmos con las recompensas llegadas,
+                         en una sola llamada a update_many (1 -> en cada paso). Ver iterate_steps.
+    :return: Tupla (rewards, optimal_selections, regret_accumulated, arm_stats), donde las tres primeras
+             son matrices (len(algorithms), steps) con la recompensa promedio, el porcentaje de selecciones
+             óptimas y el regret acumulado promedio, y arm_stats contiene las estadísticas de los brazos
+             de la primera ejecución de cada algoritmo.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+    assert not bandit.batched or runs == bandit.n_bandits, \
+        f"Con un BanditTestbed cada ejecución juega un bandido: runs debe ser {bandit.n_bandits}, no {runs}."
+    if tape is not None:
+        assert tape.runs == runs and tape.steps >= steps and tape.k == bandit.k, \
+            "La cinta de recompensas no corresponde con el bandido, las ejecuciones o los pasos del experimento."
+        assert bandit.stationary, "Una cinta de recompensas solo representa a un bandido estacionario."
+
+    if seed is not None:
+        np.random.seed(seed)  # Asegurar reproducibilidad de resultados.
+
+    rewards = np.zeros((len(algorithms), steps))  # Suma de recompensas por paso
+    optimal_selections = np.zeros((len(algorithms), steps))  # Número de selecciones óptimas por paso
+    regret = np.zeros((len(algorithms), steps))  # Suma del regret instantáneo por paso
+    arm_stats = []
+
+    for idx, algo in enumerate(algorithms):
+        recorder = None
+        if trajectory_dir is not None:
+            recorder = TrajectoryRecorder(os.path.join(trajectory_dir, f'{idx}_{type(algo).__name__}'), runs, bandit.k)
+        rewards[idx], optimal_selections[idx], regret[idx] = simulate(
+            bandit, algo, steps, runs, tape, backend, recorder, feedback_delay, update_every)
+        if recorder is not None:
+            recorder.close()
+        arm_stats.append(arm_statistics(bandit, algo))
+
+    rewards /= runs
+    optimal_selections /= runs
+    regret_accumulated = np.cumsum(regret, axis=1) / runs
+
+    return rewards, optimal_selections, regret_accumulated, arm_stats
+
+
+def run_experiment_streaming(bandit: Bandit, algorithms: List[Algorithm], steps: int, runs: int,
+                             seed: Optional[int] = None, tape: Optional[RewardTape] = None,
+                             n_checkpoints: int = 256, n_bins: int = 256, feedback_delay: int = 0,
+                             update_every: int = 1) -> List[StreamingMetrics]:
+    """
+    Ejecuta el experimento de comparación de algoritmos acumulando las métricas en línea.
+
+    Igual que run_experiment, pero sin matrices densas (len(algorithms), steps): la memoria queda acotada
+    sea cual sea el horizonte y cada métrica incluye su varianza entre ejecuciones.
+
+    :param bandit: Bandido sobre el que se ejecutan los algoritmos, o un BanditTestbed con un bandido por ejecución.
+    :param algorithms: Lista de instancias de algoritmos a comparar.
+    :param steps: Número de pasos de cada ejecución.
+    :param runs: Número de ejecuciones independientes. Con un BanditTestbed, su n_bandits.
+    :param seed: Semilla para asegurar la reproducibilidad de los resultados (opcional).
+    :param tape: Cinta de recompensas pre-muestreada y compartida por todos los algoritmos (opcional).
+    :param n_checkpoints: Número máximo de puntos de control, espaciados logarítmicamente.
+    :param n_bins: Número de intervalos del histograma de regret de cada punto de control.
+    :param feedback_delay: Pasos de retraso de las recompensas; ver iterate_steps.
+    :param update_every: Número de pasos entre actualizaciones; ver iterate_steps.
+    :return: Lista con las métricas de cada algoritmo.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+    assert not bandit.batched or runs == bandit.n_bandits, \
+        f"Con un BanditTestbed cada ejecución juega un bandido: runs debe ser {bandit.n_bandits}, no {runs}."
+    if tape is not None:
+        assert tape.runs == runs and tape.steps >= steps and tape.k == bandit.k, \
+            "La cinta de recompensas no corresponde con el bandido, las ejecuciones o los pasos del experimento."
+        assert bandit.stationary, "Una cinta de recompensas solo representa a un bandido estacionario."
+
+    if seed is not None:
+        np.random.seed(seed)  # Asegurar reproducibilidad de resultados.
+
+    results = []
+    for algo in algorithms:
+        metrics = StreamingMetrics(bandit, steps, n_checkpoints, n_bins)
+        for step, chosen_arms, step_rewards in iterate_steps(bandit, algo, steps, runs, tape,
+                                                             feedback_delay=feedback_delay, update_every=update_every):
+            metrics.update(step, chosen_arms, step_rewards)
+        results.append(metrics)
+
+    return results
@@ -0,0 +1,144 @@
+"""
+Module: experiments/sweep.py
+Description: Barrido de hiperparámetros con asignación adaptativa de ejecuciones (successive halving).
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import copy
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from algorithms import Algorithm
+from arms import Bandit
+from experiments.runner import iterate_steps
+
+
+def build_configs(k: int, grid: Dict[type, Dict[str, Sequence]]) -> List[Algorithm]:
+    """
+    Instancias de algoritmos para todas las combinaciones de una rejilla de hiperparámetros.
+
+    Ejemplo: build_configs(10, {EpsilonGreedy: {'epsilon': [0, 0.01, 0.1]}, UCB1: {'c': [0.5, 1, 2]}})
+
+    :param k: Número de brazos.
+    :param grid: Diccionario clase -> {hiperparámetro: valores}.
+    :return: Lista de instancias, en el orden de la rejilla.
+    """
+    configs = []
+    for cls, parameters in grid.items():
+        names = list(parameters)
+        for values in itertools.product(*(parameters[name] for name in names)):
+            configs.append(cls(k, **dict(zip(names, values))))
+    return configs
+
+
+def _final_regret(bandit: Bandit, algo: Algorithm, steps: int, runs: int,
+                  seed_sequence: np.random.SeedSequence) -> np.ndarray:
+    """
+    Regret acumulado al final del horizonte de runs ejecuciones en modo por lotes, con un generador propio.
+
+    :return: Array (runs,).
+    """
+    rng = np.random.default_rng(seed_sequence)
+    bandit = copy.copy(bandit)
+    bandit.rng = rng
+    algo.rng = rng
+
+    regret = np.zeros(runs)
+    for _, chosen_arms, _ in iterate_steps(bandit, algo, steps, runs):
+        regret += bandit.regret(chosen_arms)
+    return regret
+
+
+def successive_halving(bandit: Bandit, configs: List[Algorithm], steps: int, initial_runs: int = 8, eta: int = 2,
+                       max_rounds: Optional[int] = None, z: float = 1.96, seed: Optional[int] = None,
+                       n_workers: Optional[int] = None) -> List[dict]:
+    """
+    Ordena configuraciones de algoritmos por su regret acumulado final gastando pocas ejecuciones en las malas.
+
+    En cada ronda todas las configuraciones vivas reciben un nuevo lote de ejecuciones (initial_runs en la primera,
+    multiplicado por eta en cada ronda) y se comparan con todas las ejecuciones acumuladas:
+      - Carrera: se descarta cualquier configuración cuyo intervalo de confianza del regret medio queda por
+        encima del de la mejor, porque está dominada.
+      - Successive halving: de las restantes sobreviven como mucho ceil(n / eta), las de menor regret medio.
+    El barrido termina cuando queda una configuración o tras max_rounds rondas.
+
+    Cada lote se simula en modo por lotes con su propio generador (árbol SeedSequence(seed) -> configuración
+    -> ronda), repartiendo las configuraciones entre procesos como run_experiment_parallel.
+
+    :param bandit: Bandido sobre el que se evalúan las configuraciones.
+    :param configs: Instancias de los algoritmos a comparar (ver build_configs). No se modifican.
+    :param steps: Número de pasos de cada ejecución.
+    :param initial_runs: Ejecuciones de cada configuración en la primera ronda.
+    :param eta: Factor de reducción de configuraciones y de crecimiento de ejecuciones por ronda.
+    :param max_rounds: Número máximo de rondas (opcional).
+    :param z: Cuantil de la normal de los intervalos de confianza de la carrera.
+    :param seed: Semilla raíz del árbol de semillas (opcional).
+    :param n_workers: Número de procesos. None usa tantos como núcleos y 1 ejecuta todo en el proceso actual.
+    :return: Lista de diccionarios, de mejor a peor, con algorithm, runs, pulls (ejecuciones * pasos simulados),
+             mean_regret, std_regret y eliminated_round (None si sobrevive hasta el final). Las configuraciones
+             descartadas más tarde van antes y, dentro de una misma ronda, se ordenan por regret medio.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert initial_runs > 1, "Se necesitan al menos 2 ejecuciones iniciales para estimar la varianza."
+    assert eta >= 2, "El factor eta debe ser al menos 2."
+
+    entropy = np.random.SeedSequence(seed).entropy
+    regrets = [np.zeros(0) for _ in configs]
+    eliminated_round: List[Optional[int]] = [None] * len(configs)
+    alive = list(range(len(configs)))
+
+    executor = None if n_workers == 1 else ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        round_, runs = 0, initial_runs
+        while alive:
+            tasks = [(bandit, copy.deepcopy(configs[idx]), steps, runs,
+                      np.random.SeedSequence(entropy, spawn_key=(idx, round_))) for idx in alive]
+            results = map(_final_regret, *zip(*tasks)) if executor is None else executor.map(_final_regret, *zip(*tasks))
+            for idx, regret in zip(alive, results):
+                regrets[idx] = np.concatenate([regrets[idx], regret])
+
+            if len(alive) == 1 or (max_rounds is not None and round_ + 1 >= max_rounds):
+                break
+
+            mean = {idx: np.mean(regrets[idx]) for idx in alive}
+            half_width = {idx: z * np.std(regrets[idx], ddof=1) / math.sqrt(len(regrets[idx])) for idx in alive}
+            best_upper = min(mean[idx] + half_width[idx] for idx in alive)
+
+            survivors = [idx for idx in alive if mean[idx] - half_width[idx] <= best_upper]
+            survivors = sorted(survivors, key=lambda idx: mean[idx])[:math.ceil(len(alive) / eta)]
+            for idx in alive:
+                if idx not in survivors:
+                    eliminated_round[idx] = round_
+
+            alive = survivors
+            round_ += 1
+            runs *= eta
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    ranking = []
+    for idx, algo in enumerate(configs):
+        ranking.append({
+            'algorithm': algo,
+            'runs': len(regrets[idx]),
+            'pulls': len(regrets[idx]) * steps,
+            'mean_regret': float(np.mean(regrets[idx])),
+            'std_regret': float(np.std(regrets[idx], ddof=1)),
+            'eliminated_round': eliminated_round[idx],
+        })
+
+    last_round = lambda entry: math.inf if entry['eliminated_round'] is None else entry['eliminated_round']
+    return sorted(ranking, key=lambda entry: (-last_round(entry), entry['mean_regret']))
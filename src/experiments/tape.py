@@ -0,0 +1,100 @@
+"""
+Module: experiments/tape.py
+Description: Cintas de recompensas pre-muestreadas para comparar algoritmos con números aleatorios comunes.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from arms import Bandit
+
+
+class RewardTape:
+    """
+    Tensor (runs, steps, k) con la recompensa que daría cada brazo en cada paso de cada ejecución.
+
+    Se muestrea una única vez por bandido y todos los algoritmos leen de él por índice, de modo que
+    la comparación entre algoritmos es pareada: dos algoritmos que tiran el mismo brazo en el mismo
+    paso de la misma ejecución obtienen la misma recompensa.
+    """
+
+    # Tamaño máximo (en bytes) de cada bloque muestreado al generar la cinta
+    BLOCK_BYTES = 64 * 2 ** 20
+
+    def __init__(self, data: np.ndarray):
+        """
+        Inicializa la cinta a partir de un tensor ya muestreado.
+
+        :param data: Array o memmap de forma (runs, steps, k).
+        """
+        assert data.ndim == 3, "La cinta debe tener forma (runs, steps, k)."
+
+        self.data = data
+        self.runs, self.steps, self.k = data.shape
+        self._rows = np.arange(self.runs)
+
+    @classmethod
+    def sample(cls, bandit: Bandit, runs: int, steps: int, dtype=np.float32, path: Optional[str] = None):
+        """
+        Muestrea la cinta de recompensas de un bandido.
+
+        :param bandit: Bandido del que se extraen las recompensas.
+        :param runs: Número de ejecuciones.
+        :param steps: Número de pasos de cada ejecución.
+        :param dtype: Tipo de dato con el que se almacena la cinta (float32 por defecto).
+        :param path: Fichero .npy donde guardar la cinta como memmap, para cintas que no caben en memoria (opcional).
+        :return: Cinta de recompensas.
+        """
+        assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+        assert steps > 0, "El número de pasos debe ser mayor que 0."
+        assert bandit.stationary, "Una cinta de recompensas solo puede muestrear un bandido estacionario."
+        assert not bandit.batched, "Una cinta de recompensas comparte un único bandido entre todas las ejecuciones."
+
+        shape = (runs, steps, bandit.k)
+        if path is None:
+            data = np.empty(shape, dtype=dtype)
+        else:
+            data = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+        # Se muestrea por bloques de ejecuciones para acotar la memoria temporal en float64
+        run_bytes = steps * bandit.k * np.dtype(float).itemsize
+        block_runs = max(1, cls.BLOCK_BYTES // run_bytes)
+        arms = np.arange(bandit.k)
+        for start in range(0, runs, block_runs):
+            stop = min(start + block_runs, runs)
+            data[start:stop] = bandit.pull_arms(np.broadcast_to(arms, (stop - start, steps, bandit.k)))
+
+        if path is not None:
+            data.flush()
+
+        return cls(data)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Abre una cinta guardada en disco como memmap de solo lectura.
+
+        :param path: Fichero .npy generado por RewardTape.sample.
+        :return: Cinta de recompensas.
+        """
+        return cls(np.load(path, mmap_mode='r'))
+
+    def rewards(self, step: int, arms: np.ndarray) -> np.ndarray:
+        """
+        Devuelve la recompensa del brazo elegido en cada ejecución para un paso dado.
+
+        :param step: Paso de tiempo.
+        :param arms: Array (runs,) con el brazo elegido en cada ejecución.
+        :return: Array (runs,) de recompensas en float64.
+        """
+        return self.data[self._rows, step, arms].astype(float)
@@ -0,0 +1,210 @@
+"""
+Module: experiments/trajectory.py
+Description: Registro en disco, por columnas y por bloques, de las trayectorias completas de un experimento.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import json
+import os
+from typing import Iterator, Tuple
+
+import numpy as np
+
+
+class TrajectoryRecorder:
+    """
+    Registra el brazo elegido y la recompensa de cada paso de todas las ejecuciones de un algoritmo.
+
+    Las trayectorias se guardan por columnas (arms y rewards) en bloques de chunk_steps pasos, cada uno un array
+    (pasos del bloque, runs): el brazo como uint16 (o uint32 si k > 65535) y la recompensa como float32. El paso
+    no se guarda como columna: todas las ejecuciones avanzan a la vez, así que queda implícito en el bloque y la
+    fila. Sin compresión cada columna es un .npy que el lector abre con mmap sin copiarlo; con compress=True cada
+    bloque es un .npz comprimido, que ocupa menos pero se descomprime al leerlo.
+    La memoria usada al registrar es la de un bloque, sea cual sea el horizonte.
+    """
+
+    def __init__(self, directory: str, runs: int, k: int, chunk_steps: int = 1024, compress: bool = False):
+        """
+        :param directory: Directorio donde guardar los bloques. Se crea si no existe.
+        :param runs: Número de ejecuciones.
+        :param k: Número de brazos.
+        :param chunk_steps: Número de pasos de cada bloque.
+        :param compress: Si es True, los bloques se guardan comprimidos.
+        """
+        assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+        assert chunk_steps > 0, "El número de pasos por bloque debe ser mayor que 0."
+
+        self.directory = directory
+        self.runs = runs
+        self.k = k
+        self.chunk_steps = chunk_steps
+        self.compress = compress
+        self.arm_dtype = np.uint16 if k <= np.iinfo(np.uint16).max + 1 else np.uint32
+        os.makedirs(directory, exist_ok=True)
+
+        self._arms = np.empty((chunk_steps, runs), dtype=self.arm_dtype)
+        self._rewards = np.empty((chunk_steps, runs), dtype=np.float32)
+        self._filled = 0
+        self._chunks = []  # Pasos [start, stop) de cada bloque escrito
+        self.steps = 0
+
+    def update(self, step: int, chosen_arms: np.ndarray, rewards: np.ndarray):
+        """
+        Registra un paso de todas las ejecuciones. Los pasos deben llegar en orden, empezando por 0.
+
+        :param step: Paso de tiempo.
+        :param chosen_arms: Array (runs,) con el brazo elegido en cada ejecución.
+        :param rewards: Array (runs,) con la recompensa obtenida en cada ejecución.
+        """
+        assert step == self.steps, "Los pasos deben registrarse en orden."
+
+        self._arms[self._filled] = chosen_arms
+        self._rewards[self._filled] = rewards
+        self._filled += 1
+        self.steps += 1
+        if self._filled == self.chunk_steps:
+            self._flush()
+
+    def close(self):
+        """
+        Escribe el bloque pendiente y el manifiesto. Solo a partir de aquí se puede leer la trayectoria.
+        """
+        if self._filled:
+            self._flush()
+
+        manifest = {'runs': self.runs, 'k': self.k, 'steps': self.steps, 'arm_dtype': np.dtype(self.arm_dtype).name,
+                    'compress': self.compress, 'chunks': self._chunks}
+        with open(os.path.join(self.directory, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _flush(self):
+        index = len(self._chunks)
+        arms, rewards = self._arms[:self._filled], self._rewards[:self._filled]
+        if self.compress:
+            np.savez_compressed(os.path.join(self.directory, f'chunk_{index:05d}.npz'), arms=arms, rewards=rewards)
+        else:
+            np.save(os.path.join(self.directory, f'arms_{index:05d}.npy'), arms)
+            np.save(os.path.join(self.directory, f'rewards_{index:05d}.npy'), rewards)
+
+        self._chunks.append([self.steps - self._filled, self.steps])
+        self._filled = 0
+
+
+class TrajectoryReader:
+    """
+    Lectura de una trayectoria guardada con TrajectoryRecorder, sin cargarla entera en memoria.
+
+    Los bloques sin comprimir se abren con mmap: una selección dentro de un único bloque es una vista sin copia,
+    y solo las que cruzan varios bloques se copian al concatenarlas. Los análisis (regret por ejecución, tasa de
+    cambio de brazo) recorren los bloques de uno en uno.
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: Directorio de la trayectoria.
+        """
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            manifest = json.load(f)
+
+        self.directory = directory
+        self.runs = manifest['runs']
+        self.k = manifest['k']
+        self.steps = manifest['steps']
+        self.compress = manifest['compress']
+        self.chunks = [tuple(chunk) for chunk in manifest['chunks']]
+
+    def _chunk(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.compress:
+            with np.load(os.path.join(self.directory, f'chunk_{index:05d}.npz')) as data:
+                return data['arms'], data['rewards']
+
+        return (np.load(os.path.join(self.directory, f'arms_{index:05d}.npy'), mmap_mode='r'),
+                np.load(os.path.join(self.directory, f'rewards_{index:05d}.npy'), mmap_mode='r'))
+
+    def _select(self, column: int, steps: slice, runs) -> np.ndarray:
+        start, stop, stride = steps.indices(self.steps)
+        assert stride == 1, "Solo se admiten rangos de pasos contiguos."
+
+        parts = []
+        for index, (chunk_start, chunk_stop) in enumerate(self.chunks):
+            if chunk_stop <= start or chunk_start >= stop:
+                continue
+            data = self._chunk(index)[column]
+            parts.append(data[max(start, chunk_start) - chunk_start:min(stop, chunk_stop) - chunk_start, runs])
+
+        if len(parts) == 1:
+            return parts[0]  # Vista del bloque, sin copia
+        return np.concatenate(parts) if parts else self._chunk(0)[column][:0, runs]
+
+    def arms(self, steps: slice = slice(None), runs=slice(None)) -> np.ndarray:
+        """
+        Brazos elegidos en un rango de pasos y un subconjunto de ejecuciones.
+
+        :param steps: Rango contiguo de pasos.
+        :param runs: Índice, rango o lista de ejecuciones.
+        :return: Array (pasos, ejecuciones).
+        """
+        return self._select(0, steps, runs)
+
+    def rewards(self, steps: slice = slice(None), runs=slice(None)) -> np.ndarray:
+        """
+        Recompensas obtenidas en un rango de pasos y un subconjunto de ejecuciones.
+
+        :param steps: Rango contiguo de pasos.
+        :param runs: Índice, rango o lista de ejecuciones.
+        :return: Array (pasos, ejecuciones).
+        """
+        return self._select(1, steps, runs)
+
+    def iter_chunks(self) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """
+        Recorre la trayectoria bloque a bloque.
+
+        :return: Generador de tuplas (start, arms, rewards), con arrays (pasos del bloque, runs).
+        """
+        for index, (start, _) in enumerate(self.chunks):
+            arms, rewards = self._chunk(index)
+            yield start, arms, rewards
+
+    def regret(self, expected_rewards: np.ndarray) -> np.ndarray:
+        """
+        Regret acumulado al final del horizonte en cada ejecución, para estudiar su distribución.
+
+        :param expected_rewards: Array (k,) con la recompensa esperada de cada brazo (bandit.expected_rewards).
+        :return: Array (runs,).
+        """
+        expected_rewards = np.asarray(expected_rewards, dtype=float)
+        gaps = np.max(expected_rewards) - expected_rewards
+        regret = np.zeros(self.runs)
+        for _, arms, _ in self.iter_chunks():
+            regret += np.sum(gaps[arms], axis=0)
+        return regret
+
+    def switch_rate(self) -> np.ndarray:
+        """
+        Proporción de pasos en los que cada ejecución cambia de brazo respecto al paso anterior.
+
+        :return: Array (runs,).
+        """
+        switches = np.zeros(self.runs)
+        previous = None
+        for _, arms, _ in self.iter_chunks():
+            if previous is not None:
+                switches += arms[0] != previous
+            switches += np.sum(arms[1:] != arms[:-1], axis=0)
+            previous = arms[-1]
+        return switches / max(self.steps - 1, 1)
@@ -0,0 +1,98 @@
+"""
+Module: plotting/downsampling.py
+Description: Reducción del número de puntos de una serie antes de dibujarla, para horizontes largos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+METHODS = ('minmax', 'lttb')
+
+
+def min_max_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Índices del mínimo y el máximo de cada uno de n_buckets tramos consecutivos de igual tamaño.
+
+    Con un tramo por columna de píxeles, la línea resultante ocupa exactamente los mismos píxeles que la original,
+    así que los picos y el ruido se conservan. Los tramos se obtienen con un reshape, sin bucles.
+
+    :param y: Serie (n,).
+    :param n_buckets: Número de tramos.
+    :return: Array creciente de índices, que incluye siempre el primero y el último.
+    """
+    n = len(y)
+    size = -(-n // n_buckets)  # Tamaño de cada tramo, redondeando hacia arriba
+    padded = np.concatenate([y, np.full(size * n_buckets - n, y[-1])]).reshape(n_buckets, size)
+
+    base = np.arange(n_buckets) * size
+    indices = np.concatenate([[0], base + np.argmin(padded, axis=1), base + np.argmax(padded, axis=1), [n - 1]])
+    return np.unique(np.minimum(indices, n - 1))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Índices elegidos por Largest-Triangle-Three-Buckets.
+
+    Se conservan el primer y el último punto y, de cada uno de los n_out - 2 tramos intermedios, el punto que
+    forma el triángulo de mayor área con el punto elegido en el tramo anterior y la media del tramo siguiente.
+    El bucle recorre los tramos (n_out iteraciones); el área de todos los puntos de un tramo se calcula a la vez.
+
+    :param x: Abscisas (n,), crecientes.
+    :param y: Serie (n,).
+    :param n_out: Número de puntos de la salida.
+    :return: Array creciente de n_out índices.
+    """
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)  # Límites de los tramos intermedios
+
+    # Media de cada tramo; la del tramo siguiente al último intermedio es el último punto
+    counts = np.maximum(np.diff(edges), 1)
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        a = selected[i]
+        area = np.abs((x[a] - mean_x[i + 1]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (mean_y[i + 1] - y[a]))
+        selected[i + 1] = start + int(np.argmax(area))
+
+    return selected
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int = 2000,
+               method: str = 'minmax') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce una serie a como mucho max_points puntos conservando su forma visual.
+
+    :param x: Abscisas (n,), crecientes.
+    :param y: Serie (n,).
+    :param max_points: Número máximo de puntos de la salida. Unos 2 por columna de píxeles es suficiente.
+    :param method: 'minmax' (mínimo y máximo de cada tramo, conserva la envolvente del ruido) o 'lttb'
+                   (Largest-Triangle-Three-Buckets, conserva la forma con menos puntos).
+    :return: Tupla (x, y) reducida. Si la serie ya es corta se devuelve tal cual.
+    """
+    assert method in METHODS, f"El método debe ser uno de {METHODS}."
+    assert max_points >= 4, "Se necesitan al menos 4 puntos."
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= max_points:
+        return x, y
+
+    if method == 'minmax':
+        indices = min_max_indices(y, (max_points - 2) // 2)
+    else:
+        indices = lttb_indices(x.astype(float), y.astype(float), max_points)
+    return x[indices], y[indices]
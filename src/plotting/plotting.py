@@ -12,13 +12,27 @@ with the additional restriction that it may not be used for commercial purposes.
 For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
-from typing import List
+import math
+import os
+from typing import List, Optional, Sequence, Union
 
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
-from algorithms import Algorithm, EpsilonGreedy, UCB1, UCB2, Softmax, GradientBandit
+from algorithms import Algorithm, EpsilonGreedy, UCB1, UCB2, Softmax, GradientBandit, KLUCB, UCBV, \
+    ThompsonBernoulli, ThompsonBinomial, ThompsonNormal, LinUCB, LinearThompson
+from experiments.metrics import StreamingMetrics
+from plotting.downsampling import downsample
+
+# Las funciones de líneas aceptan la matriz densa (n_algoritmos, steps) que devuelve run_experiment o una lista
+# de StreamingMetrics, una por algoritmo, que se dibuja en sus puntos de control con su intervalo de confianza.
+# Las series largas se reducen a max_points puntos antes de dibujarlas (ver plotting/downsampling.py).
+# Con path, la figura se guarda en un fichero sin pasar por pyplot, así que funciona sin pantalla.
+Series = Union[np.ndarray, Sequence[StreamingMetrics]]
+
+MAX_ANNOTATED_ARMS = 20  # En modo compacto, número máximo de brazos con el número de selecciones escrito
 
 
 def get_algorithm_label(algo: Algorithm) -> str:
@@ -42,52 +56,126 @@ def get_algorithm_label(algo: Algorithm) -> str:
         label += f" (tau={algo.tau})"
     elif isinstance(algo, GradientBandit):
         label += f" (alpha={algo.alpha})"
-    else:
+    elif isinstance(algo, KLUCB):
+        label += f" ({algo.family}, c={algo.c})"
+    elif isinstance(algo, UCBV):
+        label += f" (zeta={algo.zeta}, c={algo.c})"
+    elif isinstance(algo, ThompsonBinomial):
+        label += f" (n={algo.n}, Beta({algo.alpha_prior}, {algo.beta_prior}))"
+    elif isinstance(algo, ThompsonBernoulli):
+        label += f" (Beta({algo.alpha_prior}, {algo.beta_prior}))"
+    elif isinstance(algo, ThompsonNormal):
+        label += f" (mu={algo.mu_prior}, kappa={algo.kappa_prior})"
+    elif isinstance(algo, LinUCB):
+        label += f" (alpha={algo.alpha})"
+    elif isinstance(algo, LinearThompson):
+        label += f" (v={algo.v})"
+    elif not isinstance(algo, Algorithm):
         raise ValueError(f"El algoritmo debe ser de la clase Algorithm o una subclase. Recibido: {type(algo).__name__}")
 
+    if getattr(algo, 'estimator', None) is not None:
+        label += f" [{type(algo.estimator).__name__}]"
+
     return label
 
 
-def plot_average_rewards(steps: int, rewards: np.ndarray, algorithms: List[Algorithm]):
+def _new_figure(figsize, path: Optional[str], nrows: int = 1, ncols: int = 1, **kwargs):
+    """
+    Crea una figura con una rejilla de ejes. Si se va a guardar en un fichero, la figura no se registra en
+    pyplot: no abre ventanas ni necesita un backend interactivo, y se libera al salir de la función.
+
+    :return: Tupla (figura, array (nrows, ncols) de ejes).
+    """
+    fig = Figure(figsize=figsize) if path is not None else plt.figure(figsize=figsize)
+    return fig, fig.subplots(nrows, ncols, squeeze=False, **kwargs)
+
+
+def _finish_figure(fig, path: Optional[str], dpi: int = 100):
+    """
+    Muestra la figura o, si se indica path, la guarda en ese fichero (el formato sale de la extensión).
+    """
+    fig.tight_layout()
+    if path is None:
+        plt.show()
+    else:
+        fig.savefig(path, dpi=dpi)
+
+
+def _plot_lines(ax, steps: int, series: Series, attribute: str, algorithms: List[Algorithm], max_points: int,
+                method: str):
+    """
+    Dibuja una línea por algoritmo, reducida a max_points puntos.
+
+    :param attribute: Métrica de StreamingMetrics que se dibuja (rewards, optimal_selections o regret).
+    """
+    for idx, algo in enumerate(algorithms):
+        label = get_algorithm_label(algo)
+
+        if isinstance(series[idx], StreamingMetrics):
+            # Los puntos de control ya son pocos: se dibujan todos, con el intervalo de confianza entre ejecuciones
+            checkpoints, mean, lower, upper = series[idx].band(attribute)
+            line, = ax.plot(checkpoints, mean, label=label, linewidth=2)
+            ax.fill_between(checkpoints, lower, upper, color=line.get_color(), alpha=0.2)
+        else:
+            x, y = downsample(np.arange(steps), series[idx][:steps], max_points, method)
+            ax.plot(x, y, label=label, linewidth=2)
+
+
+def plot_average_rewards(steps: int, rewards: Series, algorithms: List[Algorithm], max_points: int = 2000,
+                         method: str = 'minmax', path: Optional[str] = None):
     """
     Genera la gráfica de Recompensa Promedio vs Pasos de Tiempo.
 
     :param steps: Número de pasos de tiempo.
-    :param rewards: Matriz de recompensas promedio.
+    :param rewards: Matriz de recompensas promedio o lista de StreamingMetrics.
     :param algorithms: Lista de instancias de algoritmos comparados.
+    :param max_points: Número máximo de puntos de cada línea.
+    :param method: Método de reducción de puntos, 'minmax' o 'lttb'.
+    :param path: Fichero donde guardar la gráfica (opcional). Si es None, se muestra.
     """
     sns.set_theme(style="whitegrid", palette="muted", font_scale=1.2)
 
-    plt.figure(figsize=(14, 7))
-    for idx, algo in enumerate(algorithms):
-        label = get_algorithm_label(algo)
-        plt.plot(range(steps), rewards[idx], label=label, linewidth=2)
+    fig, axes = _new_figure((14, 7), path)
+    ax = axes[0, 0]
+    _plot_lines(ax, steps, rewards, 'rewards', algorithms, max_points, method)
 
-    plt.xlabel('Pasos de Tiempo', fontsize=14)
-    plt.ylabel('Recompensa Promedio', fontsize=14)
-    plt.title('Recompensa Promedio vs Pasos de Tiempo', fontsize=16)
-    plt.legend(title='Algoritmos')
-    plt.tight_layout()
-    plt.show()
+    ax.set_xlabel('Pasos de Tiempo', fontsize=14)
+    ax.set_ylabel('Recompensa Promedio', fontsize=14)
+    ax.set_title('Recompensa Promedio vs Pasos de Tiempo', fontsize=16)
+    ax.legend(title='Algoritmos')
+    _finish_figure(fig, path)
 
 
-def plot_optimal_selections(steps: int, optimal_selections: np.ndarray, algorithms: List[Algorithm]):
+def plot_optimal_selections(steps: int, optimal_selections: Series, algorithms: List[Algorithm],
+                            max_points: int = 2000, method: str = 'minmax', path: Optional[str] = None):
     sns.set_theme(style="whitegrid", palette="muted", font_scale=1.2)
 
-    plt.figure(figsize=(14, 7))
-    for idx, algo in enumerate(algorithms):
-        label = get_algorithm_label(algo)
-        plt.plot(range(steps), optimal_selections[idx], label=label, linewidth=2)
+    fig, axes = _new_figure((14, 7), path)
+    ax = axes[0, 0]
+    _plot_lines(ax, steps, optimal_selections, 'optimal_selections', algorithms, max_points, method)
+
+    ax.set_xlabel('Pasos de Tiempo')
+    ax.set_ylabel('Porcentaje de Selecciones Óptimas')
+    ax.set_title('Porcentaje de Selección del Brazo Óptimo vs Pasos de Tiempo')
+    ax.legend(title='Algoritmos')
+    _finish_figure(fig, path)
+
+
+def _plot_arm_bars(ax, stats: dict, annotate: bool, fontsize=None):
+    arms = np.arange(len(stats["mean_rewards"]))
+    bars = ax.bar(arms, stats["mean_rewards"], color='lightblue', alpha=0.7)
+
+    if annotate:
+        for i, (bar, count) in enumerate(zip(bars, stats["selection_counts"])):
+            ax.text(bar.get_x() + bar.get_width() / 2 - 0.15, bar.get_height(), f'{count}', ha='center', va='bottom',
+                    fontsize=fontsize)
 
-    plt.xlabel('Pasos de Tiempo')
-    plt.ylabel('Porcentaje de Selecciones Óptimas')
-    plt.title('Porcentaje de Selección del Brazo Óptimo vs Pasos de Tiempo')
-    plt.legend(title='Algoritmos')
-    plt.tight_layout()
-    plt.show()
+    # Marcar el brazo óptimo
+    ax.bar(stats["optimal_arm"], stats["mean_rewards"][stats["optimal_arm"]], color='orange', alpha=0.9)
 
 
-def plot_arm_statistics(arm_stats: List[dict], algorithms: List[Algorithm]):
+def plot_arm_statistics(arm_stats: List[dict], algorithms: List[Algorithm], compact: bool = False,
+                        path: Optional[str] = None):
     """
     arm_stats: lista de diccionarios donde cada uno tiene por ejemplo:
     arm_stats[i] = {
@@ -95,40 +183,55 @@ def plot_arm_statistics(arm_stats: List[dict], algorithms: List[Algorithm]):
         "selection_counts": np.array con el número de selecciones por brazo,
         "optimal_arm": índice del brazo óptimo
     }
+
+    Por defecto se genera una figura por algoritmo. Con compact=True se genera una sola figura con una rejilla
+    de gráficas pequeñas que comparten los ejes; el número de selecciones solo se escribe con pocos brazos.
+    Con path, la figura se guarda en ese fichero (sin compact, una por algoritmo, con el índice antes de la extensión).
     """
     sns.set_theme(style="whitegrid", palette="muted", font_scale=1.2)
 
-    for idx, algo in enumerate(algorithms):
-        stats = arm_stats[idx]
-        arms = np.arange(len(stats["mean_rewards"]))
-
-        plt.figure(figsize=(12, 6))
-        bars = plt.bar(arms, stats["mean_rewards"], color='lightblue', alpha=0.7)
-        plt.xlabel('Brazo')
-        plt.ylabel('Promedio de Ganancias')
-        plt.title(f'Estadísticas de los Brazos - {get_algorithm_label(algo)}')
+    if compact:
+        ncols = math.ceil(math.sqrt(len(algorithms)))
+        nrows = math.ceil(len(algorithms) / ncols)
+        fig, axes = _new_figure((4 * ncols, 3 * nrows), path, nrows, ncols, sharex=True, sharey=True)
 
-        for i, (bar, count) in enumerate(zip(bars, stats["selection_counts"])):
-            plt.text(bar.get_x() + bar.get_width() / 2 - 0.15, bar.get_height(), f'{count}', ha='center', va='bottom')
-
-        # Marcar el brazo óptimo
-        plt.bar(stats["optimal_arm"], stats["mean_rewards"][stats["optimal_arm"]], color='orange', alpha=0.9)
+        for idx, algo in enumerate(algorithms):
+            ax = axes.flat[idx]
+            _plot_arm_bars(ax, arm_stats[idx], len(arm_stats[idx]["mean_rewards"]) <= MAX_ANNOTATED_ARMS, fontsize=8)
+            ax.set_title(get_algorithm_label(algo), fontsize=10)
+        for ax in axes.flat[len(algorithms):]:
+            ax.set_visible(False)
 
-        plt.tight_layout()
-        plt.show()
+        fig.supxlabel('Brazo')
+        fig.supylabel('Promedio de Ganancias')
+        _finish_figure(fig, path)
+        return
 
-
-def plot_regret(steps: int, regret_accumulated: np.ndarray, algorithms: List[Algorithm]):
+    for idx, algo in enumerate(algorithms):
+        fig, axes = _new_figure((12, 6), path)
+        ax = axes[0, 0]
+        _plot_arm_bars(ax, arm_stats[idx], annotate=True)
+        ax.set_xlabel('Brazo')
+        ax.set_ylabel('Promedio de Ganancias')
+        ax.set_title(f'Estadísticas de los Brazos - {get_algorithm_label(algo)}')
+
+        if path is None:
+            _finish_figure(fig, None)
+        else:
+            root, extension = os.path.splitext(path)
+            _finish_figure(fig, f'{root}_{idx}{extension}')
+
+
+def plot_regret(steps: int, regret_accumulated: Series, algorithms: List[Algorithm], max_points: int = 2000,
+                method: str = 'minmax', path: Optional[str] = None):
     sns.set_theme(style="whitegrid", palette="muted", font_scale=1.2)
 
-    plt.figure(figsize=(14, 7))
-    for idx, algo in enumerate(algorithms):
-        label = get_algorithm_label(algo)
-        plt.plot(range(steps), regret_accumulated[idx], label=label, linewidth=2)
-
-    plt.xlabel('Pasos de Tiempo')
-    plt.ylabel('Rechazo Acumulado')
-    plt.title('Evolución del Rechazo (Regret) Acumulado vs Pasos de Tiempo')
-    plt.legend(title='Algoritmos')
-    plt.tight_layout()
-    plt.show()
+    fig, axes = _new_figure((14, 7), path)
+    ax = axes[0, 0]
+    _plot_lines(ax, steps, regret_accumulated, 'regret', algorithms, max_points, method)
+
+    ax.set_xlabel('Pasos de Tiempo')
+    ax.set_ylabel('Rechazo Acumulado')
+    ax.set_title('Evolución del Rechazo (Regret) Acumulado vs Pasos de Tiempo')
+    ax.legend(title='Algoritmos')
+    _finish_figure(fig, path)
@@ -0,0 +1,104 @@
+"""
+Module: randomness/generator.py
+Description: Generadores aleatorios inyectables para brazos, bandidos y algoritmos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+from typing import Union
+
+import numpy as np
+
+
+def get_rng(rng=None):
+    """
+    Devuelve la fuente de números aleatorios a usar.
+
+    :param rng: Generador inyectado (np.random.Generator, BufferedGenerator...) o None.
+    :return: El propio rng o, si es None, el módulo np.random (estado global), que ofrece los mismos
+             métodos random, choice, normal, binomial, uniform... y respeta np.random.seed.
+    """
+    return np.random if rng is None else rng
+
+
+class BufferedGenerator:
+    """
+    Envoltorio de np.random.Generator que pre-extrae bloques de uniformes y normales estándar.
+
+    Las extracciones escalares de random(), standard_normal() y normal() se sirven desde el bloque,
+    de modo que el coste por paso es indexar un array en lugar de una llamada completa al generador.
+    El resto de métodos (y las extracciones con size) se delegan en el generador subyacente.
+    """
+
+    def __init__(self, seed: Union[None, int, np.random.SeedSequence, np.random.Generator] = None,
+                 block_size: int = 4096):
+        """
+        Inicializa el generador.
+
+        :param seed: Semilla, SeedSequence o Generator ya construido (opcional).
+        :param block_size: Número de valores que se extraen de cada vez.
+        """
+        assert block_size > 0, "El tamaño de bloque debe ser mayor que 0."
+
+        self.generator: np.random.Generator = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        self.block_size = block_size
+        # Los bloques se guardan como iteradores sobre listas de floats de Python, que es lo más barato de consumir
+        self._uniforms = iter(())
+        self._normals = iter(())
+
+    def random(self, size=None):
+        """
+        Uniforme en [0, 1). Sin size, se sirve desde el bloque pre-extraído.
+        """
+        if size is not None:
+            return self.generator.random(size)
+
+        try:
+            return next(self._uniforms)
+        except StopIteration:
+            self._uniforms = iter(self.generator.random(self.block_size).tolist())
+            return next(self._uniforms)
+
+    def standard_normal(self, size=None):
+        """
+        Normal estándar. Sin size, se sirve desde el bloque pre-extraído.
+        """
+        if size is not None:
+            return self.generator.standard_normal(size)
+
+        try:
+            return next(self._normals)
+        except StopIteration:
+            self._normals = iter(self.generator.standard_normal(self.block_size).tolist())
+            return next(self._normals)
+
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        """
+        Normal N(loc, scale^2). Con parámetros escalares y sin size, se sirve desde el bloque pre-extraído.
+        """
+        if size is None and isinstance(loc, (int, float)) and isinstance(scale, (int, float)):
+            return loc + scale * self.standard_normal()
+
+        return self.generator.normal(loc, scale, size)
+
+    def choice(self, a, size=None, replace=True, p=None):
+        """
+        Muestra aleatoria de a. La elección uniforme de un único índice en range(a) se sirve desde el bloque de uniformes.
+        """
+        if size is None and p is None and isinstance(a, int):
+            return int(self.random() * a)
+
+        return self.generator.choice(a, size, replace, p)
+
+    def __getattr__(self, name: str):
+        # Solo se llama para atributos que no existen en la instancia: se delegan en el generador
+        if name.startswith('_') or name == 'generator':
+            raise AttributeError(name)
+        return getattr(self.generator, name)
@@ -0,0 +1,166 @@
+"""
+Module: serving/http_server.py
+Description: Servidor HTTP/JSON mínimo con asyncio que expone un PolicyServer, como sustituto local de un servicio real.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import asyncio
+import json
+from typing import Optional, Tuple
+
+import numpy as np
+
+from serving.server import PolicyServer
+
+
+class HttpPolicyServer:
+    """
+    Expone un PolicyServer por HTTP/1.1 con conexiones persistentes, usando solo la biblioteca estándar:
+
+    - POST /decide, cuerpo opcional {"context": [...]} -> {"decision_id": ..., "arm": ...}
+    - POST /reward, cuerpo {"decision_id": ..., "reward": ...} -> {"accepted": true | false}
+    - GET /stats -> contadores de PolicyServer.stats
+
+    Las peticiones se atienden directamente en el bucle de eventos: decide y report_reward tardan microsegundos,
+    menos que el salto a un ThreadPoolExecutor, y las actualizaciones del modelo siguen en el hilo escritor
+    del PolicyServer. No pretende ser un servidor HTTP completo (sin TLS, chunked ni pipelining).
+    """
+
+    def __init__(self, server: PolicyServer, host: str = '127.0.0.1', port: int = 8000):
+        """
+        :param server: Servidor de políticas a exponer.
+        :param host: Dirección en la que escuchar.
+        :param port: Puerto en el que escuchar. Con 0 se elige uno libre (ver start).
+        """
+        self.server = server
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections = {}  # Conexiones abiertas (escritor -> tarea que la atiende), para cerrarlas en close
+
+    async def start(self) -> int:
+        """
+        Empieza a escuchar.
+
+        :return: Puerto en el que escucha.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        """
+        Atiende peticiones hasta que se cancele la tarea.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Deja de escuchar y cierra las conexiones abiertas. No cierra el PolicyServer.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*self._connections.values(), return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, '400 Bad Request', {'error': 'Cabeceras demasiado largas.'})
+                    break
+
+                try:
+                    method, path, headers, length = self._parse_head(head)
+                except ValueError as error:
+                    # Sin una cabecera válida no se sabe dónde empieza la siguiente petición: se responde y se cierra
+                    await self._respond(writer, '400 Bad Request', {'error': f'Petición mal formada: {error}'})
+                    break
+                try:
+                    body = await reader.readexactly(length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                await self._respond(writer, *self._route(method, path, body))
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, dict, int]:
+        """
+        Interpreta la línea de petición y las cabeceras.
+
+        :return: Tupla (método, ruta, cabeceras con el nombre en minúsculas, longitud del cuerpo).
+        :raises ValueError: Si la línea de petición, una cabecera o Content-Length no son válidas.
+        """
+        lines = head.decode('latin-1').split('\r\n')
+        request_line = lines[0].split(' ')
+        if len(request_line) != 3 or not request_line[2].startswith('HTTP/'):
+            raise ValueError(f'línea de petición no válida: {lines[0]!r}')
+        method, path = request_line[:2]
+
+        headers = {}
+        for line in filter(None, lines[1:]):
+            name, separator, value = line.partition(':')
+            if not separator or not name.strip():
+                raise ValueError(f'cabecera no válida: {line!r}')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0))
+        if length < 0:
+            raise ValueError(f'Content-Length negativo: {length}')
+        return method, path, headers, length
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: str, payload: dict):
+        """
+        Escribe una respuesta JSON.
+        """
+        data = json.dumps(payload).encode()
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(data)}\r\n\r\n'.encode() + data)
+        await writer.drain()
+
+    def _route(self, method: str, path: str, body: bytes) -> Tuple[str, dict]:
+        """
+        Atiende una petición.
+
+        :return: Tupla (línea de estado, cuerpo JSON de la respuesta).
+        """
+        try:
+            request = json.loads(body) if body else {}
+            if method == 'POST' and path == '/decide':
+                context = request.get('context')
+                decision_id, arm = self.server.decide(None if context is None else np.asarray(context, dtype=float))
+                return '200 OK', {'decision_id': decision_id, 'arm': arm}
+            if method == 'POST' and path == '/reward':
+                accepted = self.server.report_reward(int(request['decision_id']), float(request['reward']))
+                return '200 OK', {'accepted': accepted}
+            if method == 'GET' and path == '/stats':
+                return '200 OK', self.server.stats()
+            return '404 Not Found', {'error': f'Ruta desconocida: {method} {path}'}
+        except (ValueError, KeyError, TypeError, AssertionError) as error:
+            return '400 Bad Request', {'error': str(error) or type(error).__name__}
@@ -0,0 +1,198 @@
+"""
+Module: serving/server.py
+Description: Servidor de políticas seguro entre hilos, con recompensas diferidas aplicadas en micro-lotes.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import collections
+import itertools
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+from algorithms import Algorithm
+
+
+class PolicyServer:
+    """
+    Envuelve cualquier Algorithm para servir decisiones desde muchos hilos a la vez.
+
+    Los algoritmos suponen que select_arm y update se alternan en un único hilo. Aquí las recompensas llegan
+    tarde y desordenadas: cada decisión devuelve un identificador, y la recompensa se comunica después con
+    report_reward(decision_id, reward). El estado del algoritmo tiene un único escritor:
+
+    - decide toma el cerrojo del modelo solo durante select_arm (que también modifica estado en UCB1, UCB2...).
+    - report_reward no toca el modelo: busca el brazo de la decisión y deja la recompensa en una cola.
+    - Un hilo escritor vacía la cola en micro-lotes de batch_size recompensas, tomando el cerrojo una vez por
+      lote, cada flush_interval segundos o en cuanto hay un lote completo. Cada micro-lote se aplica con una
+      sola llamada a update_many (una por recompensa en los algoritmos contextuales, que necesitan su contexto).
+
+    Así una decisión nunca espera más que un micro-lote de actualizaciones. Con flush_interval=None no se
+    arranca el hilo escritor y las recompensas solo se aplican al llamar a flush, de forma determinista.
+
+    Mientras no llega la siguiente tanda de recompensas, las políticas deterministas (UCB1, UCB2, KLUCB...) repiten
+    el mismo brazo; las aleatorizadas (Thompson, Softmax, epsilon-greedy) reparten mejor las decisiones en vuelo.
+    """
+
+    def __init__(self, algorithm: Algorithm, batch_size: int = 64, flush_interval: Optional[float] = 0.005,
+                 max_pending: int = 1_000_000):
+        """
+        :param algorithm: Algoritmo a servir, en modo de un único bandido.
+        :param batch_size: Número máximo de recompensas aplicadas con cada toma del cerrojo del modelo.
+        :param flush_interval: Segundos máximos que una recompensa espera en la cola. None -> sin hilo escritor.
+        :param max_pending: Decisiones sin recompensa que se recuerdan. Al superarlo se olvidan las más antiguas,
+                            y sus recompensas, si llegan, se rechazan.
+        """
+        assert algorithm.n_envs is None, "El servidor solo admite algoritmos en modo de un único bandido."
+        assert batch_size > 0, "El tamaño del micro-lote debe ser mayor que 0."
+        assert flush_interval is None or flush_interval > 0, "El intervalo de vaciado debe ser positivo."
+        assert max_pending > 0, "El número de decisiones pendientes debe ser mayor que 0."
+
+        self.algorithm = algorithm
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._ids = itertools.count()
+        self._model_lock = threading.Lock()  # Protege el algoritmo
+        self._pending_lock = threading.Lock()  # Protege las decisiones pendientes y los contadores
+        self._pending = {}  # decision_id -> (brazo, contexto), en orden de creación
+        self._feedback = collections.deque()  # (brazo, recompensa, contexto) pendientes de aplicar
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._counters = {'decisions': 0, 'rewards_received': 0, 'rewards_applied': 0, 'rewards_rejected': 0,
+                          'expired': 0, 'batches': 0}
+
+        self._writer = None
+        if flush_interval is not None:
+            self._writer = threading.Thread(target=self._write_loop, name='PolicyServer-writer', daemon=True)
+            self._writer.start()
+
+    def decide(self, context: Optional[np.ndarray] = None) -> Tuple[int, int]:
+        """
+        Selecciona un brazo con la política actual.
+
+        :param context: Contexto (d,) de la petición, solo para algoritmos contextuales.
+        :return: Tupla (decision_id, brazo).
+        """
+        assert not self._closed, "El servidor está cerrado."
+        assert (context is not None) == self.algorithm.contextual, \
+            "Los algoritmos contextuales necesitan un contexto, y los demás no lo admiten."
+
+        with self._model_lock:
+            arm = self.algorithm.select_arm(context) if context is not None else self.algorithm.select_arm()
+
+        decision_id = next(self._ids)
+        with self._pending_lock:
+            self._pending[decision_id] = (int(arm), context)
+            self._counters['decisions'] += 1
+            if len(self._pending) > self.max_pending:
+                del self._pending[next(iter(self._pending))]
+                self._counters['expired'] += 1
+
+        return decision_id, int(arm)
+
+    def report_reward(self, decision_id: int, reward: float) -> bool:
+        """
+        Comunica la recompensa de una decisión. Se aplica al modelo en el siguiente micro-lote.
+
+        :param decision_id: Identificador devuelto por decide.
+        :param reward: Recompensa obtenida.
+        :return: True si se acepta, False si la decisión no existe, ya tenía recompensa o se olvidó.
+        """
+        with self._pending_lock:
+            decision = self._pending.pop(decision_id, None)
+            if decision is None:
+                self._counters['rewards_rejected'] += 1
+                return False
+            self._counters['rewards_received'] += 1
+
+        self._feedback.append((decision[0], float(reward), decision[1]))
+        if len(self._feedback) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """
+        Aplica todas las recompensas en cola, en micro-lotes de batch_size.
+
+        :return: Número de recompensas aplicadas.
+        """
+        applied = 0
+        while True:
+            batch = []
+            try:  # popleft es atómico, pero otro hilo puede vaciar la cola entre la comprobación y la extracción
+                while len(batch) < self.batch_size:
+                    batch.append(self._feedback.popleft())
+            except IndexError:
+                pass
+            if not batch:
+                break
+
+            with self._model_lock:
+                if self.algorithm.contextual:
+                    for arm, reward, context in batch:
+                        self.algorithm.update(arm, reward, context)
+                else:
+                    arms, rewards, _ = zip(*batch)
+                    self.algorithm.update_many(np.array(arms), np.array(rewards))
+
+            applied += len(batch)
+            with self._pending_lock:
+                self._counters['rewards_applied'] += len(batch)
+                self._counters['batches'] += 1
+
+        return applied
+
+    def snapshot(self) -> dict:
+        """
+        Copia coherente del estado del algoritmo (ver Algorithm.get_state).
+        """
+        with self._model_lock:
+            return self.algorithm.get_state()
+
+    def stats(self) -> dict:
+        """
+        Contadores del servidor: decisiones, recompensas recibidas, aplicadas y rechazadas, decisiones
+        olvidadas, micro-lotes aplicados, decisiones pendientes de recompensa y recompensas en cola.
+        """
+        with self._pending_lock:
+            stats = dict(self._counters)
+            stats['pending'] = len(self._pending)
+        stats['queued'] = len(self._feedback)
+        return stats
+
+    def close(self):
+        """
+        Detiene el hilo escritor y aplica las recompensas que quedan en cola. Después no se admiten decisiones.
+        """
+        self._closed = True
+        if self._writer is not None:
+            self._wakeup.set()
+            self._writer.join()
+            self._writer = None
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_loop(self):
+        """
+        Bucle del hilo escritor: espera un lote completo o flush_interval segundos y vacía la cola.
+        """
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
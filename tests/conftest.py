@@ -0,0 +1,19 @@
+"""
+Module: tests/conftest.py
+Description: Configuración común de las pruebas: añade el directorio fuente al path de Python.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import os
+import sys
+
+# Añadir el directorio fuente al path de Python, igual que en los notebooks y los benchmarks
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
@@ -0,0 +1,61 @@
+"""
+Module: tests/test_bandit.py
+Description: Pruebas de la extracción vectorizada de recompensas de Bandit.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from arms import ArmBernoulli, ArmBinomial, ArmNormal, Bandit
+
+
+def mixed_bandit(rng=None) -> Bandit:
+    return Bandit([ArmNormal(2.0, 0.5), ArmBernoulli(0.3), ArmBinomial(10, 0.7), ArmNormal(-1.0, 1.0)], rng=rng)
+
+
+def test_pull_arms_keeps_shape():
+    bandit = mixed_bandit(np.random.default_rng(0))
+    indices = np.random.default_rng(1).integers(0, bandit.k, size=(7, 3))
+
+    rewards = bandit.pull_arms(indices)
+
+    assert rewards.shape == indices.shape and rewards.dtype == float
+
+
+def test_pull_arms_matches_expected_rewards():
+    bandit = mixed_bandit(np.random.default_rng(0))
+    indices = np.repeat(np.arange(bandit.k), 20_000)
+
+    rewards = bandit.pull_arms(indices)
+
+    means = [rewards[indices == arm].mean() for arm in range(bandit.k)]
+    np.testing.assert_allclose(means, bandit.expected_rewards, atol=0.05)
+    # Bernoulli y Binomial solo dan enteros en [0, n]
+    assert set(np.unique(rewards[indices == 1])) <= {0.0, 1.0}
+    assert np.all((rewards[indices == 2] >= 0) & (rewards[indices == 2] <= 10))
+
+
+def test_pull_arms_rejects_out_of_range():
+    bandit = mixed_bandit()
+    with pytest.raises(IndexError):
+        bandit.pull_arms(np.array([0, bandit.k]))
+    with pytest.raises(IndexError):
+        bandit.pull_arms(np.array([-1]))
+
+
+def test_regret_is_gap_to_optimal_arm():
+    bandit = mixed_bandit()
+
+    regret = bandit.regret(np.arange(bandit.k))
+
+    assert bandit.optimal_arm == 2  # Binomial(10, 0.7): 7
+    np.testing.assert_allclose(regret, 7.0 - np.asarray(bandit.expected_rewards))
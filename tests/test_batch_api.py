@@ -0,0 +1,76 @@
+"""
+Module: tests/test_batch_api.py
+Description: Pruebas del modo por lotes (select_arms / update_batch) de los algoritmos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from algorithms import EpsilonGreedy, GradientBandit, Softmax, UCB1, UCB2
+
+
+def deterministic_algorithms(k):
+    return [EpsilonGreedy(k, 0.0), UCB1(k), UCB2(k, 0.5)]
+
+
+@pytest.mark.parametrize('index', range(3))
+def test_batch_rows_match_single_bandit(index):
+    """Con una política determinista y las mismas recompensas, cada fila del lote sigue la trayectoria de un único bandido."""
+    k, steps, n_envs = 6, 120, 3
+    table = np.random.default_rng(0).normal(size=(steps, k))  # Recompensa de cada brazo en cada paso
+
+    single = deterministic_algorithms(k)[index]
+    batch = deterministic_algorithms(k)[index]
+    batch.reset_batch(n_envs)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for step in range(steps):
+            arm = int(single.select_arm())
+            single.update(arm, table[step, arm])
+
+            arms = batch.select_arms()
+            assert arms.shape == (n_envs,)
+            np.testing.assert_array_equal(arms, arm)
+            batch.update_batch(arms, table[step, arms])
+
+    np.testing.assert_array_equal(batch.counts, np.broadcast_to(single.counts, (n_envs, k)))
+    np.testing.assert_allclose(batch.values, np.broadcast_to(single.values, (n_envs, k)))
+
+
+@pytest.mark.parametrize('algo', [EpsilonGreedy(4, 0.5), Softmax(4), GradientBandit(4)], ids=lambda a: type(a).__name__)
+def test_batch_state_shape_and_counts(algo):
+    algo.rng = np.random.default_rng(1)
+    algo.reset_batch(5)
+
+    for _ in range(20):
+        arms = algo.select_arms()
+        assert arms.shape == (5,) and np.all((arms >= 0) & (arms < 4))
+        algo.update_batch(arms, np.ones(5))
+
+    assert algo.counts.shape == algo.values.shape == (5, 4)
+    np.testing.assert_array_equal(algo.counts.sum(axis=1), 20)
+
+
+def test_ucb2_tau_saturates_without_overflow_warnings():
+    """Con alpha = 0.9, (1 + alpha)^epochs desborda un float64 hacia la época 1100."""
+    batch, single = UCB2(2, 0.9), UCB2(2, 0.9)
+    batch.reset_batch(2)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        for _ in range(1500):
+            batch.update_batch(np.array([0, 1]), np.ones(2))
+            single.update(0, 1.0)
+
+    np.testing.assert_array_equal(batch.tau, [[batch.MAX_TAU, 1], [1, batch.MAX_TAU]])
+    np.testing.assert_array_equal(single.tau, [single.MAX_TAU, 1])
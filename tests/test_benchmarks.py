@@ -0,0 +1,61 @@
+"""
+Module: tests/test_benchmarks.py
+Description: Pruebas del benchmark de latencia y rendimiento de los algoritmos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import json
+import os
+import sys
+
+import algorithms
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+import bench_algorithms  # noqa: E402
+
+
+def entry(p50_us=10.0, steps=1000.0, batched=5000.0, algorithm='UCB1'):
+    return {'algorithm': algorithm, 'k': 10, 'arms': 'Normal', 'p50_us': p50_us,
+            'steps_per_second': steps, 'batched_env_steps_per_second': batched}
+
+
+def test_algorithm_classes_are_concrete_and_not_contextual():
+    classes = bench_algorithms.algorithm_classes()
+
+    assert algorithms.UCB1 in classes and algorithms.ThompsonBernoulli in classes
+    assert algorithms.LinUCB not in classes and algorithms.Algorithm not in classes
+
+
+def test_compare_flags_only_degradations_beyond_tolerance():
+    baseline = {'results': [entry()]}
+
+    assert bench_algorithms.compare({'results': [entry(p50_us=11.0, steps=900.0)]}, baseline, 0.2) == []
+    regressions = bench_algorithms.compare({'results': [entry(p50_us=13.0, batched=4000.0)]}, baseline, 0.2)
+    assert len(regressions) == 2
+    assert bench_algorithms.compare({'results': [entry(algorithm='UCB2', p50_us=99.0)]}, baseline, 0.2) == []
+
+
+def test_main_writes_results_and_checks_baseline(tmp_path, capsys):
+    output = str(tmp_path / 'bench.json')
+    args = ['--k', '4', '--decisions', '5', '--warmup', '2', '--n-envs', '3', '--batch-steps', '2', '--output', output]
+
+    assert bench_algorithms.main(args) == 0
+    with open(output) as f:
+        results = json.load(f)
+    assert len(results['results']) == 3 * len(bench_algorithms.algorithm_classes())
+
+    # Una referencia imposiblemente rápida provoca regresiones y un código de salida distinto de 0
+    for result in results['results']:
+        result['p50_us'] = 1e-9
+    with open(output, 'w') as f:
+        json.dump(results, f)
+    assert bench_algorithms.main(args[:-2] + ['--baseline', output]) == 1
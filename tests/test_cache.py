@@ -0,0 +1,86 @@
+"""
+Module: tests/test_cache.py
+Description: Pruebas de la caché en disco de resultados.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import os
+import time
+
+import numpy as np
+
+from algorithms import EpsilonGreedy, UCB1
+from algorithms.estimators import Discounted
+from arms import ArmNormal, Bandit
+from experiments import ResultCache, run_experiment_cached
+from experiments import cache as cache_module
+
+
+def make_bandit(mus=(1.0, 2.0, 1.5)) -> Bandit:
+    return Bandit([ArmNormal(mu, 1.0) for mu in mus])
+
+
+def test_key_depends_on_every_part_of_the_configuration():
+    bandit = make_bandit()
+    base = ResultCache.key(bandit, EpsilonGreedy(3, 0.1), 0, 10, 5)
+
+    assert ResultCache.key(make_bandit(), EpsilonGreedy(3, 0.1), 0, 10, 5) == base
+    assert ResultCache.key(make_bandit((1.0, 2.0, 1.6)), EpsilonGreedy(3, 0.1), 0, 10, 5) != base
+    assert ResultCache.key(bandit, EpsilonGreedy(3, 0.2), 0, 10, 5) != base
+    assert ResultCache.key(bandit, EpsilonGreedy(3, 0.1, estimator=Discounted(0.9)), 0, 10, 5) != base
+    assert ResultCache.key(bandit, UCB1(3), 0, 10, 5) != base
+    compact = EpsilonGreedy(3, 0.1)
+    compact.set_dtype_policy('compact')
+    assert ResultCache.key(bandit, compact, 0, 10, 5) != base
+    assert len({ResultCache.key(bandit, EpsilonGreedy(3, 0.1), *config) for config in
+                ((1, 10, 5), (0, 11, 5), (0, 10, 6))} - {base}) == 3
+
+
+def test_cache_hit_returns_identical_results_without_simulating(tmp_path, monkeypatch):
+    bandit = make_bandit()
+    algorithms = [EpsilonGreedy(3, 0.1), UCB1(3)]
+    directory = str(tmp_path / 'cache')
+
+    first = run_experiment_cached(bandit, algorithms, 30, 8, seed=4, cache=directory)
+
+    def fail(*args):
+        raise AssertionError("Con la caché llena no se debe simular")
+
+    monkeypatch.setattr(cache_module, '_run_shard', fail)
+    second = run_experiment_cached(bandit, algorithms, 30, 8, seed=4, cache=directory)
+
+    for a, b in zip(first[:3], second[:3]):
+        np.testing.assert_array_equal(a, b)
+    for a, b in zip(first[3], second[3]):
+        np.testing.assert_array_equal(a['selection_counts'], b['selection_counts'])
+
+
+def test_entries_do_not_depend_on_the_other_algorithms(tmp_path):
+    bandit = make_bandit()
+    alone = run_experiment_cached(bandit, [UCB1(3)], 25, 6, seed=1, cache=str(tmp_path / 'a'))
+    together = run_experiment_cached(bandit, [EpsilonGreedy(3, 0.1), UCB1(3)], 25, 6, seed=1, cache=str(tmp_path / 'b'))
+
+    np.testing.assert_array_equal(alone[2][0], together[2][1])
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=3000)
+    payload = {'data': np.zeros(100)}  # Unos 900 bytes por entrada
+
+    for key in ('a', 'b', 'c'):
+        cache.put(key, payload)
+        os.utime(os.path.join(str(tmp_path), key), (time.time() - ord('z') + ord(key),) * 2)
+    assert cache.get('a') is not None  # 'a' pasa a ser la más reciente
+    cache.put('d', payload)
+
+    assert [key for key, _, _ in cache.entries()] == ['c', 'a', 'd']
+    assert cache.nbytes <= 3000
+    np.testing.assert_array_equal(cache.get('d')['data'], payload['data'])
@@ -0,0 +1,104 @@
+"""
+Module: tests/test_checkpoint.py
+Description: Pruebas del ejecutor con puntos de control, reanudable y ampliable.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import EpsilonGreedy, GradientBandit, UCB1
+from arms import ArmNormal, Bandit
+from experiments import checkpoint as checkpoint_module
+from experiments import load_checkpoint, run_experiment_resumable
+
+
+class Interrupted(Exception):
+    pass
+
+
+def make_setup():
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 2.5, 2.0)])
+    return bandit, [EpsilonGreedy(bandit.k, 0.1), UCB1(bandit.k), GradientBandit(bandit.k)]
+
+
+def assert_same_results(a, b):
+    for x, y in zip(a[:3], b[:3]):
+        np.testing.assert_array_equal(x, y)
+    for x, y in zip(a[3], b[3]):
+        np.testing.assert_array_equal(x['selection_counts'], y['selection_counts'])
+
+
+def test_resume_after_interruption_matches_full_run(tmp_path, monkeypatch):
+    bandit, algorithms = make_setup()
+    full = run_experiment_resumable(bandit, algorithms, 60, 6, str(tmp_path / 'full.npz'), seed=3, checkpoint_every=10)
+
+    # Se interrumpe el experimento justo después de guardar el cuarto punto de control
+    path = str(tmp_path / 'resumed.npz')
+    save = checkpoint_module.save_checkpoint
+    calls = []
+
+    def save_then_fail(*args):
+        save(*args)
+        calls.append(1)
+        if len(calls) == 4:
+            raise Interrupted()
+
+    monkeypatch.setattr(checkpoint_module, 'save_checkpoint', save_then_fail)
+    with pytest.raises(Interrupted):
+        run_experiment_resumable(bandit, make_setup()[1], 60, 6, path, seed=3, checkpoint_every=10)
+    monkeypatch.undo()
+
+    assert load_checkpoint(path)['blocks'][0][0]['steps'] == 40
+    resumed = run_experiment_resumable(bandit, make_setup()[1], 60, 6, path, checkpoint_every=10)
+    assert_same_results(full, resumed)
+
+
+def test_extending_the_horizon_matches_full_run(tmp_path):
+    bandit, algorithms = make_setup()
+    full = run_experiment_resumable(bandit, algorithms, 80, 5, str(tmp_path / 'full.npz'), seed=1, checkpoint_every=25)
+
+    path = str(tmp_path / 'extended.npz')
+    run_experiment_resumable(bandit, make_setup()[1], 30, 5, path, seed=1, checkpoint_every=25)
+    extended = run_experiment_resumable(bandit, make_setup()[1], 80, 5, path, checkpoint_every=25)
+
+    assert_same_results(full, extended)
+
+
+def test_adding_runs_adds_a_block_and_keeps_saved_ones(tmp_path):
+    bandit, algorithms = make_setup()
+    path = str(tmp_path / 'runs.npz')
+    first = run_experiment_resumable(bandit, algorithms, 20, 4, path, seed=2)
+    saved = load_checkpoint(path)['blocks'][0][0]['sums'].copy()
+
+    more = run_experiment_resumable(bandit, make_setup()[1], 20, 10, path)
+
+    blocks = load_checkpoint(path)['blocks'][0]
+    assert [block['runs'] for block in blocks] == [4, 6]
+    np.testing.assert_array_equal(blocks[0]['sums'], saved)
+    np.testing.assert_allclose(more[0][0] * 10, first[0][0] * 4 + blocks[1]['sums'][0])
+    with pytest.raises(AssertionError):
+        run_experiment_resumable(bandit, make_setup()[1], 20, 3, path)  # Solo se puede ampliar
+
+
+def test_algorithms_passed_in_are_left_untouched(tmp_path):
+    bandit, algorithms = make_setup()
+    rng = np.random.default_rng(0)
+    algorithms[0].rng = rng
+    states = [algo.get_state() for algo in algorithms]
+
+    run_experiment_resumable(bandit, algorithms, 20, 6, str(tmp_path / 'run.npz'), seed=1, checkpoint_every=5)
+
+    assert algorithms[0].rng is rng
+    for algo, state in zip(algorithms, states):
+        assert algo.n_envs is None
+        for name, value in algo.get_state().items():
+            np.testing.assert_array_equal(value, state[name])
@@ -0,0 +1,102 @@
+"""
+Module: tests/test_downsampling.py
+Description: Pruebas de la reducción de series para las gráficas y de las gráficas a partir de métricas en línea.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import matplotlib
+import numpy as np
+import pytest
+
+matplotlib.use('Agg')  # Sin ventana: las gráficas se guardan en fichero
+
+from algorithms import EpsilonGreedy, UCB1
+from arms import ArmNormal, Bandit
+from experiments import run_experiment_streaming
+from plotting import downsample, plot_average_rewards, plot_optimal_selections, plot_regret
+from plotting.downsampling import METHODS, lttb_indices, min_max_indices
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_short_series_is_returned_unchanged(method):
+    x, y = np.arange(50), np.random.default_rng(0).normal(size=50)
+
+    xs, ys = downsample(x, y, max_points=50, method=method)
+
+    np.testing.assert_array_equal(xs, x)
+    np.testing.assert_array_equal(ys, y)
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('n, max_points', [(5, 4), (6, 5), (11, 10), (101, 4), (10_000, 2000), (10_001, 7)])
+def test_output_is_bounded_sorted_and_keeps_endpoints(method, n, max_points):
+    x, y = np.arange(n), np.random.default_rng(n).normal(size=n)
+
+    xs, ys = downsample(x, y, max_points, method)
+
+    assert len(xs) <= max_points
+    assert xs[0] == 0 and xs[-1] == n - 1
+    assert np.all(np.diff(xs) > 0)
+    np.testing.assert_array_equal(ys, y[xs])
+
+
+def test_min_max_keeps_the_extremes_of_every_bucket():
+    y = np.random.default_rng(1).normal(size=1000)
+    y[123], y[789] = 50.0, -50.0  # Picos aislados
+
+    indices = min_max_indices(y, 10)
+
+    assert {123, 789} <= set(indices)
+    for bucket in y.reshape(10, 100):
+        assert bucket.max() in y[indices] and bucket.min() in y[indices]
+
+
+def test_min_max_of_a_constant_series():
+    np.testing.assert_array_equal(min_max_indices(np.ones(10), 3), [0, 4, 8, 9])
+    np.testing.assert_array_equal(min_max_indices(np.arange(10.0), 1), [0, 9])
+
+
+@pytest.mark.parametrize('n_out', [2, 3, 10])
+def test_lttb_returns_exactly_n_out_indices(n_out):
+    x = np.arange(100.0)
+    y = np.sin(x / 7)
+
+    indices = lttb_indices(x, y, n_out)
+
+    assert len(indices) == n_out
+    assert indices[0] == 0 and indices[-1] == 99
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_picks_the_spike():
+    x, y = np.arange(100.0), np.zeros(100)
+    y[40] = 10.0
+
+    assert 40 in lttb_indices(x, y, 5)
+
+
+def test_invalid_arguments_raise():
+    with pytest.raises(AssertionError):
+        downsample(np.arange(10), np.arange(10), 4, 'mean')
+    with pytest.raises(AssertionError):
+        downsample(np.arange(10), np.arange(10), 3)
+
+
+@pytest.mark.parametrize('plot', [plot_average_rewards, plot_optimal_selections, plot_regret])
+def test_plots_from_streaming_metrics_and_arrays(plot, tmp_path):
+    bandit = Bandit([ArmNormal(mu, 1) for mu in (1.0, 2.0, 3.0)])
+    algorithms = [EpsilonGreedy(3, 0.1), UCB1(3)]
+    metrics = run_experiment_streaming(bandit, algorithms, steps=300, runs=20, seed=0, n_checkpoints=16)
+    arrays = np.random.default_rng(0).random((2, 300))
+
+    for series, name in [(metrics, 'streaming.png'), (arrays, 'arrays.png')]:
+        plot(300, series, algorithms, max_points=50, path=str(tmp_path / name))
+        assert (tmp_path / name).stat().st_size > 0
@@ -0,0 +1,94 @@
+"""
+Module: tests/test_dtype_policy.py
+Description: Pruebas de las políticas de tipos del estado de los algoritmos ('default' y 'compact').
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import Algorithm, DTYPE_POLICIES, EpsilonGreedy, UCB1, UCB2, Softmax, GradientBandit, KLUCB, UCBV, \
+    ThompsonBernoulli, ThompsonNormal
+from arms import ArmNormal, Bandit
+from experiments import run_experiment
+
+FACTORIES = {
+    'EpsilonGreedy': lambda: EpsilonGreedy(8, 0.1),
+    'UCB1': lambda: UCB1(8),
+    'UCB2': lambda: UCB2(8, 0.5),
+    'Softmax': lambda: Softmax(8, 0.5),
+    'GradientBandit': lambda: GradientBandit(8, 0.1),
+    'KLUCB': lambda: KLUCB(8),
+    'UCBV': lambda: UCBV(8),
+    'ThompsonBernoulli': lambda: ThompsonBernoulli(8),
+    'ThompsonNormal': lambda: ThompsonNormal(8),
+}
+
+
+def array_nbytes(algo) -> int:
+    """Memoria de los arrays del estado: los nodos del árbol de segmentos son listas y no cambian de tipo."""
+    tree = getattr(algo, 'tree', None)
+    return algo.state_nbytes() - (0 if tree is None else tree.nbytes())
+
+
+def state_dtypes(algo) -> set:
+    return {value.dtype for value in algo.get_state().values() if value.ndim > 0}
+
+
+@pytest.mark.parametrize('name', FACTORIES)
+@pytest.mark.parametrize('policy', DTYPE_POLICIES)
+def test_state_arrays_follow_the_policy(name, policy, monkeypatch):
+    monkeypatch.setattr(Algorithm, 'dtype_policy', policy)  # Política de todos los algoritmos nuevos
+    algo = FACTORIES[name]()
+    algo.reset_batch(4)
+    with np.errstate(divide='ignore', invalid='ignore'):  # UCB2 produce NaN de forma esperada en algunos índices
+        for _ in range(20):
+            arms = algo.select_arms()
+            algo.update_batch(arms, np.ones(4))
+
+    assert state_dtypes(algo) <= {np.dtype(dtype) for dtype in DTYPE_POLICIES[policy]}
+    assert algo.counts.dtype == DTYPE_POLICIES[policy][0]
+
+
+@pytest.mark.parametrize('name', FACTORIES)
+def test_set_dtype_policy_converts_the_current_state(name):
+    algo = FACTORIES[name]()
+    for arm in range(8):
+        algo.update(arm, arm / 8)
+    state = algo.get_state()
+    default_bytes = array_nbytes(algo)
+
+    algo.set_dtype_policy('compact')
+
+    assert array_nbytes(algo) == default_bytes // 2
+    for key, value in algo.get_state().items():
+        np.testing.assert_allclose(value, state[key], rtol=1e-6)
+
+    algo.set_dtype_policy('default')
+    assert array_nbytes(algo) == default_bytes
+
+
+def test_unknown_policy_raises():
+    with pytest.raises(AssertionError):
+        UCB1(3).set_dtype_policy('half')
+
+
+def test_compact_runs_match_default_runs():
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 1.5, 2.0, 2.5)])
+    results = {}
+    for policy in DTYPE_POLICIES:
+        algorithms = [EpsilonGreedy(4, 0.1), UCB1(4)]
+        for algo in algorithms:
+            algo.set_dtype_policy(policy)
+        results[policy] = run_experiment(bandit, algorithms, steps=300, runs=10, seed=3)
+
+    np.testing.assert_array_equal(results['compact'][1], results['default'][1])  # Mismas decisiones
+    np.testing.assert_allclose(results['compact'][0], results['default'][0], rtol=1e-5)
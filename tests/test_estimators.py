@@ -0,0 +1,127 @@
+"""
+Module: tests/test_estimators.py
+Description: Pruebas de los estimadores de paso constante, descontado y de ventana deslizante.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import EpsilonGreedy, GradientBandit, UCB1, UCB2
+from algorithms.estimators import ConstantStep, Discounted, SlidingWindow
+from arms import ArmBernoulli, Bandit
+from experiments import run_experiment
+
+
+def history(steps: int = 700, k: int = 3, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, k, steps), rng.normal(size=steps)
+
+
+def reference_values(estimator, arms, rewards, k):
+    """Valor de cada brazo calculado directamente a partir de toda la historia."""
+    values = np.zeros(k)
+    for arm in range(k):
+        mine = np.flatnonzero(arms == arm)
+        if isinstance(estimator, ConstantStep):
+            for index in mine:
+                values[arm] += estimator.step_size * (rewards[index] - values[arm])
+        elif isinstance(estimator, Discounted):
+            weights = estimator.gamma ** (len(arms) - 1 - mine)  # Peso gamma^(antigüedad)
+            values[arm] = np.sum(weights * rewards[mine]) / np.sum(weights)
+        else:
+            values[arm] = np.mean(rewards[mine[-estimator.window:]])
+    return values
+
+
+ESTIMATORS = [ConstantStep(0.2), Discounted(0.9), Discounted(0.5), SlidingWindow(7)]
+
+
+@pytest.mark.parametrize('estimator', ESTIMATORS, ids=lambda e: f'{type(e).__name__}')
+def test_single_bandit_matches_direct_computation(estimator):
+    """Con gamma = 0.5 el descontado renormaliza varias veces a lo largo de la historia."""
+    arms, rewards = history()
+    algo = EpsilonGreedy(3, 0.1, estimator=estimator)
+    for arm, reward in zip(arms, rewards):
+        algo.update(int(arm), reward)
+
+    np.testing.assert_allclose(algo.values, reference_values(estimator, arms, rewards, 3), rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize('estimator', ESTIMATORS, ids=lambda e: f'{type(e).__name__}')
+def test_batched_rows_match_single_bandits(estimator):
+    n_envs = 4
+    histories = [history(300, seed=seed) for seed in range(n_envs)]
+    batch = EpsilonGreedy(3, 0.1, estimator=estimator)
+    batch.reset_batch(n_envs)
+    for step in range(300):
+        batch.update_batch(np.array([h[0][step] for h in histories]), np.array([h[1][step] for h in histories]))
+
+    for row, (arms, rewards) in enumerate(histories):
+        np.testing.assert_allclose(batch.values[row], reference_values(estimator, arms, rewards, 3), rtol=1e-9, atol=1e-12)
+
+
+def test_exploration_counts_forget_old_pulls():
+    discounted = UCB1(2, estimator=Discounted(0.5))
+    window = UCB2(2, estimator=SlidingWindow(5))
+    for _ in range(50):
+        discounted.update(0, 1.0)
+        window.update(0, 1.0)
+
+    assert discounted.estimator.exploration_counts(discounted)[0] == pytest.approx(2.0)  # Suma de 0.5^i
+    assert window.estimator.exploration_counts(window)[0] == 5
+    assert discounted.counts[0] == window.counts[0] == 50
+
+
+def test_each_algorithm_works_on_its_own_copy():
+    estimator = SlidingWindow(3)
+    first, second = EpsilonGreedy(2, estimator=estimator), EpsilonGreedy(2, estimator=estimator)
+    first.update(0, 1.0)
+
+    assert first.estimator is not second.estimator
+    assert second.values[0] == 0 and first.values[0] == 1.0
+
+
+def test_discounted_under_the_compact_policy_matches_the_default_one():
+    """Con gamma = 0.9, scale supera el máximo de un float32 hacia el paso 850 y solo renormaliza hacia el 3300."""
+    bandit = Bandit([ArmBernoulli(p) for p in (0.3, 0.5, 0.7)])
+    results = {}
+    for policy in ('default', 'compact'):
+        algo = UCB1(3, estimator=Discounted(0.9))
+        algo.set_dtype_policy(policy)
+        results[policy] = run_experiment(bandit, [algo], steps=4000, runs=4, seed=0)
+        assert algo.values.dtype == (np.float32 if policy == 'compact' else np.float64)
+        assert algo.estimator.weights.dtype == np.float64
+        assert np.all(np.isfinite(algo.values))
+
+    np.testing.assert_allclose(results['compact'][2], results['default'][2], rtol=1e-3)
+
+
+@pytest.mark.parametrize('estimator', [Discounted(0.9), SlidingWindow(7)], ids=lambda e: type(e).__name__)
+def test_estimator_state_survives_a_policy_change(estimator):
+    arms, rewards = history(2000)
+    algo = EpsilonGreedy(3, estimator=estimator)
+    for arm, reward in zip(arms, rewards):
+        algo.update(int(arm), reward)
+    state = algo.estimator.get_state()
+
+    algo.set_dtype_policy('compact')
+
+    for name, value in algo.estimator.get_state().items():
+        np.testing.assert_allclose(value, state[name], rtol=1e-6)
+    assert np.all(np.isfinite(algo.values))
+
+
+@pytest.mark.parametrize('estimator', ESTIMATORS, ids=lambda e: f'{type(e).__name__}')
+def test_gradient_bandit_rejects_an_estimator(estimator):
+    """Las preferencias y su línea base no dependen de values: el estimador no cambiaría la política."""
+    with pytest.raises(AssertionError):
+        GradientBandit(3, estimator=estimator)
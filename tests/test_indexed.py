@@ -0,0 +1,88 @@
+"""
+Module: tests/test_indexed.py
+Description: Pruebas del modo indexado para k grande (árbol de segmentos del máximo).
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import EpsilonGreedy, UCB1, UCB2, Softmax
+from algorithms.segment_tree import MaxSegmentTree
+
+
+@pytest.mark.parametrize('k', [1, 2, 7, 64, 100])
+def test_max_segment_tree_tracks_argmax(k):
+    rng = np.random.default_rng(k)
+    values = rng.integers(0, 5, k).astype(float)  # Valores pequeños para provocar empates
+    tree = MaxSegmentTree(values)
+
+    for _ in range(200):
+        index = int(rng.integers(k))
+        values[index] = rng.integers(0, 5)
+        tree.update(index, values[index])
+        assert tree.argmax() == np.argmax(values)  # Con empates, el índice más bajo
+        assert tree.max() == values.max()
+
+
+def test_indexed_epsilon_greedy_matches_plain():
+    k, steps = 50, 500
+    means = np.random.default_rng(0).normal(size=k)
+    plain = EpsilonGreedy(k, 0.1, rng=np.random.default_rng(1))
+    indexed = EpsilonGreedy(k, 0.1, rng=np.random.default_rng(1), indexed=True)
+    reward_rng = np.random.default_rng(2)
+
+    for _ in range(steps):
+        arm = int(plain.select_arm())
+        assert int(indexed.select_arm()) == arm
+        reward = reward_rng.normal(means[arm])
+        plain.update(arm, reward)
+        indexed.update(arm, reward)
+
+
+@pytest.mark.parametrize('cls', [UCB1, UCB2])
+def test_indexed_ucb_explores_every_arm_then_exploits(cls):
+    k = 40
+    means = np.linspace(0, 1, k)
+    algo = cls(k, indexed=True)
+
+    chosen = []
+    for _ in range(3000):
+        arm = int(algo.select_arm())
+        algo.update(arm, means[arm] + 0.01 * np.sin(len(chosen)))
+        chosen.append(arm)
+
+    assert chosen[:k] == list(range(k))  # Primero, cada brazo una vez y en orden
+    assert np.bincount(chosen[-500:], minlength=k).argmax() == k - 1
+
+
+@pytest.mark.parametrize('cls', [EpsilonGreedy, UCB1])
+def test_state_nbytes_counts_the_index(cls):
+    plain, indexed = cls(1000), cls(1000, indexed=True)
+    for algo in (plain, indexed):
+        for arm in range(1000):
+            algo.select_arm()
+            algo.update(arm, arm / 1000)
+        algo.select_arm()  # UCB1 construye el árbol al terminar la exploración
+
+    assert indexed.tree is not None
+    assert indexed.state_nbytes() == plain.state_nbytes() + indexed.tree.nbytes()
+    assert indexed.tree.nbytes() > 2 * 8 * 1000  # Al menos un float por nodo, con 2 * 1024 nodos
+
+
+def test_state_nbytes_counts_the_softmax_sum_tree():
+    algo = Softmax(1000, 0.5)
+    batched = Softmax(1000, 0.5)
+    batched.reset_batch(1)  # En modo por lotes no hay árbol
+
+    assert batched.tree is None
+    assert algo.state_nbytes() == batched.state_nbytes() + algo.tree.nbytes()
+    assert algo.tree.nbytes() > 8 * 1000
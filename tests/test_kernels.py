@@ -0,0 +1,121 @@
+"""
+Module: tests/test_kernels.py
+Description: Pruebas de equivalencia entre los núcleos de episodio y las clases de Python de cada algoritmo.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+
+Sin Numba instalado, njit deja los núcleos como funciones de Python, así que estas pruebas comprueban
+la misma lógica con y sin compilación.
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from algorithms import EpsilonGreedy, GradientBandit, Softmax, UCB1, UCB2, ThompsonBernoulli
+from algorithms.estimators import ConstantStep
+from arms import ArmNormal, Bandit
+from experiments import NUMBA_AVAILABLE, RewardTape, simulate, verify_kernel
+from experiments.kernels import run_episode, simulate_compiled, supports
+from randomness import BufferedGenerator
+
+KERNEL_ALGORITHMS = {
+    'EpsilonGreedy': lambda k: EpsilonGreedy(k, 0.2),
+    'UCB1': lambda k: UCB1(k),
+    'UCB2': lambda k: UCB2(k, 0.3),
+    'Softmax': lambda k: Softmax(k, 0.5),
+    'GradientBandit': lambda k: GradientBandit(k, 0.1),
+}
+
+
+def reward_matrix(steps: int = 400, k: int = 6, seed: int = 0) -> np.ndarray:
+    means = np.linspace(0, 2, k)
+    return np.random.default_rng(seed).normal(means, 1.0, size=(steps, k))
+
+
+def class_trajectory(algo, rewards: np.ndarray, seed: int):
+    """Brazos y recompensas de un episodio con select_arm/update, consumiendo los uniformes de un BufferedGenerator."""
+    algo.rng = BufferedGenerator(seed)
+    algo.reset()
+    arms = np.empty(len(rewards), dtype=np.int64)
+    for step in range(len(rewards)):
+        arms[step] = algo.select_arm()
+        algo.update(arms[step], rewards[step, arms[step]])
+    return arms, rewards[np.arange(len(rewards)), arms], algo.values.copy()
+
+
+@pytest.mark.parametrize('name', KERNEL_ALGORITHMS)
+@pytest.mark.parametrize('seed', [0, 1])
+def test_kernel_reproduces_class_trajectory(name, seed):
+    rewards = reward_matrix(seed=seed)
+    make = KERNEL_ALGORITHMS[name]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected_arms, expected_rewards, expected_values = class_trajectory(make(rewards.shape[1]), rewards, seed)
+
+        algo = make(rewards.shape[1])
+        arms = run_episode(algo, rewards, np.random.default_rng(seed).random(2 * len(rewards)))
+
+    np.testing.assert_array_equal(arms, expected_arms)
+    np.testing.assert_array_equal(rewards[np.arange(len(rewards)), arms], expected_rewards)
+    np.testing.assert_allclose(algo.values, expected_values)
+
+
+@pytest.mark.parametrize('name', KERNEL_ALGORITHMS)
+def test_verify_kernel_accepts_every_kernel(name):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        assert verify_kernel(KERNEL_ALGORITHMS[name](5), reward_matrix(200, 5), seed=3)
+
+
+def test_verify_kernel_leaves_the_algorithm_untouched():
+    rng = np.random.default_rng(7)
+    algo = EpsilonGreedy(5, 0.2, rng=rng)
+    algo.reset_batch(3)
+    algo.update_batch(np.array([0, 1, 2]), np.ones(3))
+    state = algo.get_state()
+
+    assert verify_kernel(algo, reward_matrix(100, 5), seed=1)
+
+    assert algo.rng is rng and algo.n_envs == 3
+    for name, value in algo.get_state().items():
+        np.testing.assert_array_equal(value, state[name])
+
+
+def test_supports_only_base_classes_with_sample_mean():
+    assert all(supports(make(4)) for make in KERNEL_ALGORITHMS.values())
+    assert not supports(EpsilonGreedy(4, 0.1, estimator=ConstantStep(0.1)))
+    assert not supports(ThompsonBernoulli(4))
+
+
+@pytest.mark.parametrize('name', ['UCB1', 'UCB2'])
+def test_compiled_simulation_matches_runner_with_tape(name):
+    """Con una política determinista y una cinta, el ejecutor compilado y el vectorizado dan las mismas métricas."""
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 2.0, 1.5, 0.5)], rng=np.random.default_rng(0))
+    tape = RewardTape.sample(bandit, runs=5, steps=150, dtype=np.float64)
+    make = KERNEL_ALGORITHMS[name]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        compiled = simulate_compiled(bandit, make(bandit.k), 150, 5, tape)
+        vectorized = simulate(bandit, make(bandit.k), 150, 5, tape)
+
+    for a, b in zip(compiled, vectorized):
+        np.testing.assert_allclose(a, b)
+
+
+@pytest.mark.skipif(NUMBA_AVAILABLE, reason="Solo sin Numba instalado")
+def test_numba_backend_falls_back_to_numpy():
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 2.0)])
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        rewards, _, _ = simulate(bandit, UCB1(bandit.k), 20, 3, backend='numba')
+
+    assert rewards.shape == (20,)
+    assert any(issubclass(w.category, RuntimeWarning) for w in caught)
@@ -0,0 +1,131 @@
+"""
+Module: tests/test_kl_ucb.py
+Description: Pruebas de KL-UCB (cota de Bernoulli por Newton y cota gaussiana) y de UCB-V.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from algorithms import KLUCB, UCBV
+from algorithms.estimators import Discounted
+from algorithms.kl_ucb import EPSILON, _bernoulli_kl, _bernoulli_kl_bound
+from arms import ArmBernoulli, Bandit
+from experiments import run_experiment
+
+
+def bisection_bound(p: float, d: float, iterations: int = 200) -> float:
+    """Mayor q en [p, 1 - EPSILON] con kl(p, q) <= d, por bisección."""
+    lo, hi = p, 1 - EPSILON
+    if _bernoulli_kl(p, hi) <= d:
+        return hi
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        lo, hi = (mid, hi) if _bernoulli_kl(p, mid) <= d else (lo, mid)
+    return (lo + hi) / 2
+
+
+@pytest.mark.parametrize('start', ['ones', 'p', 'random'])
+def test_newton_bound_matches_bisection(start):
+    rng = np.random.default_rng(0)
+    p = np.concatenate([[0.0, 0.5, 0.999, 1 - EPSILON], rng.uniform(0, 1, 200)])
+    d = np.concatenate([[0.3, 1e-6, 2.0, 0.1], rng.exponential(0.5, 200)])
+    starts = {'ones': np.ones_like(p), 'p': p.copy(), 'random': rng.uniform(0, 1, len(p))}[start]
+
+    bounds = _bernoulli_kl_bound(p, d, starts)
+
+    expected = np.array([bisection_bound(pi, di) for pi, di in zip(p, d)])
+    np.testing.assert_allclose(bounds, expected, atol=1e-7)
+    assert np.all(bounds >= p - 1e-12)
+
+
+def test_newton_bound_keeps_shape_and_saturates_unexplored_arms():
+    p = np.array([[0.2, 0.7, 0.0], [0.9, 0.4, 0.1]])
+    d = np.array([[0.5, np.inf, 0.05], [np.inf, 0.2, 1e-3]])
+
+    bounds = _bernoulli_kl_bound(p, d, np.ones_like(p))
+
+    assert bounds.shape == p.shape
+    assert bounds[0, 1] == bounds[1, 0] == 1 - EPSILON
+    finite = np.isfinite(d)
+    np.testing.assert_allclose(_bernoulli_kl(p[finite], bounds[finite]), d[finite], atol=1e-7)
+
+
+def test_gaussian_bound_has_closed_form():
+    algo = KLUCB(3, family='gaussian', sigma=2.0)
+    for arm, reward in [(0, 1.0), (1, 3.0), (2, -1.0), (0, 2.0), (1, 0.0)]:
+        algo.select_arm()
+        algo.update(arm, reward)
+
+    expected = algo.values + 2.0 * np.sqrt(2 * np.log(algo.t) / algo.counts)
+    np.testing.assert_allclose(algo._upper_bounds(), expected)
+
+
+def test_batched_kl_bounds_match_single_bandit():
+    rng = np.random.default_rng(1)
+    arms, rewards = rng.integers(0, 4, (3, 60)), rng.integers(0, 2, (3, 60)).astype(float)
+    batch = KLUCB(4)
+    batch.reset_batch(3)
+    singles = [KLUCB(4) for _ in range(3)]
+    for step in range(60):
+        batch.select_arms()
+        batch.update_batch(arms[:, step], rewards[:, step])
+        for row, single in enumerate(singles):
+            single.select_arm()
+            single.update(arms[row, step], rewards[row, step])
+
+    bounds = batch._upper_bounds()
+    for row, single in enumerate(singles):
+        np.testing.assert_allclose(bounds[row], single._upper_bounds(), atol=1e-8)
+
+
+@pytest.mark.parametrize('algo', [KLUCB(3), KLUCB(3, family='gaussian', sigma=0.5), UCBV(3)])
+def test_concentrates_on_the_best_arm(algo):
+    bandit = Bandit([ArmBernoulli(p) for p in (0.2, 0.5, 0.8)])
+
+    _, optimal, _, _ = run_experiment(bandit, [algo], steps=500, runs=50, seed=2)
+
+    assert optimal[0, -100:].mean() > 0.8
+
+
+def test_ucbv_bound_uses_empirical_variance():
+    algo = UCBV(2, b=1, zeta=1.2, c=1)
+    for arm, reward in [(0, 1.0), (1, 0.5), (0, 0.0), (1, 0.5), (0, 1.0)]:
+        algo.select_arm()
+        algo.update(arm, reward)
+
+    variance = np.array([np.var([1.0, 0.0, 1.0]), 0.0])
+    exploration = 1.2 * np.log(algo.t)
+    expected = algo.values + np.sqrt(2 * variance * exploration / algo.counts) + 3 * exploration / algo.counts
+    np.testing.assert_allclose(algo.square_values, [2 / 3, 0.25])
+    np.testing.assert_allclose(algo._upper_bounds(), expected)
+
+
+def test_ucbv_rejects_an_estimator():
+    with pytest.raises(AssertionError):
+        UCBV(3, estimator=Discounted(0.9))
+
+
+def test_compact_policy_runs_without_warnings():
+    """En float32 las medias cercanas a 1 se redondean a 1: la cota se calcula en float64 y sin avisos."""
+    bandit = Bandit([ArmBernoulli(p) for p in (0.9, 0.99, 1.0)])
+    results = {}
+    for policy in ('default', 'compact'):
+        algo = KLUCB(3)
+        algo.set_dtype_policy(policy)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            results[policy] = run_experiment(bandit, [algo], steps=300, runs=10, seed=4)
+        assert np.all(algo.bounds <= 1) and np.all(algo.bounds >= algo.values - 1e-6)
+
+    np.testing.assert_array_equal(results['compact'][1], results['default'][1])
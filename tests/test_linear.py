@@ -0,0 +1,104 @@
+"""
+Module: tests/test_linear.py
+Description: Pruebas de LinUCB y Thompson Sampling lineal (inversas por Sherman-Morrison) y del bandido contextual.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import LinUCB, LinearThompson
+from arms import ArmLinear, ContextualBandit
+from experiments import run_contextual_experiment
+
+
+def history(steps: int = 80, k: int = 3, d: int = 4, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, k, steps), rng.normal(size=steps), rng.normal(size=(steps, d))
+
+
+def ridge(arms, rewards, contexts, arm, d, lam):
+    """Inversa de A_a = lam * I + suma de x x^T y theta_a = A_a^-1 b_a, calculadas directamente."""
+    mine = arms == arm
+    inverse = np.linalg.inv(lam * np.eye(d) + contexts[mine].T @ contexts[mine])
+    return inverse, inverse @ (rewards[mine] @ contexts[mine])
+
+
+@pytest.mark.parametrize('cls', [LinUCB, LinearThompson])
+def test_sherman_morrison_matches_direct_inverse(cls):
+    arms, rewards, contexts = history()
+    algo = cls(3, 4, lam=0.5)
+    for arm, reward, context in zip(arms, rewards, contexts):
+        algo.update(arm, reward, context)
+
+    for arm in range(3):
+        inverse, theta = ridge(arms, rewards, contexts, arm, 4, 0.5)
+        np.testing.assert_allclose(algo.inverse_design[arm], inverse, atol=1e-10)
+        np.testing.assert_allclose(algo.theta[arm], theta, atol=1e-10)
+
+
+def test_batched_inverses_match_direct_inverse():
+    rng = np.random.default_rng(1)
+    arms, rewards, contexts = rng.integers(0, 3, (2, 60)), rng.normal(size=(2, 60)), rng.normal(size=(2, 60, 4))
+    algo = LinUCB(3, 4)
+    algo.reset_batch(2)
+    for step in range(60):
+        algo.update_batch(arms[:, step], rewards[:, step], contexts[:, step])
+
+    for row in range(2):
+        for arm in range(3):
+            inverse, theta = ridge(arms[row], rewards[row], contexts[row], arm, 4, 1.0)
+            np.testing.assert_allclose(algo.inverse_design[row, arm], inverse, atol=1e-10)
+            np.testing.assert_allclose(algo.theta[row, arm], theta, atol=1e-10)
+    np.testing.assert_array_equal(algo.counts.sum(axis=1), [60, 60])
+
+
+def test_linucb_scores_and_selection_of_a_context_batch():
+    arms, rewards, contexts = history()
+    algo = LinUCB(3, 4, alpha=0.7)
+    for arm, reward, context in zip(arms, rewards, contexts):
+        algo.update(arm, reward, context)
+
+    queries = np.random.default_rng(2).normal(size=(10, 4))
+    scores = algo._scores(queries)
+    for query, row in zip(queries, scores):
+        widths = [np.sqrt(query @ algo.inverse_design[arm] @ query) for arm in range(3)]
+        np.testing.assert_allclose(row, algo.theta @ query + 0.7 * np.array(widths))
+    np.testing.assert_array_equal(algo.select_arm(queries), [algo.select_arm(query) for query in queries])
+
+
+def test_reset_restores_the_prior():
+    arms, rewards, contexts = history(steps=10)
+    algo = LinearThompson(3, 4, lam=2.0)
+    for arm, reward, context in zip(arms, rewards, contexts):
+        algo.update(arm, reward, context)
+    algo.reset()
+
+    np.testing.assert_array_equal(algo.inverse_design, np.broadcast_to(np.eye(4) / 2.0, (3, 4, 4)))
+    assert not algo.response.any() and not algo.theta.any()
+
+
+@pytest.mark.parametrize('algo', [LinUCB(4, 5, alpha=0.5), LinearThompson(4, 5, v=0.3)])
+def test_learns_the_optimal_arm_per_context(algo):
+    arms = ArmLinear.generate_arms(4, 5, sigma=0.1, rng=np.random.default_rng(3))
+    bandit = ContextualBandit(arms, rng=np.random.default_rng(4))
+
+    _, optimal, regret, _ = run_contextual_experiment(bandit, [algo], steps=400, runs=20, seed=5)
+
+    assert optimal[0, -100:].mean() > 0.8
+    assert regret[0, -1] - regret[0, -101] < (regret[0, 100] - regret[0, 0]) / 2  # Regret sublineal
+
+
+def test_dimension_mismatch_raises():
+    bandit = ContextualBandit(ArmLinear.generate_arms(3, 4, rng=np.random.default_rng(0)))
+
+    with pytest.raises(AssertionError):
+        run_contextual_experiment(bandit, [LinUCB(3, 5)], steps=10, runs=2)
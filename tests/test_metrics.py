@@ -0,0 +1,94 @@
+"""
+Module: tests/test_metrics.py
+Description: Pruebas de las métricas acumuladas en línea.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import EpsilonGreedy, UCB1
+from arms import ArmNormal, Bandit, NonStationaryBandit, RandomWalkDrift
+from experiments import (RewardTape, StreamingHistogram, WelfordAccumulator, log_checkpoints, run_experiment,
+                         run_experiment_streaming)
+
+
+def test_log_checkpoints_include_first_and_last_step():
+    checkpoints = log_checkpoints(1000, 20)
+
+    assert checkpoints[0] == 0 and checkpoints[-1] == 999
+    assert np.all(np.diff(checkpoints) > 0)
+    assert len(checkpoints) <= 20
+
+
+def test_welford_matches_numpy_and_merges():
+    values = np.random.default_rng(0).normal(3, 2, size=(2, 50))
+    first, second = WelfordAccumulator(1), WelfordAccumulator(1)
+    for chunk in np.split(values[0], 5):
+        first.update(0, chunk)
+    second.update(0, values[1])
+
+    first.merge(second)
+
+    assert first.count[0] == 100
+    np.testing.assert_allclose(first.mean[0], values.mean())
+    np.testing.assert_allclose(first.variance[0], values.var(ddof=1))
+
+
+def test_histogram_quantiles_are_within_one_bin():
+    values = np.random.default_rng(0).random(10_000) * 10
+    histogram = StreamingHistogram(np.array([10.0]), n_bins=100)
+    histogram.update(0, values)
+
+    for q in (0.1, 0.5, 0.9):
+        assert abs(histogram.quantile(q)[0] - np.quantile(values, q)) <= 10 / 100
+
+
+def test_streaming_matches_dense_runner():
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 2.0, 3.0)])
+    algorithms = [EpsilonGreedy(bandit.k, 0.1), UCB1(bandit.k)]
+
+    _, _, regret, _ = run_experiment(bandit, algorithms, 200, 16, seed=5)
+    metrics = run_experiment_streaming(bandit, algorithms, 200, 16, seed=5, n_checkpoints=30)
+
+    for idx, streaming in enumerate(metrics):
+        steps, mean, lower, upper = streaming.band('regret')
+        np.testing.assert_allclose(mean, regret[idx, steps])
+        assert np.all(lower <= mean) and np.all(mean <= upper)
+        assert streaming.regret_quantiles().shape == (3, len(steps))
+
+
+def test_streaming_uses_the_moving_optimum():
+    """En un bandido no estacionario el regret se calcula con el óptimo de cada paso, como en el ejecutor denso."""
+    arms = [ArmNormal(mu, 1.0) for mu in (1.0, 1.2, 1.4, 1.6)]
+    bandit = NonStationaryBandit(arms, RandomWalkDrift(0.2), rng=np.random.default_rng(0))
+    _, optimal, _, _ = run_experiment(bandit, [EpsilonGreedy(4, 0.1)], 100, 8, seed=2)
+
+    bandit = NonStationaryBandit(arms, RandomWalkDrift(0.2), rng=np.random.default_rng(0))
+    metrics = run_experiment_streaming(bandit, [EpsilonGreedy(4, 0.1)], 100, 8, seed=2, n_checkpoints=100)
+
+    steps, mean, _, _ = metrics[0].band('optimal_selections')
+    spans = np.diff(np.concatenate(([-1], steps)))
+    expected = np.add.reduceat(optimal[0], np.concatenate(([0], steps[:-1] + 1))) / spans
+    np.testing.assert_allclose(mean, expected)
+
+
+def test_streaming_checks_the_tape_like_the_dense_runner():
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 2.0, 3.0)], rng=np.random.default_rng(0))
+    tape = RewardTape.sample(bandit, runs=8, steps=50)
+
+    for runs, steps in ((4, 50), (8, 60)):  # Más ejecuciones en la cinta o menos pasos de los pedidos
+        with pytest.raises(AssertionError):
+            run_experiment_streaming(bandit, [UCB1(3)], steps, runs, tape=tape)
+
+    _, _, regret, _ = run_experiment(bandit, [UCB1(3)], 50, 8, tape=tape)
+    metrics = run_experiment_streaming(bandit, [UCB1(3)], 50, 8, tape=tape, n_checkpoints=10)
+    np.testing.assert_allclose(metrics[0].regret.mean, regret[0, metrics[0].checkpoints])
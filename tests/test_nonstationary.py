@@ -0,0 +1,63 @@
+"""
+Module: tests/test_nonstationary.py
+Description: Tests for non-stationary bandits and their drift models.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from arms import ArmBernoulli, ArmBinomial, ArmNormal, ChangePointDrift, NonStationaryBandit, RandomWalkDrift
+
+
+def mixed_arms():
+    return [ArmNormal(1.0, 1.0), ArmBernoulli(0.5), ArmBinomial(4, 0.3), ArmNormal(0.5, 1.0), ArmBernoulli(0.9)]
+
+
+@pytest.mark.parametrize('drift', [RandomWalkDrift(0.3), ChangePointDrift(0.2, 0.0, 2.0)], ids=str)
+def test_optimal_arm_is_tracked_after_every_step(drift):
+    bandit = NonStationaryBandit(mixed_arms(), drift, rng=np.random.default_rng(0))
+
+    for _ in range(300):
+        bandit.advance()
+        expected = np.where(bandit.is_normal, bandit.mu, bandit.n * bandit.p)
+        np.testing.assert_allclose(bandit.expected_rewards, expected)
+        assert bandit.expected_rewards[bandit.optimal_arm] == np.max(expected)
+        assert np.all((bandit.p[bandit.is_binomial] >= 0) & (bandit.p[bandit.is_binomial] <= 1))
+
+
+def test_reset_restores_initial_parameters_without_touching_copies():
+    bandit = NonStationaryBandit(mixed_arms(), RandomWalkDrift(0.5), rng=np.random.default_rng(1))
+    initial = bandit.expected_rewards.copy()
+    clone = copy.copy(bandit)
+    clone.reset()  # As the runner does on each copy: from here on it shares no arrays with bandit
+
+    for _ in range(10):
+        bandit.advance()
+    assert not np.allclose(bandit.expected_rewards, initial)
+    np.testing.assert_array_equal(clone.expected_rewards, initial)
+
+    bandit.reset()
+    np.testing.assert_array_equal(bandit.expected_rewards, initial)
+    assert bandit.optimal_arm == int(np.argmax(initial))
+    assert [arm.get_expected_value() for arm in bandit.arms] == list(initial)  # The arm objects do not drift
+
+
+def test_regret_uses_the_current_optimum():
+    bandit = NonStationaryBandit([ArmNormal(0.0, 1.0), ArmNormal(1.0, 1.0)], ChangePointDrift(1.0, 5.0, 6.0),
+                                 rng=np.random.default_rng(0))
+    bandit.advance()  # Every parameter jumps into [5, 6]
+
+    regret = bandit.regret(np.array([0, 1]))
+    assert np.min(regret) == 0
+    np.testing.assert_allclose(np.max(regret), abs(bandit.mu[0] - bandit.mu[1]))
@@ -0,0 +1,46 @@
+"""
+Module: tests/test_parallel.py
+Description: Pruebas de la ejecución de experimentos repartida entre procesos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+
+from algorithms import EpsilonGreedy, Softmax, UCB1
+from arms import ArmNormal, Bandit
+from experiments import run_experiment_parallel
+
+
+def make_setup():
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 3.0, 2.0, 4.0)])
+    return bandit, [EpsilonGreedy(bandit.k, 0.1), UCB1(bandit.k), Softmax(bandit.k)]
+
+
+def test_results_are_bit_identical_across_worker_counts():
+    bandit, algorithms = make_setup()
+
+    serial = run_experiment_parallel(bandit, algorithms, 40, 25, seed=7, n_workers=1, shard_runs=10)
+    parallel = run_experiment_parallel(bandit, algorithms, 40, 25, seed=7, n_workers=2, shard_runs=10)
+
+    for a, b in zip(serial[:3], parallel[:3]):
+        np.testing.assert_array_equal(a, b)
+    for a, b in zip(serial[3], parallel[3]):
+        np.testing.assert_array_equal(a['selection_counts'], b['selection_counts'])
+
+
+def test_seed_controls_results_and_algorithms_are_not_modified():
+    bandit, algorithms = make_setup()
+
+    first = run_experiment_parallel(bandit, algorithms, 30, 12, seed=1, n_workers=1, shard_runs=5)
+    second = run_experiment_parallel(bandit, algorithms, 30, 12, seed=2, n_workers=1, shard_runs=5)
+
+    assert not np.array_equal(first[0], second[0])
+    assert all(algo.n_envs is None and algo.counts.sum() == 0 for algo in algorithms)
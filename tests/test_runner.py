@@ -0,0 +1,59 @@
+"""
+Module: tests/test_runner.py
+Description: Pruebas del ejecutor vectorizado de experimentos.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+
+from algorithms import EpsilonGreedy, UCB1, Softmax
+from arms import ArmNormal, Bandit
+from experiments import run_experiment
+
+
+def make_bandit(k: int = 5, seed: int = 0) -> Bandit:
+    np.random.seed(seed)
+    return Bandit(ArmNormal.generate_arms(k))
+
+
+def test_run_experiment_shapes_and_ranges():
+    bandit = make_bandit()
+    algorithms = [EpsilonGreedy(bandit.k, 0.1), UCB1(bandit.k), Softmax(bandit.k)]
+
+    rewards, optimal_selections, regret, arm_stats = run_experiment(bandit, algorithms, 50, 20, seed=1)
+
+    assert rewards.shape == optimal_selections.shape == regret.shape == (3, 50)
+    assert np.all((optimal_selections >= 0) & (optimal_selections <= 1))
+    assert np.all(np.diff(regret, axis=1) >= -1e-12)  # El regret acumulado no decrece
+    assert len(arm_stats) == 3
+    for stats in arm_stats:
+        assert stats['selection_counts'].sum() == 50
+        assert stats['optimal_arm'] == bandit.optimal_arm
+
+
+def test_run_experiment_is_reproducible_with_seed():
+    bandit = make_bandit()
+
+    first = run_experiment(bandit, [EpsilonGreedy(bandit.k, 0.1)], 40, 10, seed=3)
+    second = run_experiment(bandit, [EpsilonGreedy(bandit.k, 0.1)], 40, 10, seed=3)
+
+    for a, b in zip(first[:3], second[:3]):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_ucb1_learns_the_optimal_arm():
+    bandit = Bandit([ArmNormal(mu, 0.1) for mu in (1.0, 5.0, 2.0)])
+
+    _, optimal_selections, regret, arm_stats = run_experiment(bandit, [UCB1(bandit.k)], 300, 10, seed=0)
+
+    assert optimal_selections[0, -50:].mean() > 0.9
+    assert np.argmax(arm_stats[0]['selection_counts']) == 1
+    np.testing.assert_array_equal(bandit.regret(np.full(10, bandit.optimal_arm)), 0)
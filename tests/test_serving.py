@@ -0,0 +1,181 @@
+"""
+Module: tests/test_serving.py
+Description: Pruebas del servidor de políticas con recompensas diferidas y de su interfaz HTTP.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import asyncio
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from algorithms import EpsilonGreedy, LinUCB, UCB1
+from serving import HttpPolicyServer, PolicyServer
+
+
+def test_rewards_are_applied_only_on_flush_in_manual_mode():
+    server = PolicyServer(UCB1(3), batch_size=2, flush_interval=None)
+    decisions = [server.decide() for _ in range(5)]
+    for decision_id, arm in decisions:
+        assert server.report_reward(decision_id, float(arm))
+
+    assert server.algorithm.counts.sum() == 0
+    assert server.flush() == 5
+    np.testing.assert_array_equal(server.algorithm.counts, np.bincount([arm for _, arm in decisions], minlength=3))
+    assert server.stats()['batches'] == 3  # Micro-lotes de 2, 2 y 1
+
+
+def test_flush_matches_sequential_updates():
+    rng = np.random.default_rng(0)
+    server = PolicyServer(EpsilonGreedy(4, 0.3, rng=np.random.default_rng(1)), batch_size=16, flush_interval=None)
+    reference = EpsilonGreedy(4, 0.3)
+    for _ in range(100):
+        decision_id, arm = server.decide()
+        reward = rng.normal(arm, 1)
+        server.report_reward(decision_id, reward)
+        reference.update(arm, reward)
+    server.flush()
+
+    np.testing.assert_array_equal(server.algorithm.counts, reference.counts)
+    np.testing.assert_allclose(server.algorithm.values, reference.values)
+
+
+def test_contextual_algorithms_keep_the_context_of_each_decision():
+    contexts = np.random.default_rng(2).normal(size=(20, 3))
+    server = PolicyServer(LinUCB(2, 3), flush_interval=None)
+    reference = LinUCB(2, 3)
+    for context in contexts:
+        decision_id, arm = server.decide(context)
+        server.report_reward(decision_id, float(context.sum()))
+        reference.update(arm, float(context.sum()), context)
+    server.flush()
+
+    np.testing.assert_allclose(server.algorithm.theta, reference.theta)
+    with pytest.raises(AssertionError):
+        server.decide()
+
+
+def test_unknown_duplicate_and_expired_rewards_are_rejected():
+    server = PolicyServer(UCB1(2), flush_interval=None, max_pending=2)
+    first, _ = server.decide()
+    second, _ = server.decide()
+    third, _ = server.decide()  # Se olvida la primera decisión
+
+    assert server.report_reward(second, 1.0)
+    assert not server.report_reward(second, 1.0)
+    assert not server.report_reward(first, 1.0)
+    assert not server.report_reward(1234, 1.0)
+    stats = server.stats()
+    assert (stats['rewards_received'], stats['rewards_rejected'], stats['expired']) == (1, 3, 1)
+    assert (stats['pending'], stats['queued']) == (1, 1)
+
+
+def test_writer_thread_applies_rewards_from_many_threads():
+    server = PolicyServer(EpsilonGreedy(5, 0.2), batch_size=8, flush_interval=0.001)
+
+    def work():
+        for _ in range(200):
+            decision_id, arm = server.decide()
+            server.report_reward(decision_id, float(arm))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.close()
+
+    assert server.algorithm.counts.sum() == 800
+    assert server.stats()['rewards_applied'] == 800
+    with pytest.raises(AssertionError):
+        server.decide()
+
+
+async def exchange(port: int, raw: bytes) -> list:
+    """Envía bytes en crudo y devuelve las respuestas (línea de estado, cuerpo JSON) hasta que se cierra la conexión."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(raw)
+    await writer.drain()
+    responses = []
+    while True:
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            break
+        lines = head.decode().split('\r\n')
+        length = int(next(line.split(':')[1] for line in lines if line.lower().startswith('content-length')))
+        responses.append((lines[0], json.loads(await reader.readexactly(length))))
+    writer.close()
+    return responses
+
+
+def request(method: str, path: str, payload=None, close: bool = False) -> bytes:
+    body = b'' if payload is None else json.dumps(payload).encode()
+    connection = 'Connection: close\r\n' if close else ''
+    return f'{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n{connection}\r\n'.encode() + body
+
+
+def serve(scenario):
+    """Arranca un HttpPolicyServer en un puerto libre, ejecuta scenario(puerto) y lo cierra."""
+    async def main():
+        with PolicyServer(UCB1(3), flush_interval=None) as policy:
+            http = HttpPolicyServer(policy, port=0)
+            port = await http.start()
+            try:
+                return await scenario(port), policy
+            finally:
+                await http.close()
+    return asyncio.run(main())
+
+
+def test_http_decide_reward_and_stats_on_one_connection():
+    async def scenario(port):
+        first = await exchange(port, request('POST', '/decide', close=True))
+        decision_id = first[0][1]['decision_id']
+        return first + await exchange(port, request('POST', '/reward', {'decision_id': decision_id, 'reward': 1})
+                                      + request('POST', '/reward', {'decision_id': decision_id, 'reward': 1})
+                                      + request('GET', '/stats') + request('GET', '/nope', close=True))
+
+    responses, policy = serve(scenario)
+
+    assert [status for status, _ in responses] == ['HTTP/1.1 200 OK'] * 4 + ['HTTP/1.1 404 Not Found']
+    assert responses[0][1] == {'decision_id': 0, 'arm': 0}
+    assert [body['accepted'] for _, body in responses[1:3]] == [True, False]
+    assert responses[3][1]['rewards_received'] == 1
+    assert policy.algorithm.counts.sum() == 1  # Aplicada al cerrar el servidor
+
+
+@pytest.mark.parametrize('raw', [
+    b'GARBAGE\r\n\r\n',
+    b'POST /decide\r\n\r\n',
+    b'POST /decide HTTP/1.1\r\nContent-Length: abc\r\n\r\n',
+    b'POST /decide HTTP/1.1\r\nContent-Length: -5\r\n\r\n',
+    b'POST /decide HTTP/1.1\r\nno-colon-here\r\n\r\n',
+])
+def test_http_malformed_request_gets_400_and_server_keeps_serving(raw):
+    async def scenario(port):
+        return await exchange(port, raw), await exchange(port, request('POST', '/decide', close=True))
+
+    (bad, good), _ = serve(scenario)
+
+    assert len(bad) == 1 and bad[0][0] == 'HTTP/1.1 400 Bad Request'
+    assert good[0][0] == 'HTTP/1.1 200 OK'
+
+
+def test_http_invalid_json_body_gets_400():
+    async def scenario(port):
+        return await exchange(port, b'POST /reward HTTP/1.1\r\nContent-Length: 3\r\nConnection: close\r\n\r\n{x}')
+
+    responses, _ = serve(scenario)
+
+    assert responses[0][0] == 'HTTP/1.1 400 Bad Request'
@@ -0,0 +1,66 @@
+"""
+Module: tests/test_softmax.py
+Description: Pruebas de Softmax con árbol de sumas y de la caché de probabilidades de GradientBandit.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import GradientBandit, Softmax
+from algorithms.segment_tree import SumSegmentTree
+
+
+@pytest.mark.parametrize('k', [1, 3, 8, 33])
+def test_sum_segment_tree_find_matches_cdf(k):
+    rng = np.random.default_rng(k)
+    weights = rng.random(k)
+    tree = SumSegmentTree(weights)
+    for index in rng.integers(0, k, 10):
+        weights[index] = rng.random()
+        tree.update(int(index), weights[index])
+
+    assert tree.total() == pytest.approx(weights.sum())
+    cdf = np.cumsum(weights)
+    for mass in rng.random(100) * cdf[-1]:
+        assert tree.find(mass) == np.searchsorted(cdf, mass, side='right')
+
+
+def test_softmax_samples_with_softmax_probabilities():
+    algo = Softmax(4, tau=0.5, rng=np.random.default_rng(0))
+    for arm, reward in enumerate((0.0, 0.5, 1.0, 0.2)):
+        algo.update(arm, reward)
+
+    frequencies = np.bincount([algo.select_arm() for _ in range(20_000)], minlength=4) / 20_000
+
+    expected = np.exp(algo.values / algo.tau) / np.sum(np.exp(algo.values / algo.tau))
+    np.testing.assert_allclose(frequencies, expected, atol=0.015)
+
+
+def test_softmax_survives_large_values():
+    """Valores que desbordarían exp(values / tau) se desplazan sin perder la distribución."""
+    algo = Softmax(3, tau=0.01, rng=np.random.default_rng(0))
+    for arm, reward in ((0, 1000.0), (1, 1010.0), (2, 990.0)):
+        algo.update(arm, reward)
+
+    assert np.isfinite(algo.tree.total())
+    assert all(algo.select_arm() == 1 for _ in range(50))
+
+
+def test_gradient_bandit_caches_softmax_of_preferences():
+    algo = GradientBandit(5, alpha=0.2, rng=np.random.default_rng(0))
+    rewards = np.random.default_rng(1).normal(size=100)
+    for reward in rewards:
+        algo.update(int(algo.select_arm()), reward)
+
+        expected = np.exp(algo.preferences) / np.sum(np.exp(algo.preferences))
+        np.testing.assert_allclose(algo.probabilities, expected)
+        assert algo.cdf[-1] == 1.0
@@ -0,0 +1,54 @@
+"""
+Module: tests/test_sweep.py
+Description: Pruebas del barrido de hiperparámetros con successive halving y carreras.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+
+from algorithms import EpsilonGreedy, UCB1
+from arms import ArmNormal, Bandit
+from experiments import build_configs, successive_halving
+
+
+def test_build_configs_expands_the_grid_in_order():
+    configs = build_configs(4, {EpsilonGreedy: {'epsilon': [0.0, 0.1, 0.5]}, UCB1: {'c': [0.5, 2]}})
+
+    assert [type(algo).__name__ for algo in configs] == ['EpsilonGreedy'] * 3 + ['UCB1'] * 2
+    assert [algo.epsilon for algo in configs[:3]] == [0.0, 0.1, 0.5]
+    assert [algo.c for algo in configs[3:]] == [0.5, 2]
+    assert all(algo.k == 4 for algo in configs)
+
+
+def test_successive_halving_ranks_and_spends_less_on_bad_configs():
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (0.0, 1.0, 2.0, 3.0)])
+    configs = build_configs(bandit.k, {EpsilonGreedy: {'epsilon': [1.0, 0.5, 0.1]}, UCB1: {'c': [1]}})
+
+    ranking = successive_halving(bandit, configs, steps=100, initial_runs=4, seed=0, n_workers=1)
+
+    assert len(ranking) == len(configs)
+    assert ranking[0]['eliminated_round'] is None
+    assert ranking[-1]['algorithm'] is configs[0]  # Explorar siempre es lo peor
+    assert ranking[0]['runs'] > ranking[-1]['runs']
+    rounds = [np.inf if entry['eliminated_round'] is None else entry['eliminated_round'] for entry in ranking]
+    assert rounds == sorted(rounds, reverse=True)
+    assert all(entry['pulls'] == entry['runs'] * 100 for entry in ranking)
+
+
+def test_successive_halving_is_reproducible_and_respects_max_rounds():
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (0.0, 0.5, 1.0)])
+    configs = build_configs(bandit.k, {EpsilonGreedy: {'epsilon': [0.05, 0.1, 0.2, 0.3]}})
+
+    first = successive_halving(bandit, configs, steps=50, seed=3, max_rounds=1, n_workers=1)
+    second = successive_halving(bandit, configs, steps=50, seed=3, max_rounds=1, n_workers=1)
+
+    assert [entry['mean_regret'] for entry in first] == [entry['mean_regret'] for entry in second]
+    assert all(entry['runs'] == 8 and entry['eliminated_round'] is None for entry in first)
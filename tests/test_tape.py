@@ -0,0 +1,52 @@
+"""
+Module: tests/test_tape.py
+Description: Pruebas de las cintas de recompensas pre-muestreadas.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+
+from algorithms import EpsilonGreedy, UCB1
+from arms import ArmNormal, Bandit
+from experiments import RewardTape, run_experiment
+
+
+def make_bandit() -> Bandit:
+    return Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 3.0, 2.0, 4.0)], rng=np.random.default_rng(0))
+
+
+def test_sample_and_read():
+    tape = RewardTape.sample(make_bandit(), runs=3, steps=5)
+
+    assert (tape.runs, tape.steps, tape.k) == (3, 5, 4)
+    arms = np.array([0, 3, 1])
+    np.testing.assert_array_equal(tape.rewards(2, arms), tape.data[np.arange(3), 2, arms].astype(float))
+
+
+def test_saved_tape_loads_identically(tmp_path):
+    path = str(tmp_path / 'tape.npy')
+    tape = RewardTape.sample(make_bandit(), runs=2, steps=4, path=path)
+
+    loaded = RewardTape.load(path)
+
+    np.testing.assert_array_equal(loaded.data, tape.data)
+
+
+def test_tape_makes_comparisons_paired():
+    """Dos instancias del mismo algoritmo con la misma cinta obtienen exactamente las mismas recompensas."""
+    bandit = make_bandit()
+    tape = RewardTape.sample(bandit, runs=8, steps=60)
+
+    rewards, _, regret, _ = run_experiment(bandit, [UCB1(bandit.k), UCB1(bandit.k), EpsilonGreedy(bandit.k, 0.1)],
+                                           60, 8, seed=0, tape=tape)
+
+    np.testing.assert_array_equal(rewards[0], rewards[1])
+    np.testing.assert_array_equal(regret[0], regret[1])
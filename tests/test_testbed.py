@@ -0,0 +1,128 @@
+"""
+Module: tests/test_testbed.py
+Description: Tests for the struct-of-arrays BanditTestbed and for running experiments on it.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import EpsilonGreedy, UCB1
+from arms import ArmNormal, Bandit, BanditTestbed
+from experiments import RewardTape, ResultCache, run_experiment, run_experiment_cached, run_experiment_parallel, \
+    run_experiment_resumable, run_experiment_streaming
+
+
+def test_normal_means_are_distinct_grid_values_per_bandit():
+    testbed = Bandit.generate_many(500, 10, rng=np.random.default_rng(0), mu_min=1, mu_max=1.1)
+
+    grid = ArmNormal.mean_grid(1, 1.1)
+    assert testbed.mu.shape == (500, 10) and np.all(np.isin(testbed.mu, grid))
+    assert all(len(np.unique(row)) == 10 for row in testbed.mu)
+    np.testing.assert_array_equal(testbed.optimal_arm, np.argmax(testbed.mu, axis=1))
+    # Every grid value is equally likely: about 500 * 10 / 11 draws each
+    counts = np.unique(testbed.mu, return_counts=True)[1]
+    assert len(counts) == len(grid) and counts.min() > 350
+
+
+def test_whole_grid_is_a_permutation():
+    testbed = Bandit.generate_many(20, 11, rng=np.random.default_rng(1), mu_min=1, mu_max=1.1)
+
+    for row in testbed.mu:
+        np.testing.assert_array_equal(np.sort(row), ArmNormal.mean_grid(1, 1.1))
+
+
+def test_more_arms_than_grid_values_raises():
+    with pytest.raises(AssertionError):
+        Bandit.generate_many(3, 12, mu_min=1, mu_max=1.1)
+
+
+@pytest.mark.parametrize('family, n', [('bernoulli', 1), ('binomial', 8)])
+def test_discrete_families(family, n):
+    testbed = Bandit.generate_many(4, 5, family=family, rng=np.random.default_rng(2), n=8)
+
+    assert testbed.n == n
+    np.testing.assert_allclose(testbed.expected_rewards, n * testbed.p)
+    rewards = testbed.pull_arms(np.zeros((1000, 4), dtype=int))
+    assert rewards.shape == (1000, 4) and np.all((rewards >= 0) & (rewards <= n))
+    np.testing.assert_allclose(rewards.mean(axis=0), testbed.expected_rewards[:, 0], atol=0.15 * n)
+
+
+def test_pull_arms_and_regret_use_one_bandit_per_row():
+    testbed = BanditTestbed('normal', mu=[[0.0, 5.0], [3.0, 1.0]], sigma=1e-9, rng=np.random.default_rng(3))
+
+    np.testing.assert_allclose(testbed.pull_arms(np.array([1, 1])), [5.0, 1.0])
+    np.testing.assert_allclose(testbed.regret(np.array([0, 1])), [5.0, 2.0])
+    with pytest.raises(IndexError):
+        testbed.pull_arms(np.array([0, 2]))
+    with pytest.raises(AssertionError):
+        testbed.pull_arms(np.array([0, 1, 0]))
+
+
+def test_bandit_rebuilds_one_row_with_arm_objects():
+    testbed = Bandit.generate_many(3, 4, family='binomial', rng=np.random.default_rng(4), n=6)
+
+    bandit = testbed.bandit(2)
+
+    np.testing.assert_allclose(bandit.expected_rewards, testbed.expected_rewards[2])
+    assert bandit.optimal_arm == testbed.optimal_arm[2]
+
+
+def test_run_r_plays_bandit_r():
+    testbed = Bandit.generate_many(30, 5, rng=np.random.default_rng(5))
+
+    _, optimal, regret, arm_stats = run_experiment(testbed, [UCB1(5)], steps=300, runs=30, seed=0)
+
+    assert optimal[0, -50:].mean() > 0.7
+    assert np.all(np.diff(regret[0]) >= 0)
+    assert arm_stats[0]['optimal_arm'] == testbed.optimal_arm[0]
+    metrics = run_experiment_streaming(testbed, [UCB1(5)], steps=300, runs=30, seed=0)
+    assert metrics[0].regret.mean[-1] > 0
+
+
+@pytest.mark.parametrize('runner', [run_experiment, run_experiment_streaming])
+def test_runs_must_match_the_number_of_bandits(runner):
+    testbed = Bandit.generate_many(8, 3, rng=np.random.default_rng(6))
+
+    with pytest.raises(AssertionError, match='runs debe ser 8'):
+        runner(testbed, [EpsilonGreedy(3)], steps=10, runs=4)
+
+
+def test_single_bandit_features_reject_a_testbed(tmp_path):
+    testbed = Bandit.generate_many(4, 3, rng=np.random.default_rng(7))
+    algorithms = [EpsilonGreedy(3)]
+
+    with pytest.raises(AssertionError):
+        RewardTape.sample(testbed, runs=4, steps=10)
+    with pytest.raises(AssertionError, match='BanditTestbed'):
+        run_experiment_resumable(testbed, algorithms, 10, 4, str(tmp_path / 'checkpoint.npz'))
+    with pytest.raises(AssertionError, match='BanditTestbed'):
+        run_experiment_parallel(testbed, algorithms, 10, 4, n_workers=1)
+    with pytest.raises(AssertionError):
+        run_experiment_cached(testbed, algorithms, 10, 4, seed=0, cache=ResultCache(str(tmp_path / 'cache')))
+    with pytest.warns(RuntimeWarning):
+        run_experiment(testbed, algorithms, 10, 4, backend='numba')  # Falls back to the numpy backend
+
+
+def test_state_nbytes_scales_with_the_testbed():
+    small = Bandit.generate_many(10, 5, rng=np.random.default_rng(8))
+    large = Bandit.generate_many(100, 5, rng=np.random.default_rng(8))
+
+    assert large.state_nbytes() > 9 * small.state_nbytes()
+
+
+@pytest.mark.parametrize('family', BanditTestbed.FAMILIES)
+def test_state_nbytes_counts_each_array_once(family):
+    testbed = Bandit.generate_many(10, 100, family=family, rng=np.random.default_rng(9))
+
+    per_arm = testbed.mu.nbytes if family == 'normal' else testbed.p.nbytes + testbed.expected_rewards.nbytes
+    rows = testbed._rows.nbytes + testbed.optimal_arm.nbytes + testbed._optimal_rewards.nbytes
+    assert testbed.state_nbytes() == per_arm + rows  # In the normal family expected_rewards is mu
@@ -0,0 +1,88 @@
+"""
+Module: tests/test_thompson.py
+Description: Pruebas de Thompson Sampling con posterioris conjugadas.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import ThompsonBernoulli, ThompsonBinomial, ThompsonNormal
+from algorithms.estimators import Discounted, SlidingWindow
+from arms import ArmBernoulli, ArmNormal, Bandit
+from experiments import run_experiment
+
+
+def test_beta_posterior_counts_successes_and_failures():
+    algo = ThompsonBernoulli(2, alpha_prior=2.0, beta_prior=3.0)
+    for reward in (1, 0, 1, 1):
+        algo.update(0, reward)
+
+    assert (algo.alphas[0], algo.betas[0]) == (5.0, 4.0)
+    assert (algo.alphas[1], algo.betas[1]) == (2.0, 3.0)
+
+
+def test_binomial_posterior_adds_n_trials_and_clips_rewards():
+    algo = ThompsonBinomial(2, n=10)
+    algo.update(1, 7)
+    algo.update(1, 12)  # Fuera de [0, n]: cuenta como 10 éxitos
+
+    assert (algo.alphas[1], algo.betas[1]) == (18.0, 4.0)
+
+
+def test_normal_gamma_posterior_matches_closed_form():
+    rewards = np.random.default_rng(0).normal(3.0, 2.0, 50)
+    mu0, kappa0, alpha0, beta0 = 1.0, 2.0, 1.5, 0.5
+    algo = ThompsonNormal(1, mu0, kappa0, alpha0, beta0)
+    for reward in rewards:
+        algo.update(0, reward)
+
+    n, mean = len(rewards), rewards.mean()
+    assert algo.kappas[0] == pytest.approx(kappa0 + n)
+    assert algo.means[0] == pytest.approx((kappa0 * mu0 + n * mean) / (kappa0 + n))
+    assert algo.alphas[0] == pytest.approx(alpha0 + n / 2)
+    assert algo.betas[0] == pytest.approx(beta0 + np.sum((rewards - mean) ** 2) / 2
+                                          + kappa0 * n * (mean - mu0) ** 2 / (2 * (kappa0 + n)))
+
+
+@pytest.mark.parametrize('cls', [ThompsonBernoulli, ThompsonNormal])
+def test_batched_posteriors_match_single_bandit(cls):
+    rng = np.random.default_rng(1)
+    arms, rewards = rng.integers(0, 3, (2, 40)), rng.integers(0, 2, (2, 40)).astype(float)
+    batch = cls(3)
+    batch.reset_batch(2)
+    for step in range(40):
+        batch.update_batch(arms[:, step], rewards[:, step])
+
+    for row in range(2):
+        single = cls(3)
+        for arm, reward in zip(arms[row], rewards[row]):
+            single.update(int(arm), reward)
+        for name in cls.STATE_ATTRIBUTES:
+            np.testing.assert_allclose(getattr(batch, name)[row], getattr(single, name))
+
+
+@pytest.mark.parametrize('algo, arms', [
+    (ThompsonBernoulli(3), [ArmBernoulli(p) for p in (0.2, 0.8, 0.5)]),
+    (ThompsonNormal(3), [ArmNormal(mu, 1.0) for mu in (0.0, 2.0, 1.0)]),
+], ids=['Bernoulli', 'Normal'])
+def test_thompson_concentrates_on_the_best_arm(algo, arms):
+    bandit = Bandit(arms)
+    _, optimal_selections, _, _ = run_experiment(bandit, [algo], 300, 20, seed=0)
+
+    assert optimal_selections[0, -50:].mean() > 0.85
+
+
+@pytest.mark.parametrize('cls', [ThompsonBernoulli, ThompsonBinomial, ThompsonNormal])
+@pytest.mark.parametrize('estimator', [Discounted(0.9), SlidingWindow(10)], ids=lambda e: type(e).__name__)
+def test_rejects_an_estimator(cls, estimator):
+    with pytest.raises(AssertionError):
+        cls(3, estimator=estimator)
@@ -0,0 +1,70 @@
+"""
+Module: tests/test_trajectory.py
+Description: Pruebas del registro de trayectorias por columnas y de su lector con mmap.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from algorithms import UCB1
+from arms import ArmNormal, Bandit
+from experiments import TrajectoryReader, TrajectoryRecorder, run_experiment
+
+
+def record(directory: str, steps: int = 23, runs: int = 4, k: int = 5, chunk_steps: int = 10, compress: bool = False):
+    rng = np.random.default_rng(0)
+    arms = rng.integers(0, k, size=(steps, runs))
+    rewards = rng.normal(size=(steps, runs)).astype(np.float32)
+    with TrajectoryRecorder(directory, runs, k, chunk_steps=chunk_steps, compress=compress) as recorder:
+        for step in range(steps):
+            recorder.update(step, arms[step], rewards[step])
+    return arms, rewards
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_round_trip_across_chunks(tmp_path, compress):
+    arms, rewards = record(str(tmp_path), compress=compress)
+    reader = TrajectoryReader(str(tmp_path))
+
+    assert (reader.steps, reader.runs, reader.k) == (23, 4, 5)
+    assert reader.chunks == [(0, 10), (10, 20), (20, 23)]
+    np.testing.assert_array_equal(reader.arms(), arms)
+    np.testing.assert_array_equal(reader.rewards(), rewards)
+    np.testing.assert_array_equal(reader.arms(slice(5, 15), [0, 2]), arms[5:15][:, [0, 2]])
+    np.testing.assert_array_equal(reader.rewards(slice(12, 18), 3), rewards[12:18, 3])
+
+
+def test_selection_inside_one_chunk_is_a_view(tmp_path):
+    record(str(tmp_path))
+    selection = TrajectoryReader(str(tmp_path)).arms(slice(11, 19))
+
+    assert isinstance(selection.base, np.memmap) or isinstance(selection, np.memmap)
+
+
+def test_analyses_match_dense_computation(tmp_path):
+    arms, _ = record(str(tmp_path))
+    reader = TrajectoryReader(str(tmp_path))
+    expected_rewards = np.array([1.0, 3.0, 2.0, 0.0, 2.5])
+
+    np.testing.assert_allclose(reader.regret(expected_rewards), np.sum(3.0 - expected_rewards[arms], axis=0))
+    np.testing.assert_allclose(reader.switch_rate(), np.sum(arms[1:] != arms[:-1], axis=0) / 22)
+
+
+def test_runner_records_one_directory_per_algorithm(tmp_path):
+    bandit = Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 2.0)])
+    _, _, regret, _ = run_experiment(bandit, [UCB1(2)], 30, 3, seed=0, trajectory_dir=str(tmp_path))
+
+    reader = TrajectoryReader(os.path.join(str(tmp_path), '0_UCB1'))
+    assert reader.arms().shape == (30, 3)
+    np.testing.assert_allclose(reader.regret(bandit.expected_rewards).mean(), regret[0, -1])
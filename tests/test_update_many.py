@@ -0,0 +1,174 @@
+"""
+Module: tests/test_update_many.py
+Description: Pruebas de la actualización por lotes de tiradas (update_many) y de las recompensas diferidas del ejecutor.
+
+Author: Luis Daniel Hernández Molinero
+Email: ldaniel@um.es
+Date: 2025/01/29
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+
+import numpy as np
+import pytest
+
+from algorithms import EpsilonGreedy, UCB1, UCB2, Softmax, GradientBandit, KLUCB, UCBV, ThompsonBernoulli, \
+    ThompsonBinomial, ThompsonNormal, LinUCB
+from algorithms.estimators import ConstantStep, Discounted, SlidingWindow
+from arms import ArmNormal, Bandit
+from experiments import RewardTape, run_experiment
+from experiments.runner import iterate_steps
+
+# Algoritmos cuyo update_many da exactamente el mismo estado que una llamada a update por tirada
+FACTORIES = {
+    'EpsilonGreedy': lambda: EpsilonGreedy(4, 0.1),
+    'EpsilonGreedy-indexed': lambda: EpsilonGreedy(4, 0.1, indexed=True),
+    'UCB1': lambda: UCB1(4),
+    'UCB2': lambda: UCB2(4, 0.5),
+    'Softmax': lambda: Softmax(4, 0.5),
+    'UCBV': lambda: UCBV(4),
+    'KLUCB': lambda: KLUCB(4),
+    'ThompsonBernoulli': lambda: ThompsonBernoulli(4),
+    'ThompsonBinomial': lambda: ThompsonBinomial(4, n=1),
+    'ThompsonNormal': lambda: ThompsonNormal(4),
+}
+
+
+def history(n_envs: int = 3, m: int = 50, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 4, (n_envs, m)), rng.integers(0, 2, (n_envs, m)).astype(float)
+
+
+def assert_same_state(algo, reference):
+    state, expected = algo.get_state(), reference.get_state()
+    assert state.keys() == expected.keys()
+    for name in expected:
+        np.testing.assert_allclose(state[name], expected[name], rtol=1e-12, err_msg=name)
+
+
+@pytest.mark.parametrize('name', FACTORIES)
+def test_single_bandit_matches_sequential_updates(name):
+    arms, rewards = history()
+    algo, reference = FACTORIES[name](), FACTORIES[name]()
+    for arm, reward in zip(arms[0], rewards[0]):
+        reference.update(int(arm), reward)
+
+    algo.update_many(arms[0, :20], rewards[0, :20])  # En dos lotes, para combinar con un estado no vacío
+    algo.update_many(arms[0, 20:], rewards[0, 20:])
+
+    assert_same_state(algo, reference)
+    algo.rng, reference.rng = np.random.default_rng(1), np.random.default_rng(1)  # Mismos sorteos en ambos
+    with np.errstate(divide='ignore', invalid='ignore'):  # UCB2 produce NaN de forma esperada en algunos índices
+        assert algo.select_arm() == reference.select_arm()
+
+
+@pytest.mark.parametrize('name', FACTORIES)
+def test_batched_mode_matches_sequential_updates(name):
+    arms, rewards = history()
+    algo, reference = FACTORIES[name](), FACTORIES[name]()
+    algo.reset_batch(3)
+    reference.reset_batch(3)
+    for column in range(arms.shape[1]):
+        reference.update_batch(arms[:, column], rewards[:, column])
+
+    algo.update_many(arms, rewards)
+
+    assert_same_state(algo, reference)
+
+
+def test_gradient_bandit_uses_the_probabilities_of_the_deciding_policy():
+    arms, rewards = history(n_envs=1, m=30)
+    arms, rewards = arms[0], rewards[0]
+    algo = GradientBandit(4, alpha=0.2)
+    algo.update_many(arms[:10], rewards[:10])
+    probabilities = algo.probabilities.copy()
+    preferences, avg_reward, t = algo.preferences.copy(), algo.avg_reward, algo.t
+
+    algo.update_many(arms[10:], rewards[10:])
+
+    # Referencia directa: línea base tras cada recompensa y gradiente con las probabilidades congeladas
+    for arm, reward in zip(arms[10:], rewards[10:]):
+        t += 1
+        avg_reward += (reward - avg_reward) / t
+        delta = 0.2 * (reward - avg_reward)
+        preferences -= delta * probabilities
+        preferences[arm] += delta
+    np.testing.assert_allclose(algo.preferences, preferences)
+    assert algo.avg_reward == pytest.approx(avg_reward) and algo.t == t
+    np.testing.assert_array_equal(algo.counts, np.bincount(arms, minlength=4))
+
+
+@pytest.mark.parametrize('estimator', [ConstantStep(0.2), Discounted(0.9), SlidingWindow(7)])
+@pytest.mark.parametrize('n_envs', [None, 3])
+def test_estimators_fall_back_to_ordered_updates(estimator, n_envs):
+    arms, rewards = history()
+    algo, reference = EpsilonGreedy(4, estimator=estimator), EpsilonGreedy(4, estimator=estimator)
+    if n_envs is None:
+        arms, rewards = arms[0], rewards[0]
+        for arm, reward in zip(arms, rewards):
+            reference.update(int(arm), reward)
+    else:
+        algo.reset_batch(n_envs)
+        reference.reset_batch(n_envs)
+        for column in range(arms.shape[1]):
+            reference.update_batch(arms[:, column], rewards[:, column])
+
+    algo.update_many(arms, rewards)
+
+    assert_same_state(algo, reference)
+
+
+def test_invalid_batches_raise():
+    with pytest.raises(AssertionError):
+        UCB1(4).update_many(np.array([0, 1]), np.array([1.0]))
+    with pytest.raises(AssertionError):
+        LinUCB(4, 2).update_many(np.array([0]), np.array([1.0]))
+
+
+def make_bandit() -> Bandit:
+    return Bandit([ArmNormal(mu, 1.0) for mu in (1.0, 3.0, 2.0, 4.0)], rng=np.random.default_rng(0))
+
+
+@pytest.mark.parametrize('feedback_delay, update_every', [(0, 1), (3, 1), (0, 4), (2, 5)])
+def test_runner_applies_delayed_rewards_in_batches(feedback_delay, update_every):
+    """El ejecutor equivale a un bucle que guarda las tiradas y llama a update_many con las ya llegadas."""
+    bandit = make_bandit()
+    tape = RewardTape.sample(bandit, runs=4, steps=40)
+    steps = list(iterate_steps(bandit, UCB1(4), 40, 4, tape, feedback_delay=feedback_delay,
+                               update_every=update_every))
+
+    reference = UCB1(4)
+    reference.reset_batch(4)
+    applied = 0
+    for step in range(40):
+        np.testing.assert_array_equal(steps[step][1], reference.select_arms())
+        ready = step + 1 - feedback_delay
+        if (step + 1) % update_every == 0 and ready > applied:
+            reference.update_many(np.stack([arms for _, arms, _ in steps[applied:ready]], axis=1),
+                                  np.stack([rewards for _, _, rewards in steps[applied:ready]], axis=1))
+            applied = ready
+
+
+def test_runner_drops_rewards_arriving_after_the_last_step():
+    bandit = make_bandit()
+    algo = EpsilonGreedy(4, 0.1)
+
+    for _ in iterate_steps(bandit, algo, 30, 2, feedback_delay=4, update_every=3):
+        pass
+
+    # La última actualización, en el paso 30, incorpora las 26 recompensas llegadas; las 4 últimas se pierden
+    np.testing.assert_array_equal(algo.counts.sum(axis=1), [26, 26])
+
+
+def test_delayed_feedback_still_learns_and_cannot_resume():
+    bandit = make_bandit()
+
+    _, optimal, _, _ = run_experiment(bandit, [UCB1(4)], steps=400, runs=20, seed=1, feedback_delay=5,
+                                      update_every=10)
+
+    assert optimal[0, -100:].mean() > 0.8
+    with pytest.raises(AssertionError):
+        next(iterate_steps(bandit, UCB1(4), 10, 2, start=3, feedback_delay=1))